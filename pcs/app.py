@@ -5,126 +5,140 @@ from __future__ import (
     unicode_literals,
 )
 
+import atexit
 import getopt
+import importlib
 import os
 import sys
 import logging
 
-from pcs import (
-    acl,
-    booth,
-    cluster,
-    config,
-    constraint,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
-    settings,
-    status,
-    stonith,
-    usage,
-    utils,
-    alert,
-)
-
+from pcs import settings
 from pcs.cli.common import completion, parse_args
+from pcs.cli.common.errors import CmdLineInputError
 
 
 logging.basicConfig()
 usefile = False
 filename = ""
+
+# modules of commands in cmd_map
+COMMAND_MODULES = [
+    "acl", "alert", "batch", "booth", "cluster", "config", "constraint",
+    "daemon", "node", "pcsd", "prop", "qdevice", "quorum", "resource",
+    "status", "stonith",
+]
+
+def _module(name):
+    # command modules are imported on demand, a pcs run needs only one of them
+    return importlib.import_module("pcs.{0}".format(name))
+
+def import_command_modules():
+    """
+    Import all the modules pcs runs import on demand
+    """
+    from pcs.cli.common import lib_wrapper
+    for name in COMMAND_MODULES:
+        _module(name)
+    for name in lib_wrapper.LIBRARY_COMMAND_MODULES:
+        importlib.import_module(name)
+
+def _library_command(module_name, function_name):
+    def run(argv):
+        from pcs import utils
+        return getattr(_module(module_name), function_name)(
+            utils.get_library_wrapper(),
+            argv,
+            utils.get_modificators()
+        )
+    return run
+
+def _get_completion_tree():
+    # the tree is cached, it changes only when usage.py does
+    try:
+        usage_mtime = os.path.getmtime(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "usage.py")
+        )
+    except OSError:
+        usage_mtime = None
+    return completion.get_suggestion_tree(
+        completion.get_cache_path(os.environ),
+        "{0}:{1}".format(settings.pcs_version, usage_mtime),
+        lambda: _module("usage").generate_completion_tree_from_usage()
+    )
+
+def print_debug_counts():
+    """
+    Print counters of expensive operations pcs has done, shown with --debug
+    """
+    from pcs import utils
+    from pcs.lib import connection_pool
+    print("Number of CIB reads: {0}".format(utils.get_cib_read_count()))
+    pool = connection_pool.get_pool()
+    print("Number of node connections opened: {0}, reused: {1}".format(
+        pool.opened_count, pool.reused_count
+    ))
+
 def main(argv=None):
     if completion.has_applicable_environment(os.environ):
-        print(completion.make_suggestions(
-            os.environ,
-            usage.generate_completion_tree_from_usage()
-        ))
+        print(completion.make_suggestions(os.environ, _get_completion_tree()))
         sys.exit()
 
     argv = argv if argv else sys.argv[1:]
-    utils.subprocess_setup()
     global filename, usefile
     orig_argv = argv[:]
-    utils.pcs_options = {}
     try:
-        # we change --cloneopt to "clone" for backwards compatibility
-        new_argv = []
-        for arg in argv:
-            if arg == "--cloneopt" or arg == "--clone":
-                new_argv.append("clone")
-            elif arg.startswith("--cloneopt="):
-                new_argv.append("clone")
-                new_argv.append(arg.split('=',1)[1])
-            else:
-                new_argv.append(arg)
-        argv = new_argv
-
-        # we want to support optional arguments for --wait, so if an argument
-        # is specified with --wait (ie. --wait=30) then we use them
-        waitsecs = None
-        new_argv = []
-        for arg in argv:
-            if arg.startswith("--wait="):
-                tempsecs = arg.replace("--wait=","")
-                if len(tempsecs) > 0:
-                    waitsecs = tempsecs
-                    arg = "--wait"
-            new_argv.append(arg)
-        argv = new_argv
-
-        pcs_options, dummy_argv = getopt.gnu_getopt(
-            parse_args.filter_out_non_option_negative_numbers(argv),
-            parse_args.PCS_SHORT_OPTIONS,
-            parse_args.PCS_LONG_OPTIONS,
-        )
+        argv, options = parse_args.parse_command_line(argv)
     except getopt.GetoptError as err:
         print(err)
-        usage.main()
+        _module("usage").main()
         sys.exit(1)
-    argv = parse_args.filter_out_options(argv)
-    for o, a in pcs_options:
-        if not o in utils.pcs_options:
-            if o == "--watchdog":
-                a = [a]
-            utils.pcs_options[o] = a
-        else:
-            # If any options are a list then they've been entered twice which isn't valid
-            if o != "--watchdog":
-                utils.err("%s can only be used once" % o)
-            else:
-                utils.pcs_options[o].append(a)
-
-        if o == "-h" or o == "--help":
-            if len(argv) == 0:
-                usage.main()
-                sys.exit()
-            else:
-                argv = [argv[0], "help" ] + argv[1:]
-        elif o == "-f":
-            usefile = True
-            filename = a
-            utils.usefile = usefile
-            utils.filename = filename
-        elif o == "--corosync_conf":
-            settings.corosync_conf_file = a
-        elif o == "--cluster_conf":
-            settings.cluster_conf_file = a
-        elif o == "--version":
-            print(settings.pcs_version)
-            sys.exit()
-        elif o == "--fullhelp":
-            usage.full_usage()
+    except CmdLineInputError as e:
+        sys.stderr.write("Error: {0}\n".format(e.message))
+        sys.exit(1)
+
+    # --version is answered before importing what commands need, so it stays
+    # fast for monitoring which runs it often
+    if "--version" in options:
+        print(settings.pcs_version)
+        sys.exit()
+
+    from pcs import usage, utils
+    utils.subprocess_setup()
+    utils.pcs_options = options
+
+    if "-h" in options or "--help" in options:
+        if len(argv) == 0:
+            usage.main()
             sys.exit()
-        elif o == "--wait":
-            utils.pcs_options[o] = waitsecs
+        else:
+            argv = [argv[0], "help" ] + argv[1:]
+    if "-f" in options:
+        usefile = True
+        filename = options["-f"]
+        utils.usefile = usefile
+        utils.filename = filename
+    if "--corosync_conf" in options:
+        settings.corosync_conf_file = options["--corosync_conf"]
+    if "--cluster_conf" in options:
+        settings.cluster_conf_file = options["--cluster_conf"]
+    if "--fullhelp" in options:
+        usage.full_usage()
+        sys.exit()
 
     if len(argv) == 0:
         usage.main()
         sys.exit(1)
 
+    # agents' metadata and names are cached on disk unless told not to
+    utils.lib_ra.enable_disk_cache("--no-cache" not in utils.pcs_options)
+    # nodes pcs has been unable to connect to are remembered for a while
+    utils.node_reachability.enable("--skip-offline" in utils.pcs_options)
+    # corosync.conf and cluster.conf are parsed once until they change
+    utils.config_file_cache.enable()
+
+    if "--debug" in utils.pcs_options:
+        atexit.register(print_debug_counts)
+
     # create a dummy logger
     # we do not have a log file for cli (yet), but library requires a logger
     logger = logging.getLogger("old_cli")
@@ -136,45 +150,23 @@ def main(argv=None):
         usage.main()
         return
     cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": lambda argv: acl.acl_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": lambda argv: node.node_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "quorum": lambda argv: quorum.quorum_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "qdevice": lambda argv: qdevice.qdevice_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
-        "alert": lambda args: alert.alert_cmd(
-            utils.get_library_wrapper(),
-            args,
-            utils.get_modificators()
-        ),
-        "booth": lambda argv: booth.booth_cmd(
-            utils.get_library_wrapper(),
-            argv,
-            utils.get_modificators()
-        ),
+        "resource": lambda argv: _module("resource").resource_cmd(argv),
+        "cluster": lambda argv: _module("cluster").cluster_cmd(argv),
+        "stonith": lambda argv: _module("stonith").stonith_cmd(argv),
+        "property": lambda argv: _module("prop").property_cmd(argv),
+        "constraint": lambda argv: _module("constraint").constraint_cmd(argv),
+        "acl": _library_command("acl", "acl_cmd"),
+        "status": lambda argv: _module("status").status_cmd(argv),
+        "config": lambda argv: _module("config").config_cmd(argv),
+        "pcsd": lambda argv: _module("pcsd").pcsd_cmd(argv),
+        "node": _library_command("node", "node_cmd"),
+        "quorum": _library_command("quorum", "quorum_cmd"),
+        "qdevice": _library_command("qdevice", "qdevice_cmd"),
+        "alert": _library_command("alert", "alert_cmd"),
+        "booth": _library_command("booth", "booth_cmd"),
+        "daemon": lambda argv: _module("daemon").daemon_cmd(argv),
     }
+    cmd_map["batch"] = lambda argv: _module("batch").batch_cmd(cmd_map, argv)
     if command not in cmd_map:
         usage.main()
         sys.exit(1)
@@ -0,0 +1,224 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import getopt
+import shlex
+import shutil
+import sys
+import tempfile
+
+from pcs import (
+    settings,
+    usage,
+    utils,
+)
+from pcs.cli.common import parse_args
+from pcs.cli.common.errors import CmdLineInputError
+
+
+# commands which only edit the CIB and therefore can be run in a batch, other
+# subcommands (e.g. resource cleanup or stonith fence) affect the live cluster
+BATCH_COMMANDS = {
+    "acl": (
+        "disable", "enable", "group", "permission", "role", "target", "user",
+    ),
+    "alert": ("create", "recipient", "remove", "update"),
+    "constraint": (
+        "colocation", "delete", "location", "order", "remove", "rule", "ticket",
+    ),
+    "property": ("set", "unset"),
+    "resource": (
+        "add_operation", "ban", "clear", "clone", "create", "defaults",
+        "delete", "disable", "enable", "group", "manage", "master", "meta",
+        "move", "op", "remove_operation", "unclone", "ungroup", "unmanage",
+        "update", "utilization",
+    ),
+    "stonith": ("create", "delete", "level", "update"),
+}
+
+# options which cannot be specified for a command in a batch
+_BATCH_FORBIDDEN_OPTIONS = (
+    "-f", "-h", "--help", "--fullhelp", "--version", "--wait",
+    "--corosync_conf", "--cluster_conf",
+)
+
+def batch_cmd(cmd_map, argv):
+    if argv and argv[0] == "help":
+        usage.batch(argv[1:])
+        sys.exit()
+    if len(argv) > 2:
+        usage.batch([])
+        sys.exit(1)
+
+    dry_run = False
+    batch_file = None
+    for arg in argv:
+        if arg == "dry-run":
+            dry_run = True
+        elif batch_file is None:
+            batch_file = arg
+        else:
+            usage.batch([])
+            sys.exit(1)
+
+    timeout = None
+    if "--wait" in utils.pcs_options:
+        if dry_run:
+            utils.err("Cannot use '--wait' together with 'dry-run'")
+        timeout = utils.validate_wait_get_timeout()
+
+    commands = parse_batch(read_batch(batch_file))
+    if not commands:
+        print("No commands to run")
+        return
+
+    original_cib = tempfile.NamedTemporaryFile(mode="w+", suffix=".pcs")
+    new_cib = tempfile.NamedTemporaryFile(mode="w+", suffix=".pcs")
+    original_cib.write(utils.get_cib())
+    original_cib.flush()
+    shutil.copyfile(original_cib.name, new_cib.name)
+
+    run_batch(cmd_map, commands, new_cib.name)
+
+    output, retval = utils.run(
+        [settings.crm_verify, "--xml-file", new_cib.name]
+    )
+    if retval != 0:
+        utils.err(
+            "Resulting CIB is not valid, no changes have been pushed\n"
+            +
+            output
+        )
+
+    if dry_run:
+        cib_diff = utils.diff_cib_files(original_cib.name, new_cib.name)
+        if cib_diff is None:
+            utils.err("unable to diff the CIBs")
+        if cib_diff:
+            print(cib_diff.strip())
+        else:
+            print("No changes would be pushed")
+        return
+
+    if utils.usefile:
+        shutil.copyfile(new_cib.name, utils.filename)
+        utils.invalidate_cib_snapshot()
+        return
+    # Push only the changes made by the batch. Diffing against the live CIB
+    # would revert changes other users have made meanwhile.
+    cib_diff = utils.diff_cib_files(original_cib.name, new_cib.name)
+    if cib_diff is None:
+        utils.err("unable to diff the CIBs, no changes have been pushed")
+    utils.push_cib_diff(cib_diff)
+    print("CIB updated")
+
+    if "--wait" not in utils.pcs_options:
+        return
+    cmd = ["crm_resource", "--wait"]
+    if timeout:
+        cmd.extend(["--timeout", timeout])
+    output, retval = utils.run(cmd)
+    if retval != 0:
+        msg = []
+        if retval == settings.pacemaker_wait_timeout_status:
+            msg.append("waiting timeout")
+        if output:
+            msg.append("\n" + output)
+        utils.err("\n".join(msg).strip())
+
+def read_batch(batch_file):
+    """
+    Return lines of a batch file, read stdin if batch_file is None or "-"
+    """
+    if batch_file is None or batch_file == "-":
+        return sys.stdin.readlines()
+    try:
+        with open(batch_file) as batch:
+            return batch.readlines()
+    except EnvironmentError as e:
+        utils.err("Unable to read {0}: {1}".format(batch_file, e.strerror))
+
+def parse_batch(lines):
+    """
+    Return list of (line number, command argv, command options)
+
+    lines -- lines of a batch, one pcs command per line without the leading
+        'pcs', empty lines and lines starting with # are skipped
+    """
+    commands = []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            utils.err("line {0}: {1}".format(line_number, e))
+        if argv[0] == "pcs":
+            argv = argv[1:]
+        try:
+            argv, options = parse_args.parse_command_line(argv)
+        except getopt.GetoptError as e:
+            utils.err("line {0}: {1}".format(line_number, e))
+        except CmdLineInputError as e:
+            utils.err("line {0}: {1}".format(line_number, e.message))
+        if not argv or argv[0] not in BATCH_COMMANDS:
+            utils.err(
+                "line {0}: '{1}' cannot be run in a batch, supported commands"
+                " are: {2}".format(
+                    line_number, line, ", ".join(sorted(BATCH_COMMANDS))
+                )
+            )
+        if len(argv) < 2 or argv[1] not in BATCH_COMMANDS[argv[0]]:
+            utils.err(
+                "line {0}: '{1}' cannot be run in a batch, supported {2}"
+                " commands are: {3}".format(
+                    line_number, line, argv[0],
+                    ", ".join(BATCH_COMMANDS[argv[0]])
+                )
+            )
+        for option in _BATCH_FORBIDDEN_OPTIONS:
+            if option in options:
+                utils.err(
+                    "line {0}: option '{1}' cannot be used in a batch".format(
+                        line_number, option
+                    )
+                )
+        commands.append((line_number, argv, options))
+    return commands
+
+def run_batch(cmd_map, commands, cib_file):
+    """
+    Run commands against the CIB stored in cib_file, exit on the first failure
+
+    cmd_map -- pcs command name to command handler
+    commands -- list of (line number, argv, options) as from parse_batch
+    cib_file -- path of a CIB file the commands modify
+    """
+    orig_pcs_options = utils.pcs_options
+    orig_usefile, orig_filename = utils.usefile, utils.filename
+    utils.usefile, utils.filename = True, cib_file
+    try:
+        for line_number, argv, options in commands:
+            utils.pcs_options = dict(options)
+            if "--debug" in orig_pcs_options:
+                utils.pcs_options["--debug"] = orig_pcs_options["--debug"]
+            try:
+                cmd_map[argv[0]](argv[1:])
+            except SystemExit as e:
+                if e.code:
+                    sys.stderr.write(
+                        "Error: batch failed on line {0}: {1}, no changes "
+                        "have been pushed\n".format(
+                            line_number, " ".join(argv)
+                        )
+                    )
+                    sys.exit(e.code)
+    finally:
+        utils.pcs_options = orig_pcs_options
+        utils.usefile, utils.filename = orig_usefile, orig_filename
+        utils.invalidate_cib_snapshot()
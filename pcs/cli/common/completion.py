@@ -5,6 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
+import json
+import os
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -21,6 +24,47 @@ def has_applicable_environment(environment):
         environment['COMP_CWORD'].isdigit()
     )
 
+def get_cache_path(environment):
+    """
+    Return path of the file caching the suggestion tree of the current user
+    dict environment - very likely os.environ
+    """
+    cache_dir = environment.get("XDG_CACHE_HOME", "").strip() or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_dir, "pcs", "completion_tree.json")
+
+def get_suggestion_tree(cache_path, cache_key, build_tree):
+    """
+    Return the suggestion tree from the cache, build and cache it if the cache
+    is missing or has been made for a different cache_key
+
+    string cache_path - path of the cache file
+    string cache_key - identifies the data the tree is built from
+    callable build_tree - returns the suggestion tree, takes no params
+    """
+    try:
+        with open(cache_path) as cache_file:
+            cache = json.load(cache_file)
+        if cache["key"] == cache_key:
+            return cache["tree"]
+    except (EnvironmentError, ValueError, KeyError, TypeError):
+        pass
+
+    suggestion_tree = build_tree()
+    # the cache is only an optimization, completion works without it
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        tmp_path = "{0}.{1}".format(cache_path, os.getpid())
+        with open(tmp_path, "w") as cache_file:
+            json.dump({"key": cache_key, "tree": suggestion_tree}, cache_file)
+        os.rename(tmp_path, cache_path)
+    except EnvironmentError:
+        pass
+    return suggestion_tree
+
 def make_suggestions(environment, suggestion_tree):
     """
     dict environment - very likely os.environ
@@ -250,6 +250,16 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         .format(**info)
     ,
 
+    codes.NODE_COMMUNICATION_ERROR_SKIPPED_OFFLINE: lambda info:
+        "Skipping {node}, unable to connect to it recently ({reason})"
+        .format(**info)
+    ,
+
+    codes.NODE_COMMUNICATION_ERROR_TIMED_OUT: lambda info:
+        "{node}: Unable to finish the operation in time, its result is unknown"
+        .format(**info)
+    ,
+
     codes.NODE_COMMUNICATION_ERROR_NOT_AUTHORIZED: lambda info:
         (
             "Unable to authenticate to {node} ({reason}),"
@@ -297,6 +307,16 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         .format(**info)
     ,
 
+    codes.COROSYNC_CONFIG_UNCHANGED_ON_NODE: lambda info:
+        "{node}: corosync.conf is up to date"
+        .format(**info)
+    ,
+
+    codes.COROSYNC_CONFIG_DISTRIBUTION_SUMMARY: lambda info:
+        "corosync.conf updated on {updated_node_count} of {node_count} nodes"
+        .format(**info)
+    ,
+
     codes.COROSYNC_NOT_RUNNING_CHECK_STARTED:
         "Checking corosync is not running on nodes..."
     ,
@@ -542,6 +562,11 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         .format(**info)
     ,
 
+    codes.CIB_DIFF_ERROR: lambda info:
+        "Unable to diff CIB: {reason}"
+        .format(**info)
+    ,
+
     codes.CIB_SAVE_TMP_ERROR: lambda info:
         "Unable to save CIB to a temporary file: {reason}"
         .format(**info)
@@ -14,29 +14,29 @@ from pcs.cli.common.reports import (
     LibraryReportProcessorToConsole,
     process_library_reports
 )
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    fencing_topology,
-    node,
-    qdevice,
-    quorum,
-    resource_agent,
-    sbd,
-    stonith_agent,
-)
-from pcs.lib.commands.constraint import (
-    colocation as constraint_colocation,
-    order as constraint_order,
-    ticket as constraint_ticket
-)
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryEnvError
 
 
 _CACHE = {}
 
+# library command modules imported by load_module
+LIBRARY_COMMAND_MODULES = [
+    "pcs.lib.commands.acl",
+    "pcs.lib.commands.alert",
+    "pcs.lib.commands.booth",
+    "pcs.lib.commands.constraint.colocation",
+    "pcs.lib.commands.constraint.order",
+    "pcs.lib.commands.constraint.ticket",
+    "pcs.lib.commands.fencing_topology",
+    "pcs.lib.commands.node",
+    "pcs.lib.commands.qdevice",
+    "pcs.lib.commands.quorum",
+    "pcs.lib.commands.resource_agent",
+    "pcs.lib.commands.sbd",
+    "pcs.lib.commands.stonith_agent",
+]
+
 def wrapper(dictionary):
     return namedtuple('wrapper', dictionary.keys())(**dictionary)
 
@@ -112,7 +112,9 @@ def get_module(env, middleware_factory, name):
 
 
 def load_module(env, middleware_factory, name):
+    # library command modules are imported only when they are needed
     if name == "acl":
+        from pcs.lib.commands import acl
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -136,6 +138,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "alert":
+        from pcs.lib.commands import alert
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -151,6 +154,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "booth":
+        from pcs.lib.commands import booth
         return bind_all(
             env,
             middleware.build(
@@ -179,6 +183,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_colocation':
+        from pcs.lib.commands.constraint import (
+            colocation as constraint_colocation
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -189,6 +196,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_order':
+        from pcs.lib.commands.constraint import (
+            order as constraint_order
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -199,6 +209,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_ticket':
+        from pcs.lib.commands.constraint import (
+            ticket as constraint_ticket
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -211,6 +224,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "fencing_topology":
+        from pcs.lib.commands import fencing_topology
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -225,6 +239,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "node":
+        from pcs.lib.commands import node
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -242,6 +257,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "qdevice":
+        from pcs.lib.commands import qdevice
         return bind_all(
             env,
             middleware.build(),
@@ -265,6 +281,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "quorum":
+        from pcs.lib.commands import quorum
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -281,6 +298,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource_agent":
+        from pcs.lib.commands import resource_agent
         return bind_all(
             env,
             middleware.build(),
@@ -295,6 +313,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "sbd":
+        from pcs.lib.commands import sbd
         return bind_all(
             env,
             middleware.build(),
@@ -308,6 +327,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith_agent":
+        from pcs.lib.commands import stonith_agent
         return bind_all(
             env,
             middleware.build(),
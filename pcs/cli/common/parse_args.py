@@ -5,6 +5,8 @@ from __future__ import (
     unicode_literals,
 )
 
+import getopt
+
 from pcs.cli.common.errors import CmdLineInputError
 
 
@@ -15,7 +17,7 @@ ARG_TYPE_DELIMITER = "%"
 # V = verbose (cluster verify)
 PCS_SHORT_OPTIONS = "hf:p:u:V"
 PCS_LONG_OPTIONS = [
-    "debug", "version", "help", "fullhelp",
+    "debug", "version", "help", "fullhelp", "no-cache",
     "force", "skip-offline", "autocorrect", "interactive", "autodelete",
     "all", "full", "groups", "local", "wait", "config",
     "start", "enable", "disabled", "off",
@@ -193,3 +195,54 @@ def filter_out_options(arg_list):
         ):
             args_without_options.append(arg)
     return args_without_options
+
+def parse_command_line(argv):
+    """
+    Return (arguments, options) of a pcs command line
+
+    Raise getopt.GetoptError if there is an unknown option, raise
+    CmdLineInputError if an option is specified more than once.
+
+    list argv contains command line arguments
+    """
+    # we change --cloneopt to "clone" for backwards compatibility
+    new_argv = []
+    for arg in argv:
+        if arg == "--cloneopt" or arg == "--clone":
+            new_argv.append("clone")
+        elif arg.startswith("--cloneopt="):
+            new_argv.append("clone")
+            new_argv.append(arg.split('=', 1)[1])
+        else:
+            new_argv.append(arg)
+    argv = new_argv
+
+    # we want to support optional arguments for --wait, so if an argument
+    # is specified with --wait (ie. --wait=30) then we use them
+    waitsecs = None
+    new_argv = []
+    for arg in argv:
+        if arg.startswith("--wait="):
+            tempsecs = arg.replace("--wait=", "")
+            if len(tempsecs) > 0:
+                waitsecs = tempsecs
+                arg = "--wait"
+        new_argv.append(arg)
+    argv = new_argv
+
+    option_list, dummy_argv = getopt.gnu_getopt(
+        filter_out_non_option_negative_numbers(argv),
+        PCS_SHORT_OPTIONS,
+        PCS_LONG_OPTIONS,
+    )
+    options = {}
+    for name, value in option_list:
+        if name == "--watchdog":
+            options.setdefault(name, []).append(value)
+        elif name in options:
+            raise CmdLineInputError("{0} can only be used once".format(name))
+        elif name == "--wait":
+            options[name] = waitsecs
+        else:
+            options[name] = value
+    return filter_out_options(argv), options
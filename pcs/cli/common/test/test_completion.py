@@ -5,10 +5,16 @@ from __future__ import (
     unicode_literals,
 )
 
+import os
+import shutil
+import tempfile
+
 from pcs.test.tools.pcs_unittest import TestCase
 
 from pcs.cli.common.completion import (
     _find_suggestions,
+    get_cache_path,
+    get_suggestion_tree,
     has_applicable_environment,
     make_suggestions,
     _split_words,
@@ -164,3 +170,67 @@ class SplitWordsTest(TestCase):
             EnvironmentError,
             lambda: _split_words("pcs resource op a ", ["3", "8", "2", "1"])
         )
+
+class GetCachePathTest(TestCase):
+    def test_use_xdg_cache_home(self):
+        self.assertEqual(
+            "/cache/pcs/completion_tree.json",
+            get_cache_path({"XDG_CACHE_HOME": "/cache"})
+        )
+
+    def test_default_to_home(self):
+        self.assertEqual(
+            os.path.join(
+                os.path.expanduser("~"), ".cache/pcs/completion_tree.json"
+            ),
+            get_cache_path({})
+        )
+
+class GetSuggestionTreeTest(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.cache_dir, "pcs", "tree.json")
+        self.build_count = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def build_tree(self):
+        self.build_count += 1
+        return tree
+
+    def test_build_and_cache(self):
+        self.assertEqual(
+            tree, get_suggestion_tree(self.cache_path, "1", self.build_tree)
+        )
+        self.assertEqual(
+            tree, get_suggestion_tree(self.cache_path, "1", self.build_tree)
+        )
+        self.assertEqual(1, self.build_count)
+
+    def test_rebuild_on_key_change(self):
+        get_suggestion_tree(self.cache_path, "1", self.build_tree)
+        get_suggestion_tree(self.cache_path, "2", self.build_tree)
+        get_suggestion_tree(self.cache_path, "2", self.build_tree)
+        self.assertEqual(2, self.build_count)
+
+    def test_rebuild_on_broken_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "w") as cache_file:
+            cache_file.write("[broken")
+        self.assertEqual(
+            tree, get_suggestion_tree(self.cache_path, "1", self.build_tree)
+        )
+        self.assertEqual(1, self.build_count)
+
+    def test_cache_not_writable(self):
+        cache_path = os.path.join(self.cache_dir, "file", "tree.json")
+        with open(os.path.join(self.cache_dir, "file"), "w"):
+            pass
+        self.assertEqual(
+            tree, get_suggestion_tree(cache_path, "1", self.build_tree)
+        )
+        self.assertEqual(
+            tree, get_suggestion_tree(cache_path, "1", self.build_tree)
+        )
+        self.assertEqual(2, self.build_count)
@@ -5,6 +5,8 @@ from __future__ import (
     unicode_literals,
 )
 
+import getopt
+
 from pcs.test.tools.pcs_unittest import TestCase
 from pcs.cli.common.parse_args import(
     group_by_keywords,
@@ -18,6 +20,7 @@ from pcs.cli.common.parse_args import(
     is_short_option_expecting_value,
     is_long_option_expecting_value,
     is_option_expecting_value,
+    parse_command_line,
 )
 from pcs.cli.common.errors import CmdLineInputError
 
@@ -364,3 +367,52 @@ class IsOptionExpectingValue(TestCase):
         self.assertFalse(is_option_expecting_value("--name=Name"))
         self.assertFalse(is_option_expecting_value("-fvalue"))
 
+
+class ParseCommandLine(TestCase):
+    def test_split_arguments_and_options(self):
+        self.assertEqual(
+            (
+                ["resource", "create", "R", "Dummy", "clone", "-1"],
+                {"--group": "G", "-f": "cib.xml", "--force": ""},
+            ),
+            parse_command_line([
+                "-f", "cib.xml", "resource", "create", "R", "Dummy",
+                "--clone", "--group", "G", "-1", "--force",
+            ])
+        )
+
+    def test_cloneopt_value(self):
+        self.assertEqual(
+            (["resource", "create", "R", "clone", "a=b"], {}),
+            parse_command_line(["resource", "create", "R", "--cloneopt=a=b"])
+        )
+
+    def test_wait(self):
+        self.assertEqual(
+            (["resource", "enable", "R"], {"--wait": "30"}),
+            parse_command_line(["resource", "enable", "R", "--wait=30"])
+        )
+        self.assertEqual(
+            (["resource", "enable", "R"], {"--wait": None}),
+            parse_command_line(["resource", "enable", "R", "--wait"])
+        )
+
+    def test_watchdog_can_be_repeated(self):
+        self.assertEqual(
+            (["cluster", "setup"], {"--watchdog": ["/dev/w1", "/dev/w2"]}),
+            parse_command_line([
+                "cluster", "setup", "--watchdog=/dev/w1", "--watchdog=/dev/w2"
+            ])
+        )
+
+    def test_raise_on_duplicate_option(self):
+        self.assertRaises(
+            CmdLineInputError,
+            lambda: parse_command_line(["status", "--full", "--full"])
+        )
+
+    def test_raise_on_unknown_option(self):
+        self.assertRaises(
+            getopt.GetoptError,
+            lambda: parse_command_line(["status", "--unknown"])
+        )
@@ -175,8 +175,7 @@ def cluster_cmd(argv):
         sys.exit(1)
 
 def sync_nodes(nodes,config):
-    for node in nodes:
-        utils.setCorosyncConfig(node,config)
+    utils.setCorosyncConfigOnNodes(nodes, config)
 
 def cluster_auth(argv):
     if len(argv) == 0:
@@ -214,8 +213,10 @@ def auth_nodes(nodes):
     set_nodes = set(nodes)
     need_auth = "--force" in utils.pcs_options or (username or password)
     if not need_auth:
-        for node in set_nodes:
-            status = utils.checkAuthorization(node)
+        status_list = utils.run_for_nodes(
+            utils.checkAuthorization, list(set_nodes)
+        )
+        for status in status_list:
             if status[0] == 3:
                 need_auth = True
                 break
@@ -380,8 +381,12 @@ def cluster_setup(argv):
         # checks that nodes are authenticated as well
         if "--force" not in utils.pcs_options:
             all_nodes_available = True
-            for node in primary_addr_list:
-                available, message = utils.canAddNodeToCluster(node)
+            availability_list = utils.run_for_nodes(
+                utils.canAddNodeToCluster, primary_addr_list
+            )
+            for node, (available, message) in zip(
+                primary_addr_list, availability_list
+            ):
                 if not available:
                     all_nodes_available = False
                     utils.err("{0}: {1}".format(node, message), False)
@@ -426,8 +431,7 @@ def cluster_setup(argv):
             print("Warning: {0}".format(err_msg))
 
         # send the cluster config
-        for node in primary_addr_list:
-            utils.setCorosyncConfig(node, config)
+        utils.setCorosyncConfigOnNodes(primary_addr_list, config)
 
         # start and enable the cluster if requested
         if "--start" in utils.pcs_options:
@@ -1018,19 +1022,23 @@ def stop_cluster_nodes(nodes):
 
     stopping_all = set(nodes) >= set(all_nodes)
     if "--force" not in utils.pcs_options and not stopping_all:
-        error_list = []
-        for node in nodes:
-            retval, data = utils.get_remote_quorumtool_output(node)
+        # we are sure whether we are on cman cluster or not because only
+        # nodes from a local cluster can be stopped (see nodes validation
+        # above)
+        if utils.is_rhel6():
+            parse_quorum_info = utils.parse_cman_quorum_info
+        else:
+            parse_quorum_info = utils.parse_quorumtool_output
+        # ask all the nodes at once and use the first quorate answer, nodes
+        # which have not answered yet are not waited for
+        node_error_map = {}
+        for node, (retval, data) in utils.iterate_for_nodes(
+            utils.get_remote_quorumtool_output, nodes
+        ):
             if retval != 0:
-                error_list.append(node + ": " + data)
+                node_error_map[node] = node + ": " + data
                 continue
-            # we are sure whether we are on cman cluster or not because only
-            # nodes from a local cluster can be stopped (see nodes validation
-            # above)
-            if utils.is_rhel6():
-                quorum_info = utils.parse_cman_quorum_info(data)
-            else:
-                quorum_info = utils.parse_quorumtool_output(data)
+            quorum_info = parse_quorum_info(data)
             if quorum_info:
                 if not quorum_info["quorate"]:
                     continue
@@ -1043,16 +1051,19 @@ def stop_cluster_nodes(nodes):
                     )
                 else:
                     # We have the info, no need to print errors
-                    error_list = []
+                    node_error_map = {}
                     break
             if not utils.is_node_offline_by_quorumtool_output(data):
-                error_list.append("Unable to get quorum status")
+                node_error_map[node] = "Unable to get quorum status"
             # else the node seems to be stopped already
-        if error_list:
+        if node_error_map:
             utils.err(
                 "Unable to determine whether stopping the nodes will cause "
                 + "a loss of the quorum, use --force to override\n"
-                + "\n".join(error_list)
+                + "\n".join([
+                    node_error_map[node] for node in nodes
+                    if node in node_error_map
+                ])
             )
 
     was_error = False
@@ -1248,6 +1259,7 @@ def cluster_push(argv):
     filename = None
     scope = None
     timeout = None
+    diff_against = None
     if "--wait" in utils.pcs_options:
         timeout = utils.validate_wait_get_timeout()
     for arg in argv:
@@ -1260,11 +1272,15 @@ def cluster_push(argv):
                     utils.err("invalid CIB scope '%s'" % arg_value)
                 else:
                     scope = arg_value
+            elif arg_name == "diff-against":
+                diff_against = arg_value
             else:
                 usage.cluster(["cib-push"])
                 sys.exit(1)
     if "--config" in utils.pcs_options:
         scope = "configuration"
+    if diff_against and scope:
+        utils.err("Cannot use diff-against together with scope or --config")
     if not filename:
         usage.cluster(["cib-push"])
         sys.exit(1)
@@ -1279,12 +1295,27 @@ def cluster_push(argv):
     except (EnvironmentError, xml.parsers.expat.ExpatError) as e:
         utils.err("unable to parse new cib: %s" % e)
 
-    command = ["cibadmin", "--replace", "--xml-file", filename]
-    if scope:
-        command.append("--scope=%s" % scope)
-    output, retval = utils.run(command)
-    if retval != 0:
-        utils.err("unable to push cib\n" + output)
+    if diff_against:
+        try:
+            xml.dom.minidom.parse(diff_against)
+        except (EnvironmentError, xml.parsers.expat.ExpatError) as e:
+            utils.err("unable to parse original cib: %s" % e)
+        cib_diff = utils.diff_cib_files(diff_against, filename)
+        if cib_diff is None:
+            utils.err("unable to diff the CIBs")
+        if not cib_diff:
+            print(
+                "The new CIB is the same as the original CIB, nothing to push."
+            )
+            return
+        utils.push_cib_diff(cib_diff)
+    else:
+        command = ["cibadmin", "--replace", "--xml-file", filename]
+        if scope:
+            command.append("--scope=%s" % scope)
+        output, retval = utils.run(command)
+        if retval != 0:
+            utils.err("unable to push cib\n" + output)
     print("CIB updated")
     if "--wait" not in utils.pcs_options:
         return
@@ -1460,7 +1491,7 @@ def cluster_node(argv):
         if "--start" in utils.pcs_options and "--wait" in utils.pcs_options:
             wait_timeout = utils.validate_wait_get_timeout(False)
             wait = True
-        need_ring1_address = utils.need_ring1_address(utils.getCorosyncConf())
+        need_ring1_address = utils.need_ring1_address()
         if not node1 and need_ring1_address:
             utils.err(
                 "cluster is configured for RRP, "
@@ -1487,8 +1518,8 @@ def cluster_node(argv):
         try:
             # qdevice setup
             if not utils.is_rhel6():
-                conf_facade = corosync_conf_facade.from_string(
-                    utils.getCorosyncConf()
+                conf_facade = corosync_conf_facade(
+                    utils.getCorosyncConfParsed()
                 )
                 qdevice_model, qdevice_model_options, _ = conf_facade.get_quorum_device_settings()
                 if qdevice_model == "net":
@@ -0,0 +1,236 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+import time
+
+
+class TaskResult(object):
+    """
+    Outcome of one task run by ParallelExecutor
+    """
+    def __init__(self, index, args, kwargs):
+        self.index = index
+        self.args = args
+        self.kwargs = kwargs
+        self.value = None
+        self.exception = None
+        # the task did not finish in time, its thread has been abandoned
+        self.timed_out = False
+        # the task has not been started, the executor has been cancelled or
+        # its deadline has passed
+        self.cancelled = False
+        self.started = None
+        self.finished = None
+
+    @property
+    def succeeded(self):
+        return not (self.timed_out or self.cancelled or self.exception)
+
+    @property
+    def duration(self):
+        """
+        Time in seconds the task has been running, None if it has not run
+        """
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+    def get_value(self):
+        """
+        Return the task's return value, raise the exception it raised
+        """
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+class _RunState(object):
+    def __init__(self):
+        self.cancelled = False
+
+
+class ParallelExecutor(object):
+    """
+    Run a function for a list of arguments in a bounded number of threads
+
+    A task which does not finish in task_timeout seconds is marked as timed out
+    and its thread is abandoned (python threads cannot be killed), so it does
+    not block the executor. Once the deadline passes, running tasks are marked
+    as timed out and tasks which have not been started are cancelled.
+    """
+    def __init__(self, max_workers=None, task_timeout=None, deadline=None):
+        """
+        int max_workers maximal number of tasks running at once, None means
+            unlimited
+        number task_timeout maximal time in seconds a task may run
+        number deadline maximal time in seconds running all tasks may take
+        """
+        self._max_workers = max_workers
+        self._task_timeout = task_timeout
+        self._deadline = deadline
+        self._condition = threading.Condition()
+        # states of runs in progress, the executor may be used repeatedly
+        self._run_state_list = []
+
+    def cancel(self):
+        """
+        Do not start any more tasks of runs in progress, may be called from
+        any thread
+        """
+        with self._condition:
+            for run_state in self._run_state_list:
+                run_state.cancelled = True
+            self._condition.notify_all()
+
+    def run(self, worker, data_list):
+        """
+        Run all tasks, return a list of TaskResult in the order of data_list
+
+        callable worker
+        iterable data_list items are (args, kwargs) to call the worker with
+        """
+        return list(self.iterate(worker, data_list))
+
+    def iterate(self, worker, data_list, ordered=True):
+        """
+        Run all tasks, yield TaskResult as they finish
+
+        bool ordered yield results in the order of data_list, otherwise in the
+            order the tasks finish
+        Tasks not started yet are cancelled if the iteration is stopped.
+        """
+        result_list = [
+            TaskResult(index, args, kwargs)
+            for index, (args, kwargs) in enumerate(data_list)
+        ]
+        deadline = (
+            None if self._deadline is None else time.time() + self._deadline
+        )
+        pending = list(reversed(result_list))
+        running = []
+        done = _DoneTasks()
+        next_index = 0
+        run_state = _RunState()
+        with self._condition:
+            self._run_state_list.append(run_state)
+        try:
+            while next_index < len(result_list):
+                with self._condition:
+                    now = time.time()
+                    if deadline is not None and now >= deadline:
+                        run_state.cancelled = True
+                    self._check_running(running, done, now, deadline)
+                    while pending and (
+                        run_state.cancelled or self._has_slot(running)
+                    ):
+                        task = pending.pop()
+                        if run_state.cancelled:
+                            task.cancelled = True
+                            done.add(task)
+                        else:
+                            self._start(worker, task, running, done)
+                    if ordered:
+                        ready_list = []
+                        index = next_index
+                        while index < len(result_list) and index in done:
+                            ready_list.append(result_list[index])
+                            index += 1
+                    else:
+                        ready_list = done.pop_finished()
+                    if not ready_list:
+                        self._condition.wait(
+                            self._get_wait_time(running, now, deadline)
+                        )
+                        continue
+                for task in ready_list:
+                    next_index += 1
+                    yield task
+        finally:
+            # abandon running tasks and cancel the rest if the caller does not
+            # want more results
+            with self._condition:
+                run_state.cancelled = True
+                self._run_state_list.remove(run_state)
+                self._condition.notify_all()
+
+    def _has_slot(self, running):
+        return self._max_workers is None or len(running) < self._max_workers
+
+    def _start(self, worker, task, running, done):
+        def run_task():
+            try:
+                value = worker(*task.args, **task.kwargs)
+                exception = None
+            except Exception as e:
+                value = None
+                exception = e
+            with self._condition:
+                # the result of a timed out task is thrown away
+                if task.index not in done:
+                    task.value = value
+                    task.exception = exception
+                    task.finished = time.time()
+                    running.remove(task)
+                    done.add(task)
+                self._condition.notify_all()
+
+        task.started = time.time()
+        running.append(task)
+        thread = threading.Thread(target=run_task)
+        thread.daemon = True
+        thread.start()
+
+    def _check_running(self, running, done, now, deadline):
+        for task in list(running):
+            if (
+                (deadline is not None and now >= deadline)
+                or
+                (
+                    self._task_timeout is not None
+                    and
+                    now - task.started >= self._task_timeout
+                )
+            ):
+                task.timed_out = True
+                task.finished = now
+                running.remove(task)
+                done.add(task)
+
+    def _get_wait_time(self, running, now, deadline):
+        wake_up_list = [
+            task.started + self._task_timeout for task in running
+            if self._task_timeout is not None
+        ]
+        if deadline is not None:
+            wake_up_list.append(deadline)
+        # a timeout keeps the wait interruptible in python2
+        wait = 1
+        if wake_up_list:
+            wait = min(wait, max(0, min(wake_up_list) - now))
+        return wait
+
+
+class _DoneTasks(object):
+    def __init__(self):
+        self._index_set = set()
+        self._finished_list = []
+
+    def __contains__(self, index):
+        return index in self._index_set
+
+    def add(self, task):
+        self._index_set.add(task.index)
+        self._finished_list.append(task)
+
+    def pop_finished(self):
+        """
+        Return tasks finished since the last call in the order they finished
+        """
+        finished_list = self._finished_list
+        self._finished_list = []
+        return finished_list
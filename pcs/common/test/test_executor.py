@@ -0,0 +1,153 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+import time
+
+from pcs.test.tools.pcs_unittest import TestCase
+
+from pcs.common.executor import ParallelExecutor
+
+
+class ParallelExecutorTest(TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def worker(self, value, sleep=0, block=False):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(sleep)
+        if block:
+            self.release.wait(10)
+        with self.lock:
+            self.running -= 1
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def test_results_in_order(self):
+        result_list = ParallelExecutor().run(
+            self.worker,
+            [((value, ), {"sleep": (5 - value) * 0.02}) for value in range(5)]
+        )
+        self.assertEqual(
+            list(range(5)), [result.get_value() for result in result_list]
+        )
+        self.assertEqual(list(range(5)), [r.index for r in result_list])
+        for result in result_list:
+            self.assertTrue(result.succeeded)
+            self.assertTrue(result.duration >= 0)
+
+    def test_results_as_they_finish(self):
+        result_list = ParallelExecutor().iterate(
+            self.worker,
+            [((value, ), {"sleep": (3 - value) * 0.05}) for value in range(3)],
+            ordered=False
+        )
+        self.assertEqual([2, 1, 0], [result.value for result in result_list])
+
+    def test_max_workers(self):
+        result_list = ParallelExecutor(max_workers=2).run(
+            self.worker, [((value, ), {"sleep": 0.05}) for value in range(6)]
+        )
+        self.assertEqual(
+            list(range(6)), [result.value for result in result_list]
+        )
+        self.assertEqual(2, self.max_running)
+
+    def test_exception(self):
+        error = ValueError("error")
+        result_list = ParallelExecutor().run(
+            self.worker, [((1, ), {}), ((error, ), {}), ((3, ), {})]
+        )
+        self.assertEqual(1, result_list[0].get_value())
+        self.assertFalse(result_list[1].succeeded)
+        self.assertIs(error, result_list[1].exception)
+        self.assertRaises(ValueError, result_list[1].get_value)
+        self.assertEqual(3, result_list[2].get_value())
+
+    def test_task_timeout(self):
+        start = time.time()
+        result_list = ParallelExecutor(max_workers=1, task_timeout=0.1).run(
+            self.worker, [((1, ), {"block": True}), ((2, ), {})]
+        )
+        self.assertTrue(time.time() - start < 5)
+        self.assertTrue(result_list[0].timed_out)
+        self.assertIsNone(result_list[0].value)
+        self.assertTrue(result_list[0].duration >= 0.1)
+        self.assertTrue(result_list[1].succeeded)
+        self.assertEqual(2, result_list[1].value)
+
+    def test_deadline(self):
+        result_list = ParallelExecutor(max_workers=1, deadline=0.1).run(
+            self.worker,
+            [((1, ), {}), ((2, ), {"block": True}), ((3, ), {})]
+        )
+        self.assertEqual(
+            [(True, False, False), (False, True, False), (False, False, True)],
+            [
+                (result.succeeded, result.timed_out, result.cancelled)
+                for result in result_list
+            ]
+        )
+        self.assertIsNone(result_list[2].duration)
+
+    def test_cancel(self):
+        executor = ParallelExecutor(max_workers=1)
+        def worker(value):
+            if value == 1:
+                executor.cancel()
+            return value
+        result_list = executor.run(
+            worker, [((value, ), {}) for value in range(4)]
+        )
+        self.assertEqual(
+            [(0, False), (1, False), (None, True), (None, True)],
+            [(result.value, result.cancelled) for result in result_list]
+        )
+
+    def test_run_again_after_cancel(self):
+        executor = ParallelExecutor(max_workers=1)
+        def worker(value):
+            if value == 0:
+                executor.cancel()
+            return value
+        executor.run(worker, [((value, ), {}) for value in range(2)])
+        result_list = executor.run(
+            worker, [((value, ), {}) for value in range(1, 3)]
+        )
+        self.assertEqual(
+            [(1, False), (2, False)],
+            [(result.value, result.cancelled) for result in result_list]
+        )
+
+    def test_run_again_after_deadline(self):
+        executor = ParallelExecutor(max_workers=1, deadline=0.1)
+        executor.run(self.worker, [((1, ), {"block": True}), ((2, ), {})])
+        result_list = executor.run(self.worker, [((3, ), {})])
+        self.assertEqual(
+            [(3, True)],
+            [(result.value, result.succeeded) for result in result_list]
+        )
+
+    def test_stop_iteration_cancels_pending_tasks(self):
+        started = []
+        def worker(value):
+            started.append(value)
+            return value
+        iterator = ParallelExecutor(max_workers=1).iterate(
+            worker, [((value, ), {}) for value in range(4)]
+        )
+        self.assertEqual(0, next(iterator).value)
+        iterator.close()
+        time.sleep(0.1)
+        self.assertTrue(len(started) < 4)
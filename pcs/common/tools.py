@@ -5,7 +5,7 @@ from __future__ import (
     unicode_literals,
 )
 
-import threading
+from pcs.common.executor import ParallelExecutor
 
 
 def simple_cache(func):
@@ -24,15 +24,26 @@ def simple_cache(func):
 
 
 def run_parallel(worker, data_list):
-    thread_list = []
-    for args, kwargs in data_list:
-        thread = threading.Thread(target=worker, args=args, kwargs=kwargs)
-        thread.daemon = True
-        thread_list.append(thread)
-        thread.start()
-
-    for thread in thread_list:
-        thread.join()
+    """
+    Run worker for each item of data_list in parallel, wait for all of them
+
+    callable worker
+    iterable data_list items are (args, kwargs) to call the worker with
+    """
+    ParallelExecutor().run(worker, data_list)
+
+def iterate_parallel(worker, data_list, max_workers):
+    """
+    Run worker for each item of data_list in at most max_workers threads
+    Yield results in the order of data_list, each as soon as it is ready. An
+    exception raised by the worker is raised when its result is to be yielded.
+
+    callable worker
+    iterable data_list items are (args, kwargs) to call the worker with
+    int max_workers maximal number of threads running at once
+    """
+    for result in ParallelExecutor(max_workers).iterate(worker, data_list):
+        yield result.get_value()
 
 def format_environment_error(e):
     if e.filename:
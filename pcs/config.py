@@ -276,9 +276,9 @@ def config_restore_remote(infile_name, infile_obj):
         utils.err("no nodes found in the tarball")
 
     err_msgs = []
-    for node in node_list:
+    status_list = utils.run_for_nodes(utils.checkStatus, node_list)
+    for node, (retval, output) in zip(node_list, status_list):
         try:
-            retval, output = utils.checkStatus(node)
             if retval != 0:
                 err_msgs.append(output)
                 continue
@@ -309,8 +309,10 @@ def config_restore_remote(infile_name, infile_obj):
     # Temporarily disable config files syncing thread in pcsd so it will not
     # rewrite restored files. 10 minutes should be enough time to restore.
     # If node returns HTTP 404 it does not support config syncing at all.
-    for node in node_list:
-        retval, output = utils.pauseConfigSyncing(node, 10 * 60)
+    pause_list = utils.run_for_nodes(
+        utils.pauseConfigSyncing, node_list, 10 * 60
+    )
+    for retval, output in pause_list:
         if not (retval == 0 or "(HTTP error: 404)" in output):
             utils.err(output)
 
@@ -322,10 +324,16 @@ def config_restore_remote(infile_name, infile_obj):
             tarball_data = tarball.read()
 
     error_list = []
-    for node in node_list:
-        retval, error = utils.restoreConfig(node, tarball_data)
+    restore_list = utils.run_for_nodes(
+        utils.restoreConfig, node_list, tarball_data, quiet=True
+    )
+    # print results in the order of nodes as if the nodes were called one by
+    # one
+    for node, (retval, output) in zip(node_list, restore_list):
         if retval != 0:
-            error_list.append(error)
+            error_list.append(output)
+        else:
+            print("{0}: {1}".format(node, output.strip()))
     if error_list:
         utils.err("unable to restore all nodes\n" + "\n".join(error_list))
 
@@ -0,0 +1,311 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import errno
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+
+from pcs import (
+    settings,
+    usage,
+    utils,
+)
+from pcs.lib.errors import LibraryError
+
+
+# set in a worker process, a worker must not start another daemon
+_in_worker = False
+
+class _RequestTimeout(BaseException):
+    # not an Exception so that pcs code catching errors does not swallow it
+    pass
+
+def daemon_cmd(argv):
+    if argv and argv[0] == "help":
+        usage.daemon(argv[1:])
+        sys.exit()
+    if _in_worker:
+        utils.err("Cannot run pcs daemon from pcs daemon")
+
+    socket_path = settings.pcs_daemon_socket
+    max_workers = settings.pcs_daemon_workers
+    for arg in argv:
+        if "=" not in arg:
+            usage.daemon([])
+            sys.exit(1)
+        name, value = arg.split("=", 1)
+        if name == "socket" and value:
+            socket_path = value
+        elif name == "workers":
+            if not value.isdigit() or int(value) < 1:
+                utils.err("'{0}' is not a valid number of workers".format(
+                    value
+                ))
+            max_workers = int(value)
+        else:
+            usage.daemon([])
+            sys.exit(1)
+
+    # Everything forked workers inherit is loaded and cached once here.
+    # pcs imports command modules on demand, workers would import them for
+    # each request otherwise. (pcs.app is imported here as it imports this
+    # module.)
+    from pcs import app
+    app.import_command_modules()
+    try:
+        utils.is_cman_cluster()
+    except LibraryError:
+        # workers will report the error when they need to know
+        pass
+    server = create_server(socket_path)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        serve(server, max_workers)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+def _exit_on_signal(signum, frame):
+    sys.exit(0)
+
+def create_server(socket_path):
+    """
+    Return a listening UNIX socket accessible by root only
+    """
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir and not os.path.isdir(socket_dir):
+        try:
+            os.makedirs(socket_dir, 0o700)
+        except OSError as e:
+            utils.err("Unable to create {0}: {1}".format(
+                socket_dir, e.strerror
+            ))
+    try:
+        os.unlink(socket_path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            utils.err("Unable to remove {0}: {1}".format(
+                socket_path, e.strerror
+            ))
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(socket_path)
+    except socket.error as e:
+        utils.err("Unable to listen on {0}: {1}".format(socket_path, e))
+    finally:
+        os.umask(old_umask)
+    server.listen(socket.SOMAXCONN)
+    return server
+
+def serve(server, max_workers):
+    """
+    Run each accepted request in a forked worker, at most max_workers at once
+
+    Each request is handled in its own process, so global state pcs commands
+    set (options, -f, caches...) never leaks from one request to another.
+    A worker is killed when it does not finish in
+    settings.pcs_daemon_request_timeout seconds.
+    """
+    workers = set()
+    # Finished workers are reaped on SIGCHLD. Reaping is paused while the
+    # loop waits for a worker itself or registers a new one, children which
+    # finish meanwhile are reaped by the loop.
+    reaping = {"paused": False}
+    def reap_on_signal(signum, frame):
+        if not reaping["paused"]:
+            _reap_workers(workers)
+    signal.signal(signal.SIGCHLD, reap_on_signal)
+    try:
+        while True:
+            reaping["paused"] = True
+            if len(workers) >= max_workers:
+                _reap_workers(workers, block=True)
+            reaping["paused"] = False
+            _reap_workers(workers)
+            if len(workers) >= max_workers:
+                continue
+            try:
+                connection, dummy_address = server.accept()
+            except socket.error as e:
+                if e.args and e.args[0] == errno.EINTR:
+                    continue
+                raise
+            reaping["paused"] = True
+            pid = os.fork()
+            if pid == 0:
+                _run_worker(server, connection)
+            connection.close()
+            workers.add(pid)
+            reaping["paused"] = False
+            _reap_workers(workers)
+    finally:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+def _run_worker(server, connection):
+    # the worker's subprocesses must not be reaped by the daemon's handler
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGALRM, _raise_request_timeout)
+    signal.alarm(settings.pcs_daemon_request_timeout)
+    server.close()
+    exit_code = 0
+    try:
+        handle_connection(connection)
+    except BaseException:
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+def _raise_request_timeout(signum, frame):
+    raise _RequestTimeout()
+
+def _reap_workers(workers, block=False):
+    while workers:
+        try:
+            pid, dummy_status = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except OSError as e:
+            if e.errno == errno.EINTR:
+                continue
+            if e.errno == errno.ECHILD:
+                workers.clear()
+            return
+        if pid == 0:
+            return
+        workers.discard(pid)
+        block = False
+
+def handle_connection(connection):
+    """
+    Read one request from the connection, run it and send the result back
+
+    A request is a JSON object on one line:
+        {"argv": [...], "CIB_user": ..., "CIB_user_groups": ..., "stdin": ...}
+    The response is a JSON object on one line:
+        {"stdout": ..., "stderr": ..., "code": ...}
+    """
+    connection_file = connection.makefile("rwb")
+    try:
+        try:
+            request = json.loads(connection_file.readline().decode("utf-8"))
+            response = run_request(
+                request["argv"],
+                request.get("CIB_user"),
+                request.get("CIB_user_groups"),
+                request.get("stdin"),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            response = {
+                "stdout": "",
+                "stderr": "Error: invalid request: {0}\n".format(e),
+                "code": 1,
+            }
+        connection_file.write(
+            (json.dumps(response) + "\n").encode("utf-8")
+        )
+        connection_file.flush()
+    finally:
+        connection_file.close()
+        connection.close()
+
+def _reopen_std_stream(fd, mode):
+    # sys.std* may have been replaced by objects not backed by the fds
+    if sys.version_info[0] < 3:
+        return os.fdopen(os.dup(fd), mode)
+    return io.open(fd, mode, encoding="utf-8", closefd=False)
+
+def run_request(argv, cib_user=None, cib_user_groups=None, stdin=None):
+    """
+    Run pcs with argv in the current process, return its output and exit code
+
+    Meant to be called in a forked worker only, it replaces the process's
+    stdin, stdout, stderr and environment.
+    """
+    global _in_worker
+    _in_worker = True
+    if (
+        not isinstance(argv, list)
+        or
+        not argv
+        or
+        not all(isinstance(arg, type("")) for arg in argv)
+    ):
+        raise TypeError("argv must be a non-empty list of strings")
+
+    for name, value in (
+        ("CIB_user", cib_user), ("CIB_user_groups", cib_user_groups)
+    ):
+        if value:
+            os.environ[name] = value
+        elif name in os.environ:
+            del os.environ[name]
+    os.environ["LC_ALL"] = "C"
+
+    stdin_file = tempfile.TemporaryFile()
+    if stdin:
+        stdin_file.write(stdin.encode("utf-8"))
+        stdin_file.seek(0)
+    stdout_file = tempfile.TemporaryFile()
+    stderr_file = tempfile.TemporaryFile()
+    # Redirect the file descriptors so output of external processes is
+    # captured as well.
+    os.dup2(stdin_file.fileno(), 0)
+    os.dup2(stdout_file.fileno(), 1)
+    os.dup2(stderr_file.fileno(), 2)
+    sys.stdin = _reopen_std_stream(0, "r")
+    sys.stdout = _reopen_std_stream(1, "w")
+    sys.stderr = _reopen_std_stream(2, "w")
+
+    # imported here as pcs.app imports this module
+    from pcs import app
+    # options of the daemon itself, app.main does not set them on --version
+    utils.pcs_options = {}
+    code = 0
+    try:
+        app.main(argv)
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            sys.stderr.write("{0}\n".format(e.code))
+            code = 1
+    except Exception as e:
+        sys.stderr.write("Error: {0}\n".format(e))
+        code = 1
+    except _RequestTimeout:
+        sys.stderr.write(
+            "Error: request has not finished in {0} seconds\n".format(
+                settings.pcs_daemon_request_timeout
+            )
+        )
+        code = 1
+    finally:
+        # atexit handlers do not run as workers leave via os._exit
+        if "--debug" in utils.pcs_options:
+            app.print_debug_counts()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    stdout_file.seek(0)
+    stderr_file.seek(0)
+    return {
+        "stdout": stdout_file.read().decode("utf-8", "replace"),
+        "stderr": stderr_file.read().decode("utf-8", "replace"),
+        "code": code,
+    }
@@ -15,6 +15,7 @@ from pcs.lib.cib.tools import (
     does_id_exist,
     find_unique_id,
     get_acls,
+    register_ids,
 )
 
 
@@ -114,7 +115,7 @@ def create_role(tree, role_id, description=None):
     role = etree.SubElement(get_acls(tree), "acl_role", id=role_id)
     if description:
         role.set("description", description)
-    return role
+    return register_ids(role)
 
 
 def remove_role(tree, role_id, autodelete_users_groups=False):
@@ -236,7 +237,9 @@ def create_group(tree, group_id):
     group_id -- id of new group
     """
     check_new_id_applicable(tree, "ACL group", group_id)
-    return etree.SubElement(get_acls(tree), "acl_group", id=group_id)
+    return register_ids(
+        etree.SubElement(get_acls(tree), "acl_group", id=group_id)
+    )
 
 
 def remove_target(tree, target_id):
@@ -292,6 +295,7 @@ def add_permissions_to_role(role_el, permission_info_list):
         )
         perm.set("kind", permission)
         perm.set(area_type_attribute_map[scope_type], scope)
+        register_ids(perm)
 
 
 def remove_permission(tree, permission_id):
@@ -17,6 +17,7 @@ from pcs.lib.cib.tools import (
     get_sub_element,
     find_unique_id,
     get_alerts,
+    register_ids,
     validate_id_does_not_exist,
 )
 
@@ -124,7 +125,7 @@ def create_alert(tree, alert_id, path, description=""):
     if description:
         alert.set("description", description)
 
-    return alert
+    return register_ids(alert)
 
 
 def update_alert(tree, alert_id, path, description=None):
@@ -195,7 +196,7 @@ def add_recipient(
     if description:
         recipient.set("description", description)
 
-    return recipient
+    return register_ids(recipient)
 
 
 def update_recipient(
@@ -12,7 +12,12 @@ from pcs.common import report_codes
 from pcs.lib import reports
 from pcs.lib.cib import resource
 from pcs.lib.cib.constraint import resource_set
-from pcs.lib.cib.tools import export_attributes, find_unique_id, find_parent
+from pcs.lib.cib.tools import (
+    export_attributes,
+    find_parent,
+    find_unique_id,
+    register_ids,
+)
 from pcs.lib.errors import LibraryError, ReportItemSeverity
 
 
@@ -139,4 +144,4 @@ def create_with_set(constraint_section, tag_name, options, resource_set_list):
     element.attrib.update(options)
     for resource_set_item in resource_set_list:
         resource_set.create(element, resource_set_item)
-    return element
+    return register_ids(element)
@@ -11,6 +11,7 @@ from pcs.lib import reports
 from pcs.lib.cib.tools import (
     find_unique_id,
     export_attributes,
+    register_ids,
 )
 from pcs.lib.errors import LibraryError
 
@@ -59,7 +60,7 @@ def create(parent, resource_set):
     for id in resource_set["ids"]:
         etree.SubElement(element, "resource_ref").attrib["id"] = id
 
-    return element
+    return register_ids(element)
 
 def get_resource_id_set_list(element):
     return [
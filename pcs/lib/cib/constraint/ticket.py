@@ -102,7 +102,7 @@ def prepare_options_plain(cib, options, ticket, resource_id):
 def create_plain(constraint_section, options):
     element = etree.SubElement(constraint_section, TAG_NAME)
     element.attrib.update(options)
-    return element
+    return tools.register_ids(element)
 
 def remove_plain(constraint_section, ticket_key, resource_id):
     ticket_element_list = constraint_section.xpath(
@@ -15,7 +15,7 @@ from pcs.common.fencing_topology import (
 )
 from pcs.lib import reports
 from pcs.lib.cib.stonith import is_stonith_resource
-from pcs.lib.cib.tools import find_unique_id
+from pcs.lib.cib.tools import find_unique_id, register_ids
 from pcs.lib.errors import ReportItemSeverity
 from pcs.lib.pacemaker.values import sanitize_id, validate_id
 
@@ -289,7 +289,7 @@ def _append_level_element(tree, level, target_type, target_value, devices):
         "id",
         find_unique_id(tree, sanitize_id("fl-{0}-{1}".format(id_part, level)))
     )
-    return level_el
+    return register_ids(level_el)
 
 def _find_level_elements(
     tree, level=None, target_type=None, target_value=None, devices=None
@@ -9,7 +9,7 @@ from lxml import etree
 
 from pcs.lib import reports
 from pcs.lib.cib.nvpair import update_nvset
-from pcs.lib.cib.tools import get_nodes, find_unique_id
+from pcs.lib.cib.tools import get_nodes, find_unique_id, register_ids
 from pcs.lib.errors import LibraryError
 
 
@@ -32,11 +32,11 @@ def update_node_instance_attrs(cib, node_name, attrs, state_nodes=None):
     # first one found. So we just mimic this behavior here.
     attrs_el = node_el.find("./instance_attributes")
     if attrs_el is None:
-        attrs_el = etree.SubElement(
+        attrs_el = register_ids(etree.SubElement(
             node_el,
             "instance_attributes",
             id=find_unique_id(cib, "nodes-{0}".format(node_el.get("id")))
-        )
+        ))
     update_nvset(attrs_el, attrs)
 
 def _ensure_node_exists(tree, node_name, state_nodes=None):
@@ -87,5 +87,5 @@ def _create_node(tree, node_id, uname, node_type=None):
     node = etree.SubElement(tree, "node", id=node_id, uname=uname)
     if node_type:
         node.set("type", node_type)
-    return node
+    return register_ids(node)
 
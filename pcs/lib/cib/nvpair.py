@@ -10,6 +10,7 @@ from lxml import etree
 from pcs.lib.cib.tools import (
     get_sub_element,
     create_subelement_id,
+    register_ids,
 )
 
 
@@ -25,13 +26,13 @@ def set_nvpair_in_nvset(nvset_element, name, value):
     nvpair = nvset_element.find("./nvpair[@name='{0}']".format(name))
     if nvpair is None:
         if value:
-            etree.SubElement(
+            register_ids(etree.SubElement(
                 nvset_element,
                 "nvpair",
                 id=create_subelement_id(nvset_element, name),
                 name=name,
                 value=value
-            )
+            ))
     else:
         if value:
             nvpair.set("value", value)
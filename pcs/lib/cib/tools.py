@@ -13,23 +13,171 @@ from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import validate_id
 
 
+class IdIndex(object):
+    """
+    Index of ids of elements in an xml document
+
+    The index is built once per document, ids are then found by a dict lookup.
+    Elements added to the document afterwards are indexed by calling
+    add_element. Elements removed from the document or whose id has been
+    changed are detected when they are looked up.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._id_map = {}
+        self._build_index()
+
+    def exists(self, check_id):
+        element_list = self._id_map.get(check_id)
+        if not element_list:
+            return False
+        element_list[:] = [
+            element for element in element_list
+            if self._is_indexed(element, check_id)
+        ]
+        if not element_list:
+            del self._id_map[check_id]
+            return False
+        return True
+
+    def find_unique_id(self, check_id):
+        counter = 1
+        temp_id = check_id
+        while self.exists(temp_id):
+            temp_id = "{0}-{1}".format(check_id, counter)
+            counter += 1
+        return temp_id
+
+    def add_element(self, element):
+        """
+        Index ids of an element added to the document and of its descendants
+        """
+        if not self._is_in_indexed_part(element):
+            return
+        for id_element in self._iter_id_elements(element):
+            element_list = self._id_map.setdefault(
+                self._get_id(id_element), []
+            )
+            if id_element not in element_list:
+                element_list.append(id_element)
+
+    def _build_index(self):
+        self._id_map = {}
+        for section in self._iter_sections():
+            for element in self._iter_id_elements(section):
+                self._id_map.setdefault(self._get_id(element), []).append(
+                    element
+                )
+
+    def _iter_sections(self):
+        # do not index /cib/status, it may contain references to previously
+        # existing and deleted resources and thus preventing creating them
+        # again
+        if self.root.tag != "cib":
+            return [self.root]
+        return [
+            section for section in self.root.iterchildren(etree.Element)
+            if section.tag != "status"
+        ]
+
+    def _iter_id_elements(self, element):
+        for id_element in element.iter(etree.Element):
+            if (
+                id_element.tag not in _ID_INDEX_IGNORED_TAGS
+                and
+                id_element.get("id") is not None
+            ):
+                yield id_element
+
+    def _get_id(self, element):
+        return element.get("id")
+
+    def _is_indexed(self, element, check_id):
+        return (
+            element.get("id") == check_id
+            and
+            element.tag not in _ID_INDEX_IGNORED_TAGS
+            and
+            self._is_in_indexed_part(element)
+        )
+
+    def _is_in_indexed_part(self, element):
+        path = [element]
+        parent = element.getparent()
+        while parent is not None:
+            path.append(parent)
+            parent = parent.getparent()
+        if path[-1] is not self.root or len(path) < 2:
+            return False
+        if self.root.tag == "cib":
+            return len(path) > 2 and path[-2].tag != "status"
+        return True
+
+_ID_INDEX_IGNORED_TAGS = frozenset(["acl_target", "role"])
+
+# indexes of documents being edited, keyed by their root elements, an index
+# is built when it is first needed
+_registered_id_indexes = {}
+
+def _get_root(tree):
+    # ElementTree has getroot, Elemet has getroottree
+    return (
+        tree.getroot() if hasattr(tree, "getroot")
+        else tree.getroottree().getroot()
+    )
+
+def register_id_index(tree):
+    """
+    Keep an index of ids of the document until unregister_id_index is called
+
+    Elements added to the document meanwhile must be put to the index by
+    register_ids.
+
+    tree -- any etree element or ElementTree of the document
+    """
+    _registered_id_indexes[_get_root(tree)] = None
+
+def unregister_id_index(tree):
+    """
+    Stop keeping an index of ids of the document
+
+    tree -- any etree element or ElementTree of the document
+    """
+    _registered_id_indexes.pop(_get_root(tree), None)
+
+def register_ids(element):
+    """
+    Put ids of an element added to a document and of its descendants to the
+    index of the document if the index is kept, return the element
+
+    element -- etree element added to the document
+    """
+    index = _registered_id_indexes.get(_get_root(element))
+    if index is not None:
+        index.add_element(element)
+    return element
+
+def get_id_index(tree):
+    """
+    Return an up-to-date index of ids of the document the tree belongs to
+
+    tree -- any etree element or ElementTree of the document
+    """
+    root = _get_root(tree)
+    index = _registered_id_indexes.get(root)
+    if index is None:
+        index = IdIndex(root)
+        if root in _registered_id_indexes:
+            _registered_id_indexes[root] = index
+    return index
+
 def does_id_exist(tree, check_id):
     """
     Checks to see if id exists in the xml dom passed
     tree cib etree node
     check_id id to check
     """
-    # ElementTree has getroot, Elemet has getroottree
-    root = tree.getroot() if hasattr(tree, "getroot") else tree.getroottree()
-    # do not search in /cib/status, it may contain references to previously
-    # existing and deleted resources and thus preventing creating them again
-    existing = root.xpath(
-        (
-            '(/cib/*[name()!="status"]|/*[name()!="cib"])' +
-            '//*[name()!="acl_target" and name()!="role" and @id="{0}"]'
-        ).format(check_id)
-    )
-    return len(existing) > 0
+    return get_id_index(tree).exists(check_id)
 
 def validate_id_does_not_exist(tree, id):
     """
@@ -45,12 +193,7 @@ def find_unique_id(tree, check_id):
     tree cib etree node
     check_id id to check
     """
-    counter = 1
-    temp_id = check_id
-    while does_id_exist(tree, temp_id):
-        temp_id = "{0}-{1}".format(check_id, counter)
-        counter += 1
-    return temp_id
+    return get_id_index(tree).find_unique_id(check_id)
 
 def create_subelement_id(context_element, suffix):
     return find_unique_id(
@@ -152,6 +295,7 @@ def get_sub_element(element, sub_element_tag, new_id=None, new_index=None):
             element.append(sub_element)
         else:
             element.insert(new_index, sub_element)
+        register_ids(sub_element)
     return sub_element
 
 def get_pacemaker_version_by_which_cib_was_validated(cib):
@@ -24,7 +24,7 @@ def create_role(lib_env, role_id, permission_info_list, description):
         (<read|write|deny>, <xpath|id>, <any string>)
     description -- text description for role
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
 
     if permission_info_list:
         acl.validate_permissions(cib, permission_info_list)
@@ -45,7 +45,7 @@ def remove_role(lib_env, role_id, autodelete_users_groups=False):
     autodelete_users_groups -- if True targets and groups which are empty after
         removal will be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     try:
         acl.remove_role(cib, role_id, autodelete_users_groups)
     except acl.AclRoleNotFound as e:
@@ -64,7 +64,7 @@ def assign_role_not_specific(lib_env, role_id, target_or_group_id):
     role_id -- id of role which should be assigne to target/group
     target_or_group_id -- id of target/group element
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     try:
         acl.assign_role(
             _get_target_or_group(cib, target_or_group_id),
@@ -105,7 +105,7 @@ def assign_role_to_target(lib_env, role_id, target_id):
     role_id -- id of acl_role element which should be assigned to target
     target_id -- id of acl_target element to which role should be assigned
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     try:
         acl.assign_role(
             acl.find_target(cib, target_id), acl.find_role(cib, role_id)
@@ -124,7 +124,7 @@ def assign_role_to_group(lib_env, role_id, group_id):
     role_id -- id of acl_role element which should be assigned to group
     group_id -- id of acl_group element to which role should be assigned
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     try:
         acl.assign_role(
             acl.find_group(cib, group_id), acl.find_role(cib, role_id)
@@ -149,7 +149,7 @@ def unassign_role_not_specific(
     autodelete_target_group -- if True remove target/group element if has no
         more role assigned
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     acl.unassign_role(
         _get_target_or_group(cib, target_or_group_id),
         role_id,
@@ -171,7 +171,7 @@ def unassign_role_from_target(
     autodelete_target -- if True remove target element if has no more role
         assigned
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     try:
         acl.unassign_role(
             acl.find_target(cib, target_id),
@@ -196,7 +196,7 @@ def unassign_role_from_group(
     autodelete_target -- if True remove group element if has no more role
         assigned
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     try:
         acl.unassign_role(
             acl.find_group(cib, group_id),
@@ -236,7 +236,7 @@ def create_target(lib_env, target_id, role_list):
     target_id -- id of new target
     role_list -- list of roles to assign to new target
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     _assign_roles_to_element(cib, acl.create_target(cib, target_id), role_list)
     lib_env.push_cib(cib)
 
@@ -250,7 +250,7 @@ def create_group(lib_env, group_id, role_list):
     group_id -- id of new group
     role_list -- list of roles to assign to new group
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     _assign_roles_to_element(cib, acl.create_group(cib, group_id), role_list)
     lib_env.push_cib(cib)
 
@@ -263,7 +263,7 @@ def remove_target(lib_env, target_id):
     lib_env -- LibraryEnvironment
     target_id -- id of taget which should be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     acl.remove_target(cib, target_id)
     lib_env.push_cib(cib)
 
@@ -276,7 +276,7 @@ def remove_group(lib_env, group_id):
     lib_env -- LibraryEnvironment
     group_id -- id of group which should be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     acl.remove_group(cib, group_id)
     lib_env.push_cib(cib)
 
@@ -292,7 +292,7 @@ def add_permission(lib_env, role_id, permission_info_list):
     permission_info_list -- list of permissons, items of list should be tuples:
         (<read|write|deny>, <xpath|id>, <any string>)
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     acl.validate_permissions(cib, permission_info_list)
     acl.add_permissions_to_role(
         acl.provide_role(cib, role_id), permission_info_list
@@ -308,7 +308,7 @@ def remove_permission(lib_env, permission_id):
     lib_env -- LibraryEnvironment
     permission_id -- id of permission element which should be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     acl.remove_permission(cib, permission_id)
     lib_env.push_cib(cib)
 
@@ -324,7 +324,7 @@ def get_config(lib_env):
 
     lib_env -- LibraryEnvironment
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     return {
         "target_list": acl.get_target_list(cib),
         "group_list": acl.get_group_list(cib),
@@ -35,7 +35,7 @@ def create_alert(
     if not path:
         raise LibraryError(reports.required_option_is_missing(["path"]))
 
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
 
     alert_el = alert.create_alert(cib, alert_id, path, description)
     alert.update_instance_attributes(alert_el, instance_attribute_dict)
@@ -63,7 +63,7 @@ def update_alert(
     description -- new description, if empty string, old description will be
         deleted, if None old value will stay unchanged
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
 
     alert_el = alert.update_alert(cib, alert_id, path, description)
     alert.update_instance_attributes(alert_el, instance_attribute_dict)
@@ -79,7 +79,7 @@ def remove_alert(lib_env, alert_id_list):
     lib_env -- LibraryEnvironment
     alert_id_list -- list of alerts ids which should be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     report_list = []
     for alert_id in alert_id_list:
         try:
@@ -117,7 +117,7 @@ def add_recipient(
             reports.required_option_is_missing(["value"])
         )
 
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     recipient = alert.add_recipient(
         lib_env.report_processor,
         cib,
@@ -159,7 +159,7 @@ def update_recipient(
         raise LibraryError(
             reports.cib_alert_recipient_invalid_value(recipient_value)
         )
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     recipient = alert.update_recipient(
         lib_env.report_processor,
         cib,
@@ -181,7 +181,7 @@ def remove_recipient(lib_env, recipient_id_list):
     lib_env -- LibraryEnvironment
     recipient_id_list -- list of recipients ids to be removed
     """
-    cib = lib_env.get_cib(REQUIRED_CIB_VERSION)
+    cib = lib_env.get_cib(REQUIRED_CIB_VERSION, with_status=False)
     report_list = []
     for recipient_id in recipient_id_list:
         try:
@@ -199,4 +199,4 @@ def get_all_alerts(lib_env):
 
     lib_env -- LibraryEnvironment
     """
-    return alert.get_all_alerts(lib_env.get_cib())
+    return alert.get_all_alerts(lib_env.get_cib(with_status=False))
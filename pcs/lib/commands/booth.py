@@ -57,7 +57,7 @@ def config_destroy(env, ignore_config_load_problems=False):
     report_list = []
 
     if(env.is_node_in_cluster() and resource.find_for_config(
-        get_resources(env.get_cib()),
+        get_resources(env.get_cib(with_status=False)),
         get_config_file_name(name),
     )):
         report_list.append(config_is_used("in cluster resource"))
@@ -148,7 +148,7 @@ def config_ticket_remove(env, ticket_name):
 def create_in_cluster(env, name, ip, resource_create, resource_remove):
     #TODO resource_create is provisional hack until resources are not moved to
     #lib
-    resources_section = get_resources(env.get_cib())
+    resources_section = get_resources(env.get_cib(with_status=False))
 
     booth_config_file_path = get_config_file_name(name)
     if resource.find_for_config(resources_section, booth_config_file_path):
@@ -182,7 +182,7 @@ def restart(env, name, resource_restart, allow_multiple):
 def ticket_operation(operation, env, name, ticket, site_ip):
     if not site_ip:
         site_ip_list = resource.find_bound_ip(
-            get_resources(env.get_cib()),
+            get_resources(env.get_cib(with_status=False)),
             get_config_file_name(name)
         )
         if len(site_ip_list) != 1:
@@ -363,7 +363,7 @@ def get_status(env, name=None):
 
 def _find_resource_elements_for_operation(env, name, allow_multiple):
     booth_element_list = resource.find_for_config(
-        get_resources(env.get_cib()),
+        get_resources(env.get_cib(with_status=False)),
         get_config_file_name(name),
     )
 
@@ -43,7 +43,7 @@ def create(
     callable duplicate_check takes two elements and decide if they are
         duplicates
     """
-    cib = env.get_cib()
+    cib = env.get_cib(with_status=False)
 
     options = ticket.prepare_options_plain(
         cib,
@@ -75,7 +75,7 @@ def remove(env, ticket_key, resource_id):
     If resource is in resource set with another resources then only resource ref
     is removed. If resource is alone in resource set whole constraint is removed.
     """
-    cib = env.get_cib()
+    cib = env.get_cib(with_status=False)
     constraint_section = get_constraints(cib)
     any_plain_removed = ticket.remove_plain(
         constraint_section,
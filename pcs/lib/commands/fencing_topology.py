@@ -38,7 +38,7 @@ def add_level(
     elif target_type == TARGET_TYPE_ATTRIBUTE:
         version_check = (2, 4, 0)
 
-    cib = lib_env.get_cib(version_check)
+    cib = lib_env.get_cib(version_check, with_status=False)
     cib_fencing_topology.add_level(
         lib_env.report_processor,
         get_fencing_topology(cib),
@@ -65,7 +65,7 @@ def get_config(lib_env):
 
     LibraryError lib_env -- environment
     """
-    cib = lib_env.get_cib()
+    cib = lib_env.get_cib(with_status=False)
     return cib_fencing_topology.export(get_fencing_topology(cib))
 
 def remove_all_levels(lib_env):
@@ -73,7 +73,7 @@ def remove_all_levels(lib_env):
     Remove all fencing levels
     LibraryError lib_env -- environment
     """
-    cib = lib_env.get_cib()
+    cib = lib_env.get_cib(with_status=False)
     cib_fencing_topology.remove_all_levels(get_fencing_topology(cib))
     lib_env.push_cib(cib)
 
@@ -91,7 +91,7 @@ def remove_levels_by_params(
     Iterable devices -- list of stonith devices for the new fencing level
     bool ignore_if_missing -- when True, do not report if level not found
     """
-    cib = lib_env.get_cib()
+    cib = lib_env.get_cib(with_status=False)
     cib_fencing_topology.remove_levels_by_params(
         lib_env.report_processor,
         get_fencing_topology(cib),
@@ -110,7 +110,7 @@ def verify(lib_env):
 
     LibraryError lib_env -- environment
     """
-    cib = lib_env.get_cib()
+    cib = lib_env.get_cib(with_status=False)
     cib_fencing_topology.verify(
         lib_env.report_processor,
         get_fencing_topology(cib),
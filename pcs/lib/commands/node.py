@@ -21,7 +21,7 @@ from pcs.lib.pacemaker.state import ClusterState
 def cib_runner_nodes(lib_env, wait):
     lib_env.ensure_wait_satisfiable(wait)
     runner = lib_env.cmd_runner()
-    cib = lib_env.get_cib()
+    cib = lib_env.get_cib(with_status=False)
 
     state_nodes = ClusterState(
         get_cluster_status_xml(runner)
@@ -149,7 +149,7 @@ def _set_instance_attrs_local_node(lib_env, attrs, wait):
 
 def _set_instance_attrs_node_list(lib_env, attrs, node_names, wait):
     with cib_runner_nodes(lib_env, wait) as (cib, dummy_runner, state_nodes):
-        known_nodes = [node.attrs.name for node in state_nodes]
+        known_nodes = set([node.attrs.name for node in state_nodes])
         report = []
         for node in node_names:
             if node not in known_nodes:
@@ -5,6 +5,8 @@ from __future__ import (
     unicode_literals,
 )
 
+from pcs import settings
+from pcs.common.tools import iterate_parallel
 from pcs.lib import resource_agent
 
 
@@ -36,8 +38,10 @@ def list_agents_for_standard_and_provider(lib_env, standard_provider=None):
             lib_env.cmd_runner()
         )
     agents = []
-    for std in standards:
-        agents += resource_agent.list_resource_agents(lib_env.cmd_runner(), std)
+    for agent_list in _list_agents_of_standards(
+        lib_env.cmd_runner(), standards
+    ):
+        agents += agent_list
     return sorted(
         agents,
         # works with both str and unicode in both python 2 and 3
@@ -49,6 +53,9 @@ def list_agents(lib_env, describe=True, search=None):
     """
     List all resource agents on the local host, optionally filtered and
         described
+    Return an iterator of agents' info sorted by their names. Each one is
+    yielded as soon as its description is ready, errors are raised during the
+    iteration.
     bool describe load and return agents' description as well
     string search return only agents which name contains this string
     """
@@ -56,13 +63,13 @@ def list_agents(lib_env, describe=True, search=None):
 
     # list agents for all standards and providers
     agent_names = []
-    for std in resource_agent.list_resource_agents_standards_and_providers(
+    standards = resource_agent.list_resource_agents_standards_and_providers(
         runner
+    )
+    for std, agent_list in zip(
+        standards, _list_agents_of_standards(runner, standards)
     ):
-        agent_names += [
-            "{0}:{1}".format(std, agent)
-            for agent in resource_agent.list_resource_agents(runner, std)
-        ]
+        agent_names += ["{0}:{1}".format(std, agent) for agent in agent_list]
     agent_names.sort(
         # works with both str and unicode in both python 2 and 3
         key=lambda x: x.lower()
@@ -76,6 +83,17 @@ def list_agents(lib_env, describe=True, search=None):
     )
 
 
+def _list_agents_of_standards(runner, standards):
+    """
+    Return a list of agents' names for each standard, standards run in parallel
+    """
+    return list(iterate_parallel(
+        resource_agent.list_resource_agents,
+        [((runner, std), {}) for std in standards],
+        settings.agent_metadata_workers
+    ))
+
+
 def _complete_agent_list(
     runner, agent_names, describe, search, metadata_class
 ):
@@ -87,19 +105,28 @@ def _complete_agent_list(
         ]
 
     # complete the output and load descriptions if requested
-    agent_list = []
-    for name in agent_names:
+    def get_info(name):
         try:
             agent_metadata = metadata_class(runner, name)
             if describe:
-                agent_list.append(agent_metadata.get_description_info())
-            else:
-                agent_list.append(agent_metadata.get_name_info())
+                return agent_metadata.get_description_info()
+            return agent_metadata.get_name_info()
         except resource_agent.UnableToGetAgentMetadata:
             # if we cannot get valid metadata, it's not a resource agent and
             # we don't return it in the list
-            pass
-    return agent_list
+            return None
+
+    if describe:
+        # each agent runs a process to get its metadata, run them at once
+        info_list = iterate_parallel(
+            get_info,
+            [((name,), {}) for name in agent_names],
+            settings.agent_metadata_workers
+        )
+    else:
+        info_list = (get_info(name) for name in agent_names)
+    # the info is yielded in the order of agent_names as soon as it is ready
+    return (agent_info for agent_info in info_list if agent_info is not None)
 
 
 def describe_agent(lib_env, agent_name):
@@ -9,10 +9,7 @@ import os
 import json
 
 from pcs import settings
-from pcs.common import (
-    tools,
-    report_codes,
-)
+from pcs.common import report_codes
 from pcs.lib import (
     sbd,
     reports,
@@ -28,6 +25,7 @@ from pcs.lib.external import (
     NodeCommunicationException,
     NodeConnectionException,
     NodeCommandUnsuccessfulException,
+    run_node_tasks,
 )
 from pcs.lib.node import (
     NodeAddressesList,
@@ -235,27 +233,39 @@ def _get_online_nodes(lib_env, node_list, ignore_offline_nodes=False):
     ignore_offline_nodes -- if True offline nodes are just omitted from
         returned list.
     """
-    to_raise = []
-    online_node_list = NodeAddressesList()
-
     def is_node_online(node):
+        # return (report items, the node if it is online)
         try:
             nodes_task.node_check_auth(lib_env.node_communicator(), node)
-            online_node_list.append(node)
+            return [], node
         except NodeConnectionException as e:
             if ignore_offline_nodes:
-                to_raise.append(reports.omitting_node(node.label))
-            else:
-                to_raise.append(node_communicator_exception_to_report_item(
+                return [reports.omitting_node(node.label)], None
+            return (
+                [node_communicator_exception_to_report_item(
                     e, Severities.ERROR, report_codes.SKIP_OFFLINE_NODES
-                ))
+                )],
+                None
+            )
         except NodeCommunicationException as e:
-            to_raise.append(node_communicator_exception_to_report_item(e))
+            return [node_communicator_exception_to_report_item(e)], None
 
-    tools.run_parallel(is_node_online, [([node], {}) for node in node_list])
+    if ignore_offline_nodes:
+        timeout_severity, timeout_forceable = Severities.WARNING, None
+    else:
+        timeout_severity = Severities.ERROR
+        timeout_forceable = report_codes.SKIP_OFFLINE_NODES
+    to_raise, online_list = run_node_tasks(
+        is_node_online,
+        [([node], {}) for node in node_list],
+        timeout_severity,
+        timeout_forceable
+    )
 
     lib_env.report_processor.process_list(to_raise)
-    return online_node_list
+    return NodeAddressesList(
+        [node for node in online_list if node is not None]
+    )
 
 
 def get_cluster_sbd_status(lib_env):
@@ -273,47 +283,55 @@ def get_cluster_sbd_status(lib_env):
     lib_env -- LibraryEnvironment
     """
     node_list = _get_cluster_nodes(lib_env)
-    report_item_list = []
-    successful_node_list = []
-    status_list = []
 
     def get_sbd_status(node):
+        # return (report items, status of sbd on the node or None)
         try:
-            status_list.append({
-                "node": node,
-                "status": json.loads(
+            return (
+                [],
+                json.loads(
                     sbd.check_sbd(lib_env.node_communicator(), node, "")
                 )["sbd"]
-            })
-            successful_node_list.append(node)
+            )
         except NodeCommunicationException as e:
-            report_item_list.append(node_communicator_exception_to_report_item(
-                e,
-                severity=Severities.WARNING
-            ))
-            report_item_list.append(reports.unable_to_get_sbd_status(
-                node.label,
-                "", #reason is in previous report item
-                #warning is there implicit
-            ))
+            return (
+                [
+                    node_communicator_exception_to_report_item(
+                        e,
+                        severity=Severities.WARNING
+                    ),
+                    reports.unable_to_get_sbd_status(
+                        node.label,
+                        "", #reason is in previous report item
+                        #warning is there implicit
+                    ),
+                ],
+                None
+            )
         except (ValueError, KeyError) as e:
-            report_item_list.append(reports.unable_to_get_sbd_status(
-                node.label, str(e)
-            ))
+            return (
+                [reports.unable_to_get_sbd_status(node.label, str(e))],
+                None
+            )
 
-    tools.run_parallel(get_sbd_status, [([node], {}) for node in node_list])
+    report_item_list, node_status_list = run_node_tasks(
+        get_sbd_status, [([node], {}) for node in node_list], Severities.WARNING
+    )
     lib_env.report_processor.process_list(report_item_list)
 
-    for node in node_list:
-        if node not in successful_node_list:
-            status_list.append({
-                "node": node,
-                "status": {
-                    "installed": None,
-                    "enabled": None,
-                    "running": None
-                }
-            })
+    unknown_status = {
+        "installed": None,
+        "enabled": None,
+        "running": None
+    }
+    status_list = [
+        {"node": node, "status": status}
+        for node, status in zip(node_list, node_status_list)
+        if status is not None
+    ]
+    for node, status in zip(node_list, node_status_list):
+        if status is None:
+            status_list.append({"node": node, "status": dict(unknown_status)})
     return status_list
 
 
@@ -334,48 +352,57 @@ def get_cluster_sbd_config(lib_env):
     lib_env -- LibraryEnvironment
     """
     node_list = _get_cluster_nodes(lib_env)
-    config_list = []
-    successful_node_list = []
-    report_item_list = []
 
     def get_sbd_config(node):
+        # return (report items, sbd config of the node or None)
         try:
-            config_list.append({
-                "node": node,
-                "config": environment_file_to_dict(
+            return (
+                [],
+                environment_file_to_dict(
                     sbd.get_sbd_config(lib_env.node_communicator(), node)
                 )
-            })
-            successful_node_list.append(node)
+            )
         except NodeCommandUnsuccessfulException as e:
-            report_item_list.append(reports.unable_to_get_sbd_config(
-                node.label,
-                e.reason,
-                Severities.WARNING
-            ))
+            return (
+                [reports.unable_to_get_sbd_config(
+                    node.label,
+                    e.reason,
+                    Severities.WARNING
+                )],
+                None
+            )
         except NodeCommunicationException as e:
-            report_item_list.append(node_communicator_exception_to_report_item(
-                e,
-                severity=Severities.WARNING
-            ))
-            report_item_list.append(reports.unable_to_get_sbd_config(
-                node.label,
-                "", #reason is in previous report item
-                Severities.WARNING
-            ))
+            return (
+                [
+                    node_communicator_exception_to_report_item(
+                        e,
+                        severity=Severities.WARNING
+                    ),
+                    reports.unable_to_get_sbd_config(
+                        node.label,
+                        "", #reason is in previous report item
+                        Severities.WARNING
+                    ),
+                ],
+                None
+            )
 
-    tools.run_parallel(get_sbd_config, [([node], {}) for node in node_list])
+    report_item_list, node_config_list = run_node_tasks(
+        get_sbd_config, [([node], {}) for node in node_list], Severities.WARNING
+    )
     lib_env.report_processor.process_list(report_item_list)
 
+    config_list = [
+        {"node": node, "config": config}
+        for node, config in zip(node_list, node_config_list)
+        if config is not None
+    ]
     if not len(config_list):
         return []
 
-    for node in node_list:
-        if node not in successful_node_list:
-            config_list.append({
-                "node": node,
-                "config": None
-            })
+    for node, config in zip(node_list, node_config_list):
+        if config is None:
+            config_list.append({"node": node, "config": None})
     return config_list
 
 
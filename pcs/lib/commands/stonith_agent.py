@@ -13,6 +13,9 @@ from pcs.lib.errors import LibraryError
 def list_agents(lib_env, describe=True, search=None):
     """
     List all stonith agents on the local host, optionally filtered and described
+    Return an iterator of agents' info sorted by their names. Each one is
+    yielded as soon as its description is ready, errors are raised during the
+    iteration.
     bool describe load and return agents' description as well
     string search return only agents which name contains this string
     """
@@ -36,7 +36,9 @@ class AclCommandsTest(TestCase, ExtendedAssertionsMixin):
         self.mock_env.get_cib.return_value = self.cib
 
     def assert_get_cib_called(self):
-        self.mock_env.get_cib.assert_called_once_with(REQUIRED_CIB_VERSION)
+        self.mock_env.get_cib.assert_called_once_with(
+            REQUIRED_CIB_VERSION, with_status=False
+        )
 
     def assert_same_cib_pushed(self):
         self.mock_env.push_cib.assert_called_once_with(self.cib)
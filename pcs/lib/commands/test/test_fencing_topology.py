@@ -87,7 +87,7 @@ class AddLevel(TestCase):
             "force device",
             "force node"
         )
-        mock_get_cib.assert_called_once_with(None)
+        mock_get_cib.assert_called_once_with(None, with_status=False)
         self.assert_mocks(
             mock_status_xml, mock_status, mock_get_topology, mock_get_resources,
             mock_push_cib
@@ -120,7 +120,7 @@ class AddLevel(TestCase):
             "force device",
             "force node"
         )
-        mock_get_cib.assert_called_once_with((2, 4, 0))
+        mock_get_cib.assert_called_once_with((2, 4, 0), with_status=False)
         self.assert_mocks(
             mock_status_xml, mock_status, mock_get_topology, mock_get_resources,
             mock_push_cib
@@ -153,7 +153,7 @@ class AddLevel(TestCase):
             "force device",
             "force node"
         )
-        mock_get_cib.assert_called_once_with((2, 3, 0))
+        mock_get_cib.assert_called_once_with((2, 3, 0), with_status=False)
         self.assert_mocks(
             mock_status_xml, mock_status, mock_get_topology, mock_get_resources,
             mock_push_cib
@@ -162,7 +162,7 @@ class AddLevel(TestCase):
 @patch_command("cib_fencing_topology.export")
 @patch_command("get_fencing_topology")
 @patch_env("push_cib")
-@patch_env("get_cib", lambda self: "mocked cib")
+@patch_env("get_cib", lambda self, with_status: "mocked cib")
 class GetConfig(TestCase):
     def test_success(self, mock_push_cib, mock_get_topology, mock_export):
         mock_get_topology.return_value = "topology el"
@@ -182,7 +182,7 @@ class GetConfig(TestCase):
 @patch_command("cib_fencing_topology.remove_all_levels")
 @patch_command("get_fencing_topology")
 @patch_env("push_cib")
-@patch_env("get_cib", lambda self: "mocked cib")
+@patch_env("get_cib", lambda self, with_status: "mocked cib")
 class RemoveAllLevels(TestCase):
     def test_success(self, mock_push_cib, mock_get_topology, mock_remove):
         mock_get_topology.return_value = "topology el"
@@ -198,7 +198,7 @@ class RemoveAllLevels(TestCase):
 @patch_command("cib_fencing_topology.remove_levels_by_params")
 @patch_command("get_fencing_topology")
 @patch_env("push_cib")
-@patch_env("get_cib", lambda self: "mocked cib")
+@patch_env("get_cib", lambda self, with_status: "mocked cib")
 class RemoveLevelsByParams(TestCase):
     def test_success(self, mock_push_cib, mock_get_topology, mock_remove):
         mock_get_topology.return_value = "topology el"
@@ -227,7 +227,7 @@ class RemoveLevelsByParams(TestCase):
 @patch_env("push_cib")
 @patch_command("ClusterState")
 @patch_command("get_cluster_status_xml")
-@patch_env("get_cib", lambda self: "mocked cib")
+@patch_env("get_cib", lambda self, with_status: "mocked cib")
 @patch_env("cmd_runner", lambda self: "mocked cmd_runner")
 class Verify(TestCase):
     def test_success(
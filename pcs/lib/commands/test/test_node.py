@@ -260,7 +260,7 @@ class CibRunnerNodes(TestCase):
     def setUp(self):
         self.env = create_env()
 
-    @patch_env("get_cib", lambda self: "mocked cib")
+    @patch_env("get_cib", lambda self, with_status: "mocked cib")
     @patch_env("cmd_runner", lambda self: "mocked cmd_runner")
     @patch_env("ensure_wait_satisfiable")
     @patch_command("ClusterState")
@@ -15,7 +15,7 @@ from pcs.test.tools.pcs_unittest import mock, TestCase
 from pcs.common import report_codes
 from pcs.lib import resource_agent as lib_ra
 from pcs.lib.env import LibraryEnvironment
-from pcs.lib.errors import ReportItemSeverity as severity
+from pcs.lib.errors import LibraryError, ReportItemSeverity as severity
 
 from pcs.lib.commands import resource_agent as lib
 
@@ -172,7 +172,7 @@ class TestListAgents(TestCase):
 
     def test_list_all(self):
         self.assertEqual(
-            lib.list_agents(self.lib_env, False, None),
+            list(lib.list_agents(self.lib_env, False, None)),
             [
                 {
                     "name": "ocf:test:Delay",
@@ -208,7 +208,7 @@ class TestListAgents(TestCase):
 
     def test_search(self):
         self.assertEqual(
-            lib.list_agents(self.lib_env, False, "te"),
+            list(lib.list_agents(self.lib_env, False, "te")),
             [
                 {
                     "name": "ocf:test:Delay",
@@ -257,7 +257,7 @@ class TestListAgents(TestCase):
 
         # Stateful is missing as it does not provide valid metadata - see above
         self.assertEqual(
-            lib.list_agents(self.lib_env, True, None),
+            list(lib.list_agents(self.lib_env, True, None)),
             [
                 {
                     "name": "ocf:test:Delay",
@@ -284,6 +284,21 @@ class TestListAgents(TestCase):
         )
 
 
+    @mock.patch.object(lib_ra.Agent, "_get_metadata", autospec=True)
+    def test_describe_error_raised_while_iterating(self, mock_metadata):
+        def mock_metadata_func(self):
+            if self._full_agent_name == "service:corosync":
+                raise LibraryError()
+            return etree.XML("<resource-agent/>")
+        mock_metadata.side_effect = mock_metadata_func
+
+        agent_iterator = lib.list_agents(self.lib_env, True, None)
+        self.assertEqual("ocf:test:Delay", next(agent_iterator)["name"])
+        self.assertEqual("ocf:test:Stateful", next(agent_iterator)["name"])
+        self.assertRaises(LibraryError, lambda: next(agent_iterator))
+
+
+
 @mock.patch.object(lib_ra.ResourceAgent, "_load_metadata", autospec=True)
 @mock.patch("pcs.lib.resource_agent.guess_exactly_one_resource_agent_full_name")
 @mock.patch.object(
@@ -46,7 +46,7 @@ class TestListAgents(TestCase):
 
     def test_list_all(self):
         self.assertEqual(
-            lib.list_agents(self.lib_env, False, None),
+            list(lib.list_agents(self.lib_env, False, None)),
             [
                 {
                     "name": "fence_apc",
@@ -75,7 +75,7 @@ class TestListAgents(TestCase):
 
     def test_search(self):
         self.assertEqual(
-            lib.list_agents(self.lib_env, False, "M"),
+            list(lib.list_agents(self.lib_env, False, "M")),
             [
                 {
                     "name": "fence_dummy",
@@ -117,7 +117,7 @@ class TestListAgents(TestCase):
 
         # Stateful is missing as it does not provide valid metadata - see above
         self.assertEqual(
-            lib.list_agents(self.lib_env, True, None),
+            list(lib.list_agents(self.lib_env, True, None)),
             [
                 {
                     "name": "fence_apc",
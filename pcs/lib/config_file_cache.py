@@ -0,0 +1,64 @@
+"""
+Process-wide cache of parsed configuration files
+
+A command may need corosync.conf or cluster.conf many times. Parsed files are
+kept for as long as the files do not change (their inode, mtime and size stay
+the same) and every caller gets its own copy, so modifying it does not affect
+the cache nor the other callers.
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+
+from pcs.lib.tools import get_file_stat_key
+
+
+_config_file_cache = {"enabled": False}
+# (path, kind) -> (file stat key, parsed file)
+_cache = {}
+_lock = threading.Lock()
+
+def enable():
+    _config_file_cache["enabled"] = True
+
+def get(path, kind, load, copy):
+    """
+    Return a copy of a parsed file, parse the file only if it has changed
+
+    string path -- path to the file
+    string kind -- identifies the parser, a file parsed by different parsers
+        is cached for each of them
+    callable load -- read and parse the file, exceptions are not cached
+    callable copy -- return a deep copy of a parsed file
+    """
+    if not _config_file_cache["enabled"]:
+        return load()
+    # get the key before reading the file, so a file changed meanwhile is
+    # never cached with the key of its newer version
+    stat_key = get_file_stat_key(path)
+    if stat_key is None:
+        return load()
+    with _lock:
+        cached = _cache.get((path, kind))
+    if cached is not None and cached[0] == stat_key:
+        return copy(cached[1])
+    parsed = load()
+    with _lock:
+        _cache[(path, kind)] = (stat_key, copy(parsed))
+    return parsed
+
+def invalidate(path=None):
+    """
+    Forget parsed file, to be called after the file has been written
+
+    string path -- path to the file, forget all files if None
+    """
+    with _lock:
+        for cache_key in list(_cache.keys()):
+            if path is None or cache_key[0] == path:
+                del _cache[cache_key]
@@ -0,0 +1,309 @@
+"""
+Pool of keep-alive HTTPS connections to nodes
+
+Both the library and the old cli send requests to pcsd on nodes through
+urllib openers built by build_opener. Connections are kept open after
+a request and reused by following requests to the same host, TLS sessions are
+resumed when a new connection has to be opened. There is one pool per process
+shared by all threads.
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import select
+import socket
+import ssl
+import threading
+from io import BytesIO
+try:
+    # python3
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    # python2
+    from inspect import getargspec
+try:
+    # python2
+    from httplib import BadStatusLine, HTTPException, HTTPSConnection
+except ImportError:
+    # python3
+    from http.client import BadStatusLine, HTTPException, HTTPSConnection
+try:
+    # python2
+    from urllib import addinfourl
+    from urllib2 import (
+        build_opener as urllib_build_opener,
+        HTTPCookieProcessor as urllib_HTTPCookieProcessor,
+        HTTPSHandler as urllib_HTTPSHandler,
+        URLError as urllib_URLError
+    )
+except ImportError:
+    # python3
+    from urllib.response import addinfourl
+    from urllib.request import (
+        build_opener as urllib_build_opener,
+        HTTPCookieProcessor as urllib_HTTPCookieProcessor,
+        HTTPSHandler as urllib_HTTPSHandler
+    )
+    from urllib.error import URLError as urllib_URLError
+
+
+# python 3.6+ is able to resume TLS sessions
+_TLS_SESSION_SUPPORTED = hasattr(ssl.SSLSocket, "session")
+# idle connections kept open for each host
+MAX_IDLE_CONNECTIONS_PER_HOST = 4
+
+
+def build_opener():
+    """
+    Return an urllib opener sending requests through the process's pool
+    """
+    return urllib_build_opener(
+        _PooledHTTPSHandler(get_pool()),
+        urllib_HTTPCookieProcessor()
+    )
+
+def get_pool():
+    """
+    Return the connection pool of the current process
+    """
+    # a forked child must not share connections with its parent
+    if _pool["pool"] is None or _pool["pid"] != os.getpid():
+        _pool["pool"] = ConnectionPool()
+        _pool["pid"] = os.getpid()
+    return _pool["pool"]
+
+_pool = {"pool": None, "pid": None}
+
+
+def create_ssl_context():
+    """
+    Return an SSL context for connecting to pcsd, None if not supported
+    """
+    # enable self-signed certificates
+    # https://www.python.org/dev/peps/pep-0476/
+    # http://bugs.python.org/issue21308
+    if (
+        hasattr(ssl, "_create_unverified_context")
+        and
+        "context" in getargspec(urllib_HTTPSHandler.__init__).args
+    ):
+        return ssl._create_unverified_context()
+    return None
+
+
+class ConnectionPool(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._context = create_ssl_context()
+        self._idle_connections = {}
+        self._tls_sessions = {}
+        self.opened_count = 0
+        self.reused_count = 0
+
+    def request(self, host, method, selector, data, headers):
+        """
+        Send a request, return a response with its body already read
+
+        string host -- host[:port] to connect to
+        """
+        connection, reused = self._acquire(host)
+        try:
+            try:
+                response = self._send(
+                    connection, method, selector, data, headers
+                )
+            except (socket.error, HTTPException) as e:
+                # Resend the request only if the host closed the idle
+                # connection in the meantime. Otherwise the host may have
+                # already run the request and it must not be run twice.
+                if not reused or not is_idle_connection_closed(e):
+                    raise
+                connection.close()
+                connection, reused = self._acquire(host, new=True)
+                response = self._send(
+                    connection, method, selector, data, headers
+                )
+            self._read_body(connection, response)
+        except:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(host, connection)
+        return response
+
+    def close(self):
+        with self._lock:
+            for connection_list in self._idle_connections.values():
+                for connection in connection_list:
+                    connection.close()
+            self._idle_connections = {}
+
+    def _send(self, connection, method, selector, data, headers):
+        connection.request(method, selector, data, headers)
+        return connection.getresponse()
+
+    def _read_body(self, connection, response):
+        # read the whole body so the connection can be used again
+        response.body = response.read()
+        # TLS 1.3 provides the session after the handshake
+        session = getattr(connection.sock, "session", None)
+        if session is not None:
+            self._set_tls_session(connection.pool_host, session)
+
+    def _acquire(self, host, new=False):
+        with self._lock:
+            idle_list = self._idle_connections.get(host)
+            while idle_list and not new:
+                connection = idle_list.pop()
+                # a request sent over a connection the host has closed would
+                # fail and it could not be told whether the host has run it
+                if is_connection_dropped(connection):
+                    connection.close()
+                    continue
+                self.reused_count += 1
+                return connection, True
+            self.opened_count += 1
+        return _PooledHTTPSConnection(self, host), False
+
+    def _release(self, host, connection):
+        with self._lock:
+            idle_list = self._idle_connections.setdefault(host, [])
+            if len(idle_list) < MAX_IDLE_CONNECTIONS_PER_HOST:
+                idle_list.append(connection)
+                return
+        connection.close()
+
+    def _get_tls_session(self, host):
+        with self._lock:
+            return self._tls_sessions.get(host)
+
+    def _set_tls_session(self, host, session):
+        with self._lock:
+            self._tls_sessions[host] = session
+
+
+class ConnectError(socket.error):
+    """
+    Unable to connect to a host: DNS, TCP connection or TLS handshake failure
+
+    Errors raised once the connection has been established (e.g. reading
+    a response timed out) are not wrapped by this, the host is reachable.
+    """
+    def __init__(self, error):
+        super(ConnectError, self).__init__(*error.args)
+        self.error = error
+
+    def __str__(self):
+        return str(self.error)
+
+
+def is_connection_dropped(connection):
+    """
+    Tell if an idle connection has been closed by the host
+
+    An idle connection is readable only if the host has closed it (or sent
+    something unexpected), either way it cannot be used anymore.
+    """
+    if connection.sock is None:
+        return True
+    try:
+        return bool(select.select([connection.sock], [], [], 0)[0])
+    except (select.error, socket.error, ValueError):
+        return True
+
+def is_idle_connection_closed(error):
+    """
+    Tell if a request failed because the host had closed the connection
+
+    Such a request has not been received by the host and can be sent again.
+    The error is to come from sending the request or reading the status line
+    of its response, i.e. before any part of the response has been received.
+    Only a connection closed without any response is recognized. A reset
+    connection or a broken pipe may happen after the host has received the
+    request and it must not be run twice.
+    """
+    # no status line at all, python3 raises RemoteDisconnected, python2
+    # reports the empty line quoted
+    return isinstance(error, BadStatusLine) and error.line in ("", "''")
+
+
+class _PooledHTTPSConnection(HTTPSConnection):
+    def __init__(self, pool, host):
+        kwargs = {}
+        if pool._context is not None:
+            kwargs["context"] = pool._context
+        HTTPSConnection.__init__(self, host, **kwargs)
+        self._pool = pool
+        self.pool_host = host
+
+    def connect(self):
+        try:
+            self._connect()
+        except ConnectError:
+            raise
+        except (socket.error, ssl.SSLError) as e:
+            raise ConnectError(e)
+
+    def _connect(self):
+        if self._pool._context is None or not _TLS_SESSION_SUPPORTED:
+            HTTPSConnection.connect(self)
+            return
+        sock = socket.create_connection(
+            (self.host, self.port), self.timeout, self.source_address
+        )
+        self.sock = self._pool._context.wrap_socket(
+            sock,
+            server_hostname=self.host,
+            session=self._pool._get_tls_session(self.pool_host),
+        )
+
+
+class _PooledHTTPSHandler(urllib_HTTPSHandler):
+    def __init__(self, pool):
+        # old style class in python2, cannot use super
+        kwargs = {}
+        if pool._context is not None:
+            kwargs["context"] = pool._context
+        urllib_HTTPSHandler.__init__(self, **kwargs)
+        self._pool = pool
+
+    def https_open(self, req):
+        if getattr(req, "_tunnel_host", None):
+            # connections through a proxy are not pooled
+            return urllib_HTTPSHandler.https_open(self, req)
+        # python2 does not provide host and selector as attributes
+        host = req.get_host() if hasattr(req, "get_host") else req.host
+        selector = (
+            req.get_selector() if hasattr(req, "get_selector")
+            else req.selector
+        )
+        headers = dict(req.unredirected_hdrs)
+        headers.update(
+            (name, value) for name, value in req.headers.items()
+            if name not in headers
+        )
+        headers = dict(
+            (name.title(), value) for name, value in headers.items()
+        )
+        try:
+            response = self._pool.request(
+                host, req.get_method(), selector, req.data, headers
+            )
+        except socket.error as e:
+            raise urllib_URLError(e)
+        result = addinfourl(
+            BytesIO(response.body),
+            response.msg,
+            req.get_full_url(),
+            response.status
+        )
+        # urllib clients expect the reason in msg
+        result.msg = response.reason
+        return result
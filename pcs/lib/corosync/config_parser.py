@@ -12,6 +12,10 @@ class Section(object):
         self._parent = None
         self._attr_list = []
         self._section_list = []
+        # attributes and subsections by their names, in the order they appear
+        # in the lists above
+        self._attr_index = {}
+        self._section_index = {}
         self._name = name
 
     @property
@@ -27,26 +31,36 @@ class Section(object):
         return not self._attr_list and not self._section_list
 
     def export(self, indent="    "):
-        lines = []
-        for attr in self._attr_list:
-            lines.append("{0}: {1}".format(*attr))
+        final = "\n".join(self._export_lines(indent))
+        if final:
+            final += "\n"
+        return final
+
+    def _export_lines(self, indent):
+        lines = ["{0}: {1}".format(*attr) for attr in self._attr_list]
         if self._attr_list and self._section_list:
             lines.append("")
         section_count = len(self._section_list)
         for index, section in enumerate(self._section_list, 1):
-            lines.extend(str(section).split("\n"))
-            if not lines[-1].strip():
-                del lines[-1]
+            lines.extend(section._export_lines("    "))
             if index < section_count:
                 lines.append("")
         if self.parent:
             lines = [indent + x if x else x for x in lines]
             lines.insert(0, self.name + " {")
             lines.append("}")
-        final = "\n".join(lines)
-        if final:
-            final += "\n"
-        return final
+        return lines
+
+    def copy(self):
+        """
+        Return a deep copy of the section, the copy has no parent
+        """
+        section_copy = Section(self._name)
+        for name, value in self._attr_list:
+            section_copy.add_attribute(name, value)
+        for section in self._section_list:
+            section_copy._append_section(section.copy())
+        return section_copy
 
     def get_root(self):
         parent = self
@@ -55,47 +69,54 @@ class Section(object):
         return parent
 
     def get_attributes(self, name=None):
-        return [
-            attr for attr in self._attr_list if name is None or attr[0] == name
-        ]
+        if name is None:
+            return list(self._attr_list)
+        return list(self._attr_index.get(name, []))
 
     def add_attribute(self, name, value):
-        self._attr_list.append([name, value])
+        attr = [name, value]
+        self._attr_list.append(attr)
+        self._attr_index.setdefault(name, []).append(attr)
         return self
 
     def del_attribute(self, attribute):
-        self._attr_list = [
+        self._set_attr_list([
             attr for attr in self._attr_list if attr != attribute
-        ]
+        ])
         return self
 
     def del_attributes_by_name(self, name, value=None):
-        self._attr_list = [
+        if name not in self._attr_index:
+            return self
+        self._set_attr_list([
             attr for attr in self._attr_list
                 if not(attr[0] == name and (value is None or attr[1] == value))
-        ]
+        ])
         return self
 
     def set_attribute(self, name, value):
-        found = False
-        new_attr_list = []
-        for attr in self._attr_list:
-            if attr[0] != name:
-                new_attr_list.append(attr)
-            elif not found:
-                found = True
-                attr[1] = value
-                new_attr_list.append(attr)
-        self._attr_list = new_attr_list
-        if not found:
-            self.add_attribute(name, value)
+        same_name_list = self._attr_index.get(name)
+        if not same_name_list:
+            return self.add_attribute(name, value)
+        same_name_list[0][1] = value
+        if len(same_name_list) > 1:
+            duplicate_id_set = set([id(attr) for attr in same_name_list[1:]])
+            self._set_attr_list([
+                attr for attr in self._attr_list
+                if id(attr) not in duplicate_id_set
+            ])
         return self
 
+    def _set_attr_list(self, attr_list):
+        self._attr_list = attr_list
+        self._attr_index = {}
+        for attr in attr_list:
+            self._attr_index.setdefault(attr[0], []).append(attr)
+
     def get_sections(self, name=None):
-        return [
-            section for section in self._section_list
-                if name is None or section.name == name
-        ]
+        if name is None:
+            return list(self._section_list)
+        return list(self._section_index.get(name, []))
 
     def add_section(self, section):
         parent = self
@@ -105,14 +126,22 @@ class Section(object):
             parent = parent.parent
         if section.parent:
             section.parent.del_section(section)
+        return self._append_section(section)
+
+    def _append_section(self, section):
         section._parent = self
         self._section_list.append(section)
+        self._section_index.setdefault(section.name, []).append(section)
         return self
 
     def del_section(self, section):
         self._section_list.remove(section)
         # don't set parent to None if the section was not found in the list
         # thanks to remove raising a ValueError in that case
+        same_name_list = self._section_index[section.name]
+        same_name_list.remove(section)
+        if not same_name_list:
+            del self._section_index[section.name]
         section._parent = None
         return self
 
@@ -121,31 +150,34 @@ class Section(object):
 
 
 def parse_string(conf_text):
-    root = Section("")
-    _parse_section(conf_text.split("\n"), root)
-    return root
-
-def _parse_section(lines, section):
     # parser is trying to work the same way as an original corosync parser
-    while lines:
-        current_line = lines.pop(0).strip()
-        if not current_line or current_line[0] == "#":
+    root = Section("")
+    section = root
+    # numbers of lines opening the sections which are not closed yet
+    open_line_list = []
+    for line_number, line in enumerate(conf_text.split("\n"), 1):
+        line = line.strip()
+        if not line or line[0] == "#":
             continue
-        if "{" in current_line:
-            section_name, dummy_junk = current_line.rsplit("{", 1)
+        if "{" in line:
+            section_name, dummy_junk = line.rsplit("{", 1)
+            # a new section has no parent and cannot contain its parents,
+            # there is nothing add_section would need to check
             new_section = Section(section_name.strip())
-            section.add_section(new_section)
-            _parse_section(lines, new_section)
-        elif "}" in current_line:
+            section._append_section(new_section)
+            section = new_section
+            open_line_list.append(line_number)
+        elif "}" in line:
             if not section.parent:
-                raise UnexpectedClosingBraceException()
-            return
-        elif ":" in current_line:
-            section.add_attribute(
-                *[x.strip() for x in current_line.split(":", 1)]
-            )
-    if section.parent:
-        raise MissingClosingBraceException()
+                raise UnexpectedClosingBraceException(line_number)
+            section = section.parent
+            open_line_list.pop()
+        elif ":" in line:
+            name, value = line.split(":", 1)
+            section.add_attribute(name.strip(), value.strip())
+    if open_line_list:
+        raise MissingClosingBraceException(open_line_list[-1])
+    return root
 
 
 class CorosyncConfParserException(Exception):
@@ -155,10 +187,20 @@ class CircularParentshipException(CorosyncConfParserException):
     pass
 
 class ParseErrorException(CorosyncConfParserException):
-    pass
+    message = "parse error"
+
+    def __init__(self, line_number=None):
+        super(ParseErrorException, self).__init__(line_number)
+        self.line_number = line_number
+
+    def __str__(self):
+        if self.line_number is None:
+            return self.message
+        return "{0} on line {1}".format(self.message, self.line_number)
 
 class MissingClosingBraceException(ParseErrorException):
-    pass
+    # line_number is the line of the section which is not closed
+    message = "missing closing brace of the section"
 
 class UnexpectedClosingBraceException(ParseErrorException):
-    pass
+    message = "unexpected closing brace"
@@ -5,6 +5,7 @@ from __future__ import (
     unicode_literals,
 )
 
+import hashlib
 import os.path
 
 from pcs import settings
@@ -13,6 +14,10 @@ from pcs.lib import reports
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import NodeCommunicator
 
+# pcsd requests for managing corosync.conf on nodes
+SET_CONF_REQUEST = "remote/set_corosync_conf"
+GET_CONF_HASH_REQUEST = "remote/get_corosync_conf_hash"
+
 def get_local_corosync_conf():
     """
     Read corosync.conf file from local machine
@@ -46,10 +51,31 @@ def set_remote_corosync_conf(node_communicator, node_addr, config_text):
     """
     dummy_response = node_communicator.call_node(
         node_addr,
-        "remote/set_corosync_conf",
-        NodeCommunicator.format_data_dict({'corosync_conf': config_text})
+        SET_CONF_REQUEST,
+        format_set_conf_data(config_text)
     )
 
+def format_set_conf_data(config_text):
+    """
+    Return data of a request sending corosync.conf to a node
+    """
+    return NodeCommunicator.format_data_dict({'corosync_conf': config_text})
+
+def get_corosync_conf_hash(config_text):
+    """
+    Return a hash of corosync.conf text, pcsd hashes its files the same way
+    """
+    return hashlib.sha1(config_text.encode("utf-8")).hexdigest()
+
+def get_remote_corosync_conf_hash(node_communicator, node_addr):
+    """
+    Get a hash of corosync.conf present on a node
+    node_addr instance of NodeAddresses
+    """
+    return node_communicator.call_node(
+        node_addr, GET_CONF_HASH_REQUEST, None
+    ).strip()
+
 def reload_config(runner):
     """
     Ask corosync to reload its configuration
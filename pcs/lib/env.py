@@ -5,13 +5,15 @@ from __future__ import (
     unicode_literals,
 )
 
+from copy import deepcopy
 from lxml import etree
 import os.path
 import tempfile
 
 from pcs import settings
-from pcs.lib import reports
+from pcs.lib import config_file_cache, reports
 from pcs.lib.booth.env import BoothEnv
+from pcs.lib.cib.tools import register_id_index, unregister_id_index
 from pcs.lib.cluster_conf_facade import ClusterConfFacade
 from pcs.lib.corosync.config_facade import ConfigFacade as CorosyncConfigFacade
 from pcs.lib.corosync.live import (
@@ -21,22 +23,33 @@ from pcs.lib.corosync.live import (
     reload_config as reload_corosync_config,
 )
 from pcs.lib.external import (
-    is_cman_cluster,
+    ASYNC_SUPPORTED,
     is_service_running,
     CommandRunner,
     NodeCommunicator,
 )
+if ASYNC_SUPPORTED:
+    # it is able to run calls to nodes from coroutines as well
+    from pcs.lib.node_communicator_async import (
+        AsyncNodeCommunicator as NodeCommunicator,
+    )
 from pcs.lib.errors import LibraryError
+from pcs.lib.host_facts import (
+    ensure_wait_for_idle_support,
+    is_cman_cluster,
+)
 from pcs.lib.nodes_task import (
     distribute_corosync_conf,
     check_corosync_offline_on_nodes,
     qdevice_reload_on_nodes,
 )
 from pcs.lib.pacemaker.live import (
-    ensure_wait_for_idle_support,
+    diff_cibs_xml,
     ensure_cib_version,
     get_cib,
+    get_cib_configuration_xml,
     get_cib_xml,
+    push_cib_diff_xml,
     replace_cib_configuration_xml,
     wait_for_idle,
 )
@@ -76,6 +89,12 @@ class LibraryEnvironment(object):
         self._auth_tokens = None
         self._cib_upgraded = False
         self._cib_data_tmp_file = None
+        # CIB loaded by get_cib, pushed CIB is diffed against it
+        self._cib_diff_source = None
+        # status section cut off the CIB file data by get_cib
+        self._cib_status = None
+        # CIB loaded by get_cib whose index of ids is kept
+        self._id_indexed_cib = None
 
         self.__timeout_cache = {}
 
@@ -111,8 +130,24 @@ class LibraryEnvironment(object):
         else:
             return self._cib_data
 
-    def get_cib(self, minimal_version=None):
-        cib = get_cib(self._get_cib_xml())
+    def get_cib(self, minimal_version=None, with_status=True):
+        """
+        Return the CIB as an etree
+
+        tuple minimal_version -- upgrade the CIB to this schema version
+        bool with_status -- if False, the status section is neither loaded nor
+            parsed, commands working only with the configuration should use it
+        """
+        if with_status or not self.is_cib_live:
+            cib_xml = self._get_cib_xml()
+        else:
+            cib_xml = get_cib_configuration_xml(self.cmd_runner())
+        cib = get_cib(cib_xml)
+        if not with_status and not self.is_cib_live:
+            # keep the status aside to put it back when the CIB is pushed
+            self._cib_status = cib.find("./status")
+            if self._cib_status is not None:
+                cib.remove(self._cib_status)
         if minimal_version is not None:
             upgraded_cib = ensure_cib_version(
                 self.cmd_runner(),
@@ -121,20 +156,53 @@ class LibraryEnvironment(object):
             )
             if upgraded_cib is not None:
                 cib = upgraded_cib
+                cib_xml = etree.tostring(cib).decode()
                 if self.is_cib_live and not self._cib_upgraded:
                     self.report_processor.process(
                         reports.cib_upgrade_successful()
                     )
                 self._cib_upgraded = True
+        if self.is_cib_live:
+            self._cib_diff_source = cib_xml
+        self._keep_cib_id_index(cib)
         return cib
 
+    def _keep_cib_id_index(self, cib):
+        # Keep the index of ids while the CIB is being edited so ids are not
+        # looked up in the whole CIB over and over again.
+        if self._id_indexed_cib is not None:
+            unregister_id_index(self._id_indexed_cib)
+        self._id_indexed_cib = cib
+        if cib is not None:
+            register_id_index(cib)
+
     def _push_cib_xml(self, cib_data):
         if self.is_cib_live:
-            replace_cib_configuration_xml(self.cmd_runner(), cib_data)
+            if self._cib_diff_source is None:
+                # we do not know what the CIB looked like, replace it
+                replace_cib_configuration_xml(self.cmd_runner(), cib_data)
+            else:
+                self._push_cib_diff_xml(cib_data)
             self._cib_upgraded = False
         else:
             self._cib_data = cib_data
 
+    def _push_cib_diff_xml(self, cib_data):
+        # Push only changes done to the loaded CIB. It is much cheaper for
+        # pacemaker and it does not overwrite changes done by others meanwhile.
+        try:
+            cib_diff_xml = diff_cibs_xml(
+                self.cmd_runner(), self._cib_diff_source, cib_data
+            )
+        except LibraryError:
+            # the diff cannot be made, replace the configuration as the old
+            # cli does in such a case
+            replace_cib_configuration_xml(self.cmd_runner(), cib_data)
+        else:
+            if cib_diff_xml:
+                push_cib_diff_xml(self.cmd_runner(), cib_diff_xml)
+        self._cib_diff_source = cib_data
+
     def _get_wait_timeout(self, wait):
         if wait is False:
             return False
@@ -161,7 +229,23 @@ class LibraryEnvironment(object):
         #python 3 removed .encode() from bytes
         #run(...) calls subprocess.Popen.communicate which calls encode...
         #so here is bytes to str conversion
-        self._push_cib_xml(etree.tostring(cib).decode())
+        if (
+            not self.is_cib_live
+            and
+            self._cib_status is not None
+            and
+            cib.find("./status") is None
+        ):
+            # do not lose the status section which has not been loaded
+            cib.append(self._cib_status)
+            try:
+                cib_xml = etree.tostring(cib).decode()
+            finally:
+                cib.remove(self._cib_status)
+        else:
+            cib_xml = etree.tostring(cib).decode()
+        self._keep_cib_id_index(None)
+        self._push_cib_xml(cib_xml)
 
         if timeout is not False:
             wait_for_idle(self.cmd_runner(), timeout)
@@ -177,7 +261,18 @@ class LibraryEnvironment(object):
             return self._corosync_conf_data
 
     def get_corosync_conf(self):
-        return CorosyncConfigFacade.from_string(self.get_corosync_conf_data())
+        if not self.is_corosync_conf_live:
+            return CorosyncConfigFacade.from_string(
+                self.get_corosync_conf_data()
+            )
+        return CorosyncConfigFacade(config_file_cache.get(
+            settings.corosync_conf_file,
+            "corosync.conf",
+            lambda: CorosyncConfigFacade.from_string(
+                self.get_corosync_conf_data()
+            ).config,
+            lambda config: config.copy()
+        ))
 
     def push_corosync_conf(
         self, corosync_conf_facade, skip_offline_nodes=False
@@ -192,13 +287,21 @@ class LibraryEnvironment(object):
                     node_list,
                     skip_offline_nodes
                 )
-            distribute_corosync_conf(
-                self.node_communicator(),
-                self.report_processor,
-                node_list,
-                corosync_conf_data,
-                skip_offline_nodes
-            )
+            try:
+                updated_node_list = distribute_corosync_conf(
+                    self.node_communicator(),
+                    self.report_processor,
+                    node_list,
+                    corosync_conf_data,
+                    skip_offline_nodes,
+                    skip_unchanged_nodes=True
+                )
+            finally:
+                # the local file has been written by pcsd
+                config_file_cache.invalidate(settings.corosync_conf_file)
+            if not updated_node_list:
+                # all the nodes already have the config, nothing to reload
+                return
             if is_service_running(self.cmd_runner(), "corosync"):
                 reload_corosync_config(self.cmd_runner())
                 self.report_processor.process(
@@ -223,7 +326,16 @@ class LibraryEnvironment(object):
 
 
     def get_cluster_conf(self):
-        return ClusterConfFacade.from_string(self.get_cluster_conf_data())
+        if not self.is_cluster_conf_live:
+            return ClusterConfFacade.from_string(self.get_cluster_conf_data())
+        return ClusterConfFacade(config_file_cache.get(
+            settings.cluster_conf_file,
+            "cluster.conf etree",
+            lambda: ClusterConfFacade.from_string(
+                self.get_cluster_conf_data()
+            ).config,
+            deepcopy
+        ))
 
 
     @property
@@ -6,7 +6,6 @@ from __future__ import (
 )
 
 import base64
-import inspect
 import json
 import os
 try:
@@ -17,7 +16,6 @@ except ImportError:
     from shlex import quote as shell_quote
 import re
 import signal
-import ssl
 import subprocess
 import sys
 try:
@@ -35,19 +33,11 @@ except ImportError:
 try:
     # python2
     from urllib2 import (
-        build_opener as urllib_build_opener,
-        HTTPCookieProcessor as urllib_HTTPCookieProcessor,
-        HTTPSHandler as urllib_HTTPSHandler,
         HTTPError as urllib_HTTPError,
         URLError as urllib_URLError
     )
 except ImportError:
     # python3
-    from urllib.request import (
-        build_opener as urllib_build_opener,
-        HTTPCookieProcessor as urllib_HTTPCookieProcessor,
-        HTTPSHandler as urllib_HTTPSHandler
-    )
     from urllib.error import (
         HTTPError as urllib_HTTPError,
         URLError as urllib_URLError
@@ -55,13 +45,14 @@ except ImportError:
 
 from pcs import settings
 from pcs.common import report_codes
+from pcs.common.executor import ParallelExecutor
 from pcs.common.tools import (
     join_multilines,
     simple_cache,
-    run_parallel as tools_run_parallel,
 )
-from pcs.lib import reports
+from pcs.lib import connection_pool, node_reachability, reports
 from pcs.lib.errors import LibraryError, ReportItemSeverity
+from pcs.lib.node import NodeAddresses
 
 
 
@@ -69,6 +60,10 @@ _chkconfig = settings.chkconfig_binary
 _service = settings.service_binary
 _systemctl = settings.systemctl_binary
 
+# pcs.lib.node_communicator_async uses syntax not available before python 3.5,
+# import it only if this is True
+ASYNC_SUPPORTED = sys.version_info >= (3, 5)
+
 class ManageServiceError(Exception):
     #pylint: disable=super-init-not-called
     def __init__(self, service, message=None, instance=None):
@@ -463,6 +458,10 @@ class NodeConnectionException(NodeCommunicationException):
     pass
 
 
+class NodeKnownOfflineException(NodeConnectionException):
+    pass
+
+
 class NodeAuthenticationException(NodeCommunicationException):
     pass
 
@@ -500,6 +499,8 @@ def node_communicator_exception_to_report_item(
             reports.node_communication_error_other_error,
         NodeConnectionException:
             reports.node_communication_error_unable_to_connect,
+        NodeKnownOfflineException:
+            reports.node_communication_error_skipped_offline,
     }
     if e.__class__ in exception_to_report:
         return exception_to_report[e.__class__](
@@ -559,14 +560,40 @@ class NodeCommunicator(object):
         data command parameters, encoded by format_data_* method
         """
         opener = self.__get_opener()
+        url, cookies, data = self._prepare_request(host, request, data)
+        self._check_reachability(host, request)
+        if cookies:
+            opener.addheaders.append(("Cookie", ";".join(cookies)))
+
+        try:
+            result = opener.open(url, data)
+            # python3 returns bytes not str
+            response_data = result.read().decode("utf-8")
+            self._report_response(
+                host, url, result.getcode(), response_data
+            )
+            return response_data
+        except urllib_HTTPError as e:
+            # python3 returns bytes not str
+            response_data = e.read().decode("utf-8")
+            self._report_response(host, url, e.code, response_data)
+            self._raise_http_error(host, request, e.code, response_data)
+        except urllib_URLError as e:
+            self._handle_connection_error(
+                host, request, e.reason,
+                unreachable=node_reachability.is_unreachable_error(e.reason)
+            )
+        except HTTPException:
+            self._handle_connection_error(host, request, "Connection error")
+
+    def _prepare_request(self, host, request, data):
+        """
+        Return url, cookies and encoded data of a request, report the request
+        """
         url = "https://{host}:2224/{request}".format(
             host=("[{0}]".format(host) if ":" in host else host),
             request=request
         )
-        cookies = self.__prepare_cookies(host)
-        if cookies:
-            opener.addheaders.append(("Cookie", ";".join(cookies)))
-
         msg = "Sending HTTP Request to: {url}"
         if data:
             msg += "\n--Debug Input Start--\n{data}\n--Debug Input End--"
@@ -574,94 +601,95 @@ class NodeCommunicator(object):
         self._reporter.process(
             reports.node_communication_started(url, data)
         )
-        result_msg = (
-            "Finished calling: {url}\nResponse Code: {code}"
-            + "\n--Debug Response Start--\n{response}\n--Debug Response End--"
+        # python3 requires data to be bytes not str
+        if data:
+            data = data.encode("utf-8")
+        return url, self._prepare_cookies(host), data
+
+    def _check_reachability(self, host, request):
+        """
+        Skip or probe a host which has been unreachable recently
+        """
+        reason = node_reachability.get_offline_reason(host)
+        if reason is None:
+            return
+        if node_reachability.is_skip_offline():
+            self._logger.debug(
+                "Skipping {node}, unable to connect to it recently ({reason})"
+                .format(node=host, reason=reason)
+            )
+            raise NodeKnownOfflineException(host, request, reason)
+        reason = node_reachability.probe(host)
+        if reason is not None:
+            self._handle_connection_error(
+                host, request, reason, unreachable=True
+            )
+
+    def _report_response(self, host, url, code, response_data):
+        # the host responded, it is reachable
+        node_reachability.record_success(host)
+        self._logger.debug(
+            (
+                "Finished calling: {url}\nResponse Code: {code}"
+                +
+                "\n--Debug Response Start--\n{response}"
+                +
+                "\n--Debug Response End--"
+            ).format(url=url, code=code, response=response_data)
+        )
+        self._reporter.process(
+            reports.node_communication_finished(url, code, response_data)
         )
 
-        try:
-            # python3 requires data to be bytes not str
-            if data:
-                data = data.encode("utf-8")
-            result = opener.open(url, data)
-            # python3 returns bytes not str
-            response_data = result.read().decode("utf-8")
-            self._logger.debug(result_msg.format(
-                url=url,
-                code=result.getcode(),
-                response=response_data
-            ))
-            self._reporter.process(
-                reports.node_communication_finished(
-                    url, result.getcode(), response_data
-                )
+    def _raise_http_error(self, host, request, code, response_data):
+        """
+        Raise an exception describing an HTTP error response
+        """
+        if code == 400:
+            # old pcsd protocol: error messages are commonly passed in plain
+            # text in response body with HTTP code 400
+            # we need to be backward compatible with that
+            raise NodeCommandUnsuccessfulException(
+                host, request, response_data.rstrip()
             )
-            return response_data
-        except urllib_HTTPError as e:
-            # python3 returns bytes not str
-            response_data = e.read().decode("utf-8")
-            self._logger.debug(result_msg.format(
-                url=url,
-                code=e.code,
-                response=response_data
-            ))
-            self._reporter.process(
-                reports.node_communication_finished(url, e.code, response_data)
+        elif code == 401:
+            raise NodeAuthenticationException(
+                host, request, "HTTP error: {0}".format(code)
+            )
+        elif code == 403:
+            raise NodePermissionDeniedException(
+                host, request, "HTTP error: {0}".format(code)
+            )
+        elif code == 404:
+            raise NodeUnsupportedCommandException(
+                host, request, "HTTP error: {0}".format(code)
+            )
+        else:
+            raise NodeCommunicationException(
+                host, request, "HTTP error: {0}".format(code)
             )
-            if e.code == 400:
-                # old pcsd protocol: error messages are commonly passed in plain
-                # text in response body with HTTP code 400
-                # we need to be backward compatible with that
-                raise NodeCommandUnsuccessfulException(
-                    host, request, response_data.rstrip()
-                )
-            elif e.code == 401:
-                raise NodeAuthenticationException(
-                    host, request, "HTTP error: {0}".format(e.code)
-                )
-            elif e.code == 403:
-                raise NodePermissionDeniedException(
-                    host, request, "HTTP error: {0}".format(e.code)
-                )
-            elif e.code == 404:
-                raise NodeUnsupportedCommandException(
-                    host, request, "HTTP error: {0}".format(e.code)
-                )
-            else:
-                raise NodeCommunicationException(
-                    host, request, "HTTP error: {0}".format(e.code)
-                )
-        except urllib_URLError as e:
-            self.__handle_connection_error(host, request, e.reason)
-        except HTTPException:
-            self.__handle_connection_error(host, request, "Connection error")
 
-    def __handle_connection_error(self, host, request, reason):
+    def _handle_connection_error(
+        self, host, request, reason, unreachable=False
+    ):
+        """
+        bool unreachable -- connecting to the host failed, remember the host
+            as offline
+        """
         msg = "Unable to connect to {node} ({reason})"
         self._logger.debug(msg.format(node=host, reason=reason))
+        if unreachable:
+            node_reachability.record_failure(host, reason)
         self._reporter.process(
             reports.node_communication_not_connected(host, reason)
         )
         raise NodeConnectionException(host, request, reason)
 
     def __get_opener(self):
-        # enable self-signed certificates
-        # https://www.python.org/dev/peps/pep-0476/
-        # http://bugs.python.org/issue21308
-        if (
-            hasattr(ssl, "_create_unverified_context")
-            and
-            "context" in inspect.getargspec(urllib_HTTPSHandler.__init__).args
-        ):
-            opener = urllib_build_opener(
-                urllib_HTTPSHandler(context=ssl._create_unverified_context()),
-                urllib_HTTPCookieProcessor()
-            )
-        else:
-            opener = urllib_build_opener(urllib_HTTPCookieProcessor())
-        return opener
+        # connections are pooled and kept alive, see connection_pool
+        return connection_pool.build_opener()
 
-    def __prepare_cookies(self, host):
+    def _prepare_cookies(self, host):
         # Let's be safe about characters in variables (they can come from env)
         # and do base64. We cannot do it for CIB_user however to be backward
         # compatible so we at least remove disallowed characters.
@@ -696,21 +724,77 @@ def parallel_nodes_communication_helper(
     if skip_offline_nodes:
         failure_severity = ReportItemSeverity.WARNING
         failure_forceable = None
-    report_items = []
-
     def _parallel(*args, **kwargs):
         try:
             func(*args, **kwargs)
         except NodeCommunicationException as e:
-            report_items.append(
-                node_communicator_exception_to_report_item(
-                    e,
-                    failure_severity,
-                    failure_forceable
-                )
+            return (
+                [
+                    node_communicator_exception_to_report_item(
+                        e,
+                        failure_severity,
+                        failure_forceable
+                    )
+                ],
+                None
             )
         except LibraryError as e:
-            report_items.extend(e.args)
+            return list(e.args), None
+        return [], None
 
-    tools_run_parallel(_parallel, func_args_kwargs)
+    report_items, dummy_value_list = run_node_tasks(
+        _parallel, func_args_kwargs, failure_severity, failure_forceable
+    )
     reporter.process_list(report_items)
+
+
+def get_node_task_executor():
+    """
+    Return an executor for running calls to nodes in parallel
+    """
+    return ParallelExecutor(
+        max_workers=settings.node_tasks_max_workers,
+        task_timeout=settings.node_task_timeout,
+        deadline=settings.node_tasks_deadline,
+    )
+
+def run_node_tasks(
+    func, func_args_kwargs, severity=ReportItemSeverity.ERROR, forceable=None
+):
+    """
+    Run node calls in parallel, return their reports and values
+
+    Each call returns a tuple (list of report items, value) instead of changing
+    any shared state. Only results of calls finished in time are used, a call
+    not finished in time is reported as timed out and whatever it produces
+    later is thrown away. A call is identified in the reports by its
+    NodeAddresses argument. Exceptions raised by func are raised once all calls
+    are finished.
+    Return tuple (list of report items, list of values of the calls in the
+    order of func_args_kwargs, None for calls not finished in time)
+
+    function func function to be run, should be a function calling a node
+    iterable func_args_kwargs list of tuples: (*args, **kwargs)
+    """
+    report_items = []
+    value_list = []
+    result_list = get_node_task_executor().run(func, func_args_kwargs)
+    for result in result_list:
+        task_report_items, value = [], None
+        if result.timed_out or result.cancelled:
+            task_report_items = [reports.node_communication_error_timed_out(
+                _get_task_node_label(result), severity, forceable
+            )]
+        elif result.exception is None:
+            task_report_items, value = result.value
+        report_items.extend(task_report_items)
+        value_list.append(value)
+    for result in result_list:
+        result.get_value()
+    return report_items, value_list
+
+def _get_task_node_label(task_result):
+    for arg in list(task_result.args) + list(task_result.kwargs.values()):
+        if isinstance(arg, NodeAddresses):
+            return arg.label
+    return None
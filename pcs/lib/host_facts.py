@@ -0,0 +1,69 @@
+"""
+Facts about the local host which change only when packages are (re)installed
+
+Detecting them means running external processes, so they are cached in
+a file shared by all pcs runs. A cached fact is valid as long as the files it
+has been detected from (usually binaries) have not been changed.
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os.path
+
+from pcs import settings
+from pcs.lib import external, reports
+from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker import live
+from pcs.lib.tools import (
+    get_file_stat_key,
+    read_cache_file,
+    write_cache_file,
+)
+
+
+# facts loaded from the cache file, the file is read once per process
+_facts_cache = {"facts": None}
+
+def is_cman_cluster(runner):
+    """
+    Detect if underlaying locally installed cluster is CMAN based
+    """
+    return _get_fact(
+        "is_cman_cluster",
+        [os.path.join(settings.corosync_binaries, "corosync")],
+        lambda: external.is_cman_cluster(runner)
+    )
+
+def has_wait_for_idle_support(runner):
+    return _get_fact(
+        "has_wait_for_idle_support",
+        [os.path.join(settings.pacemaker_binaries, "crm_resource")],
+        lambda: live.has_wait_for_idle_support(runner)
+    )
+
+def ensure_wait_for_idle_support(runner):
+    if not has_wait_for_idle_support(runner):
+        raise LibraryError(reports.wait_for_idle_not_supported())
+
+def _get_fact(name, key_files, detect):
+    key = [get_file_stat_key(path) for path in key_files]
+    facts = _load_facts()
+    if name in facts and facts[name].get("key") == key:
+        return facts[name]["value"]
+    value = detect()
+    facts[name] = {"key": key, "value": value}
+    _save_facts()
+    return value
+
+def _load_facts():
+    if _facts_cache["facts"] is None:
+        facts = read_cache_file(settings.host_facts_cache_file)
+        _facts_cache["facts"] = facts if isinstance(facts, dict) else {}
+    return _facts_cache["facts"]
+
+def _save_facts():
+    write_cache_file(settings.host_facts_cache_file, _facts_cache["facts"])
@@ -0,0 +1,427 @@
+"""
+Asyncio based communication with nodes, requires python 3.5+
+
+AsyncNodeCommunicator sends requests to pcsd on nodes from coroutines, so
+calls to hundreds of nodes and multi-step workflows on each node can run
+concurrently on one event loop without a thread per node. Responses are mapped
+to the same exceptions and reports as in NodeCommunicator. Connections are
+kept alive and reused by following requests to the same host until the event
+loop run finishes.
+
+The module uses syntax not available in python 2, import it only after
+checking the python version (see ASYNC_SUPPORTED in pcs.lib.external).
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import asyncio
+
+from pcs import settings
+from pcs.common import report_codes
+from pcs.lib import connection_pool, node_reachability, reports
+from pcs.lib.corosync import live as corosync_live
+from pcs.lib.errors import LibraryError, ReportItemSeverity
+from pcs.lib.external import (
+    NodeCommunicationException,
+    NodeCommunicator,
+    NodeUnsupportedCommandException,
+    node_communicator_exception_to_report_item,
+)
+
+
+class _ResponseError(Exception):
+    pass
+
+
+class _IdleConnectionClosed(Exception):
+    pass
+
+
+class AsyncNodeCommunicator(NodeCommunicator):
+    """
+    Sends requests to nodes from coroutines
+
+    call_node and call_host are the synchronous ones of NodeCommunicator. Use
+    call_node_async and call_host_async in coroutines run by run or run_all to
+    send requests concurrently. Coroutines are to be run from one thread at
+    a time.
+    """
+    def __init__(
+        self, logger, reporter, auth_tokens, user=None, groups=None,
+        max_connections=None, request_timeout=None
+    ):
+        """
+        int max_connections maximal number of requests sent at once
+        number request_timeout maximal time in seconds a request may take
+        """
+        super(AsyncNodeCommunicator, self).__init__(
+            logger, reporter, auth_tokens, user, groups
+        )
+        self._max_connections = (
+            settings.node_async_max_connections if max_connections is None
+            else max_connections
+        )
+        self._request_timeout = (
+            settings.node_task_timeout if request_timeout is None
+            else request_timeout
+        )
+        self._ssl_context = connection_pool.create_ssl_context()
+        self._loop_state = None
+
+    def run(self, coroutine):
+        """
+        Run a coroutine in a new event loop, return its result
+
+        Connections opened by the coroutine are closed when it finishes.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._run(coroutine))
+        finally:
+            loop.close()
+
+    def run_all(self, coroutine_list):
+        """
+        Run coroutines concurrently in a new event loop
+
+        Return a list of their results in the order of coroutine_list, an
+        exception raised by a coroutine is returned as its result.
+        """
+        async def gather():
+            return await asyncio.gather(
+                *coroutine_list, return_exceptions=True
+            )
+        return self.run(gather())
+
+    async def call_node_async(self, node_addr, request, data):
+        """
+        Send a request to a node
+        node_addr destination node, instance of NodeAddresses
+        request command to be run on the node
+        data command parameters, encoded by format_data_* method
+        """
+        return await self.call_host_async(node_addr.ring0, request, data)
+
+    async def call_host_async(self, host, request, data):
+        """
+        Send a request to a host
+        host host address
+        request command to be run on the host
+        data command parameters, encoded by format_data_* method
+        """
+        url, cookies, data = self._prepare_request(host, request, data)
+        state = self._get_loop_state()
+        if node_reachability.get_offline_reason(host) is not None:
+            # probing the host blocks, do not block other requests meanwhile
+            await state.loop.run_in_executor(
+                None, self._check_reachability, host, request
+            )
+        try:
+            async with state.semaphore:
+                code, response_data = await asyncio.wait_for(
+                    self._send(state, host, request, data, cookies),
+                    self._request_timeout
+                )
+        except asyncio.TimeoutError:
+            self._handle_connection_error(host, request, "Connection timed out")
+        except connection_pool.ConnectError as e:
+            self._handle_connection_error(
+                host, request, str(e) or "Connection error", unreachable=True
+            )
+        except OSError as e:
+            self._handle_connection_error(
+                host, request, e.strerror or str(e) or "Connection error"
+            )
+        except (
+            _ResponseError,
+            _IdleConnectionClosed,
+            asyncio.IncompleteReadError,
+            ValueError,
+        ):
+            self._handle_connection_error(host, request, "Connection error")
+        response_data = response_data.decode("utf-8")
+        self._report_response(host, url, code, response_data)
+        if code >= 400:
+            self._raise_http_error(host, request, code, response_data)
+        return response_data
+
+    async def close_async(self):
+        """
+        Close kept alive connections, for coroutines run outside of run
+        """
+        if self._loop_state is not None:
+            self._loop_state.close()
+            self._loop_state = None
+
+    async def _run(self, coroutine):
+        try:
+            return await coroutine
+        finally:
+            await self.close_async()
+
+    def _get_loop_state(self):
+        # asyncio primitives and connections are bound to an event loop
+        loop = asyncio.get_event_loop()
+        if self._loop_state is None or self._loop_state.loop is not loop:
+            self._loop_state = _LoopState(loop, self._max_connections)
+        return self._loop_state
+
+    async def _send(self, state, host, request, data, cookies):
+        reader, writer, reused = await state.acquire(
+            host, self._open_connection
+        )
+        try:
+            try:
+                code, keep_alive, response_data = await _exchange(
+                    reader, writer, host, request, data, cookies
+                )
+            except _IdleConnectionClosed:
+                # Resend the request only if the host closed the idle
+                # connection in the meantime. Otherwise the host may have
+                # already run the request and it must not be run twice.
+                if not reused:
+                    raise
+                writer.close()
+                reader, writer = await self._open_connection(host)
+                code, keep_alive, response_data = await _exchange(
+                    reader, writer, host, request, data, cookies
+                )
+        except:
+            writer.close()
+            raise
+        if keep_alive:
+            state.release(host, reader, writer)
+        else:
+            writer.close()
+        return code, response_data
+
+    async def _open_connection(self, host):
+        try:
+            return await asyncio.open_connection(
+                host, 2224, ssl=(self._ssl_context or True)
+            )
+        except OSError as e:
+            raise connection_pool.ConnectError(e)
+
+
+class _LoopState(object):
+    def __init__(self, loop, max_connections):
+        self.loop = loop
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self._idle_connections = {}
+
+    async def acquire(self, host, open_connection):
+        idle_list = self._idle_connections.get(host)
+        if idle_list:
+            reader, writer = idle_list.pop()
+            return reader, writer, True
+        reader, writer = await open_connection(host)
+        return reader, writer, False
+
+    def release(self, host, reader, writer):
+        idle_list = self._idle_connections.setdefault(host, [])
+        if len(idle_list) < connection_pool.MAX_IDLE_CONNECTIONS_PER_HOST:
+            idle_list.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for idle_list in self._idle_connections.values():
+            for dummy_reader, writer in idle_list:
+                writer.close()
+        self._idle_connections = {}
+
+
+async def _exchange(reader, writer, host, request, data, cookies):
+    writer.write(_format_request(host, request, data, cookies))
+    await writer.drain()
+    return await _read_response(reader)
+
+def _format_request(host, request, data, cookies):
+    header_list = [
+        # the same methods as urllib uses
+        "{0} /{1} HTTP/1.1".format(
+            "GET" if data is None else "POST", request
+        ),
+        "Host: {0}:2224".format(
+            "[{0}]".format(host) if ":" in host else host
+        ),
+        "Connection: keep-alive",
+        "Content-Length: {0}".format(len(data) if data else 0),
+    ]
+    if data:
+        header_list.append("Content-Type: application/x-www-form-urlencoded")
+    if cookies:
+        header_list.append("Cookie: {0}".format(";".join(cookies)))
+    return (
+        "\r\n".join(header_list).encode("utf-8") + b"\r\n\r\n" + (data or b"")
+    )
+
+async def _read_response(reader):
+    """
+    Return status code, keep-alive flag and body of an HTTP response
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        # the connection has been closed before any part of a response came
+        raise _IdleConnectionClosed()
+    status_parts = status_line.decode("latin-1").split(None, 2)
+    if len(status_parts) < 2 or not status_parts[0].startswith("HTTP/"):
+        raise _ResponseError("Invalid status line")
+    code = int(status_parts[1])
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if not line:
+            raise _ResponseError("Unexpected end of headers")
+        if line in ("\r\n", "\n"):
+            break
+        name, dummy_sep, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = (
+        headers.get("connection", "").lower() != "close"
+        and
+        status_parts[0] != "HTTP/1.0"
+    )
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = b""
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                # skip trailers
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return code, keep_alive, body
+
+
+def parallel_nodes_workflow_helper(
+    communicator, workflow, func_args_kwargs, reporter,
+    skip_offline_nodes=False
+):
+    """
+    Run a workflow for several nodes concurrently on one event loop, handle
+    communication exceptions. Raise LibraryError on any failure.
+
+    AsyncNodeCommunicator communicator runs the event loop
+    coroutine function workflow should await calls to a node
+    iterable func_args_kwargs list of tuples: (*args, **kwargs)
+    bool skip_offline_nodes do not raise LibraryError if a node is unreachable
+    """
+    failure_severity = ReportItemSeverity.ERROR
+    failure_forceable = report_codes.SKIP_OFFLINE_NODES
+    if skip_offline_nodes:
+        failure_severity = ReportItemSeverity.WARNING
+        failure_forceable = None
+    report_items = []
+
+    async def _run(*args, **kwargs):
+        try:
+            await workflow(*args, **kwargs)
+        except NodeCommunicationException as e:
+            report_items.append(
+                node_communicator_exception_to_report_item(
+                    e,
+                    failure_severity,
+                    failure_forceable
+                )
+            )
+        except LibraryError as e:
+            report_items.extend(e.args)
+
+    _raise_exceptions(communicator.run_all([
+        _run(*args, **kwargs) for args, kwargs in func_args_kwargs
+    ]))
+    reporter.process_list(report_items)
+
+def distribute_corosync_conf(
+    communicator, reporter, node_addr_list, config_text,
+    skip_offline_nodes=False, skip_unchanged_nodes=False
+):
+    """
+    Send corosync.conf to several cluster nodes, return nodes which accepted it
+
+    The same as pcs.lib.nodes_task.distribute_corosync_conf. Checking whether
+    a node already has the config and sending the config to it is one workflow
+    per node, nodes do not wait for each other between the steps.
+
+    AsyncNodeCommunicator communicator runs the event loop
+    """
+    failure_severity = ReportItemSeverity.ERROR
+    failure_forceable = report_codes.SKIP_OFFLINE_NODES
+    if skip_offline_nodes:
+        failure_severity = ReportItemSeverity.WARNING
+        failure_forceable = None
+    report_items = []
+    updated_label_set = set()
+    config_hash = corosync_live.get_corosync_conf_hash(config_text)
+
+    async def _is_unchanged(node):
+        try:
+            remote_hash = await communicator.call_node_async(
+                node, corosync_live.GET_CONF_HASH_REQUEST, None
+            )
+        except NodeUnsupportedCommandException:
+            # pcsd on the node is too old to tell, send the config anyway
+            return False
+        return remote_hash.strip() == config_hash
+
+    async def _workflow(node):
+        try:
+            if skip_unchanged_nodes and await _is_unchanged(node):
+                reporter.process(
+                    reports.corosync_config_unchanged_on_node(node.label)
+                )
+                return
+            await communicator.call_node_async(
+                node,
+                corosync_live.SET_CONF_REQUEST,
+                corosync_live.format_set_conf_data(config_text)
+            )
+            updated_label_set.add(node.label)
+            reporter.process(
+                reports.corosync_config_accepted_by_node(node.label)
+            )
+        except NodeCommunicationException as e:
+            report_items.append(
+                node_communicator_exception_to_report_item(
+                    e,
+                    failure_severity,
+                    failure_forceable
+                )
+            )
+            report_items.append(
+                reports.corosync_config_distribution_node_error(
+                    node.label,
+                    failure_severity,
+                    failure_forceable
+                )
+            )
+
+    reporter.process(reports.corosync_config_distribution_started())
+    _raise_exceptions(
+        communicator.run_all([_workflow(node) for node in node_addr_list])
+    )
+    if skip_unchanged_nodes:
+        report_items.append(reports.corosync_config_distribution_summary(
+            len(updated_label_set), len(node_addr_list)
+        ))
+    reporter.process_list(report_items)
+    return [node for node in node_addr_list if node.label in updated_label_set]
+
+def _raise_exceptions(result_list):
+    for result in result_list:
+        if isinstance(result, BaseException):
+            raise result
@@ -0,0 +1,124 @@
+"""
+Short-lived record of nodes pcs has been unable to connect to
+
+When a node is down, each command sending requests to it would wait for
+a connection timeout again. Connection failures are therefore recorded in
+a file shared by all pcs runs. For settings.node_offline_cache_period seconds
+after a failure, the node is skipped if offline nodes are to be skipped, or it
+is probed with a short connection timeout before a request is sent to it.
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import socket
+import threading
+import time
+
+from pcs import settings
+from pcs.lib.connection_pool import ConnectError
+from pcs.lib.tools import read_cache_file, write_cache_file
+
+
+_reachability = {"enabled": False, "skip_offline": False}
+_lock = threading.Lock()
+
+def enable(skip_offline=False):
+    """
+    Start recording connection failures
+
+    bool skip_offline do not send requests to nodes known to be offline
+    """
+    _reachability["enabled"] = True
+    _reachability["skip_offline"] = skip_offline
+
+def is_skip_offline():
+    return _reachability["enabled"] and _reachability["skip_offline"]
+
+def get_offline_reason(host):
+    """
+    Return why the host was unreachable recently, None if it was not
+    """
+    if not _reachability["enabled"]:
+        return None
+    with _lock:
+        failure = _load().get(host)
+    if (
+        not isinstance(failure, dict)
+        or
+        time.time() - failure.get("time", 0)
+            > settings.node_offline_cache_period
+    ):
+        return None
+    return failure.get("reason", "")
+
+def probe(host, port=2224):
+    """
+    Try to connect to a host with a short timeout, return an error or None
+    """
+    try:
+        connection = socket.create_connection(
+            (host, port), settings.node_offline_probe_timeout
+        )
+        connection.close()
+    except socket.error as e:
+        return str(e) or "Connection error"
+    return None
+
+def is_unreachable_error(error):
+    """
+    Tell if an error means pcs has been unable to connect to a host at all
+
+    Only such errors are worth recording. A host which has been connected to
+    and then failed to respond properly (e.g. it is slow) is not offline.
+    """
+    return isinstance(error, ConnectError)
+
+def record_failure(host, reason):
+    if not _reachability["enabled"]:
+        return
+    with _lock:
+        offline = _load(reload=True)
+        offline[host] = {
+            "time": time.time(),
+            # urllib provides exceptions as reasons
+            "reason": "{0}".format(reason),
+        }
+        _save(offline)
+
+def record_success(host):
+    if not _reachability["enabled"]:
+        return
+    with _lock:
+        if host not in _load():
+            return
+        offline = _load(reload=True)
+        if offline.pop(host, None) is not None:
+            _save(offline)
+
+# loaded on the first request, reloaded before each change so records written
+# by other processes are not lost
+_offline_cache = {"offline": None}
+
+def _load(reload=False):
+    if _offline_cache["offline"] is None or reload:
+        offline = read_cache_file(settings.node_reachability_cache_file)
+        _offline_cache["offline"] = offline if isinstance(offline, dict) else {}
+    return _offline_cache["offline"]
+
+def _save(offline):
+    period = settings.node_offline_cache_period
+    now = time.time()
+    for host in list(offline.keys()):
+        failure = offline[host]
+        if (
+            not isinstance(failure, dict)
+            or
+            now - failure.get("time", 0) > period
+        ):
+            del offline[host]
+    _offline_cache["offline"] = offline
+    write_cache_file(settings.node_reachability_cache_file, offline)
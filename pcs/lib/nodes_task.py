@@ -8,70 +8,110 @@ from __future__ import (
 import json
 
 from pcs.common import report_codes
-from pcs.common.tools import run_parallel as tools_run_parallel
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError, ReportItemSeverity
 from pcs.lib.external import (
+    ASYNC_SUPPORTED,
     NodeCommunicator,
     NodeCommunicationException,
+    NodeUnsupportedCommandException,
     node_communicator_exception_to_report_item,
     parallel_nodes_communication_helper,
+    run_node_tasks,
 )
 from pcs.lib.corosync import (
     live as corosync_live,
     qdevice_client,
 )
+if ASYNC_SUPPORTED:
+    from pcs.lib import node_communicator_async
 
 
 def distribute_corosync_conf(
     node_communicator, reporter, node_addr_list, config_text,
-    skip_offline_nodes=False
+    skip_offline_nodes=False, skip_unchanged_nodes=False
 ):
     """
-    Send corosync.conf to several cluster nodes
+    Send corosync.conf to several cluster nodes, return nodes which accepted it
     node_addr_list nodes to send config to (NodeAddressesList instance)
     config_text text of corosync.conf
     skip_offline_nodes don't raise an error if a node communication error occurs
+    skip_unchanged_nodes don't send the config to nodes which already have it
     """
+    if _runs_coroutines(node_communicator):
+        return node_communicator_async.distribute_corosync_conf(
+            node_communicator,
+            reporter,
+            node_addr_list,
+            config_text,
+            skip_offline_nodes,
+            skip_unchanged_nodes
+        )
     failure_severity = ReportItemSeverity.ERROR
     failure_forceable = report_codes.SKIP_OFFLINE_NODES
     if skip_offline_nodes:
         failure_severity = ReportItemSeverity.WARNING
         failure_forceable = None
-    report_items = []
+    def _is_unchanged(node):
+        try:
+            return (
+                corosync_live.get_corosync_conf_hash(config_text)
+                ==
+                corosync_live.get_remote_corosync_conf_hash(
+                    node_communicator, node
+                )
+            )
+        except NodeUnsupportedCommandException:
+            # pcsd on the node is too old to tell, send the config anyway
+            return False
 
     def _parallel(node):
+        # return (report items, whether the node has accepted the config)
         try:
+            if skip_unchanged_nodes and _is_unchanged(node):
+                return (
+                    [reports.corosync_config_unchanged_on_node(node.label)],
+                    False
+                )
             corosync_live.set_remote_corosync_conf(
                 node_communicator,
                 node,
                 config_text
             )
-            reporter.process(
-                reports.corosync_config_accepted_by_node(node.label)
-            )
+            return [reports.corosync_config_accepted_by_node(node.label)], True
         except NodeCommunicationException as e:
-            report_items.append(
-                node_communicator_exception_to_report_item(
-                    e,
-                    failure_severity,
-                    failure_forceable
-                )
-            )
-            report_items.append(
-                reports.corosync_config_distribution_node_error(
-                    node.label,
-                    failure_severity,
-                    failure_forceable
-                )
+            return (
+                [
+                    node_communicator_exception_to_report_item(
+                        e,
+                        failure_severity,
+                        failure_forceable
+                    ),
+                    reports.corosync_config_distribution_node_error(
+                        node.label,
+                        failure_severity,
+                        failure_forceable
+                    ),
+                ],
+                False
             )
 
     reporter.process(reports.corosync_config_distribution_started())
-    tools_run_parallel(
+    report_items, updated_list = run_node_tasks(
         _parallel,
-        [((node, ), {}) for node in node_addr_list]
+        [((node, ), {}) for node in node_addr_list],
+        failure_severity,
+        failure_forceable
     )
+    updated_node_list = [
+        node for node, updated in zip(node_addr_list, updated_list) if updated
+    ]
+    if skip_unchanged_nodes:
+        report_items.append(reports.corosync_config_distribution_summary(
+            len(updated_node_list), len(node_addr_list)
+        ))
     reporter.process_list(report_items)
+    return updated_node_list
 
 def check_corosync_offline_on_nodes(
     node_communicator, reporter, node_addr_list, skip_offline_nodes=False
@@ -86,47 +126,50 @@ def check_corosync_offline_on_nodes(
     if skip_offline_nodes:
         failure_severity = ReportItemSeverity.WARNING
         failure_forceable = None
-    report_items = []
-
     def _parallel(node):
+        # return (report items, None)
         try:
             status = node_communicator.call_node(node, "remote/status", None)
             if not json.loads(status)["corosync"]:
-                reporter.process(
-                    reports.corosync_not_running_on_node_ok(node.label)
-                )
-            else:
-                report_items.append(
-                    reports.corosync_running_on_node_fail(node.label)
+                return (
+                    [reports.corosync_not_running_on_node_ok(node.label)],
+                    None
                 )
+            return [reports.corosync_running_on_node_fail(node.label)], None
         except NodeCommunicationException as e:
-            report_items.append(
-                node_communicator_exception_to_report_item(
-                    e,
-                    failure_severity,
-                    failure_forceable
-                )
-            )
-            report_items.append(
-                reports.corosync_not_running_check_node_error(
-                    node.label,
-                    failure_severity,
-                    failure_forceable
-                )
+            return (
+                [
+                    node_communicator_exception_to_report_item(
+                        e,
+                        failure_severity,
+                        failure_forceable
+                    ),
+                    reports.corosync_not_running_check_node_error(
+                        node.label,
+                        failure_severity,
+                        failure_forceable
+                    ),
+                ],
+                None
             )
         except (ValueError, LookupError):
-            report_items.append(
-                reports.corosync_not_running_check_node_error(
-                    node.label,
-                    failure_severity,
-                    failure_forceable
-                )
+            return (
+                [
+                    reports.corosync_not_running_check_node_error(
+                        node.label,
+                        failure_severity,
+                        failure_forceable
+                    ),
+                ],
+                None
             )
 
     reporter.process(reports.corosync_not_running_check_started())
-    tools_run_parallel(
+    report_items, dummy_value_list = run_node_tasks(
         _parallel,
-        [((node, ), {}) for node in node_addr_list]
+        [((node, ), {}) for node in node_addr_list],
+        failure_severity,
+        failure_forceable
     )
     reporter.process_list(report_items)
 
@@ -165,6 +208,11 @@ def qdevice_reload_on_nodes(
         report_items.extend(e.args)
     reporter.process_list(report_items)
 
+def _runs_coroutines(node_communicator):
+    return ASYNC_SUPPORTED and isinstance(
+        node_communicator, node_communicator_async.AsyncNodeCommunicator
+    )
+
 def node_check_auth(communicator, node):
     """
     Check authentication and online status of 'node'.
@@ -5,7 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
+import io
 import os.path
+import tempfile
 from lxml import etree
 
 from pcs import settings
@@ -58,6 +60,46 @@ def get_cib_xml(runner, scope=None):
             )
     return stdout
 
+def get_cib_configuration_xml(runner):
+    """
+    Return the CIB without its status section
+
+    The status section, which may be several times bigger than the
+    configuration on big clusters, is dropped while the CIB is being parsed so
+    it is never held in memory as a whole. The CIB is loaded by one query so
+    the configuration and the cib element attributes are consistent.
+    CommandRunner runner
+    """
+    cib_xml = get_cib_xml(runner)
+    try:
+        cib = _parse_cib_dropping_status(cib_xml)
+    except etree.XMLSyntaxError:
+        raise LibraryError(reports.cib_load_error_invalid_format())
+    return etree.tostring(cib).decode()
+
+def _parse_cib_dropping_status(cib_xml):
+    status = None
+    cib = None
+    for event, element in etree.iterparse(
+        io.BytesIO(cib_xml.encode("utf-8")), events=("start", "end")
+    ):
+        if event == "start":
+            if cib is None:
+                cib = element
+            elif status is None and element.getparent() is cib and (
+                element.tag == "status"
+            ):
+                status = element
+        elif element is status:
+            cib.remove(status)
+            status = None
+        elif status is not None:
+            # drop what has been parsed of the status so far
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    return cib
+
 def parse_cib_xml(xml):
     return etree.fromstring(xml)
 
@@ -87,6 +129,52 @@ def replace_cib_configuration(runner, tree):
     xml = etree.tostring(tree).decode()
     return replace_cib_configuration_xml(runner, xml)
 
+def diff_cibs_xml(runner, cib_old_xml, cib_new_xml):
+    """
+    Return xml patch which transforms cib_old_xml to cib_new_xml.
+    Return an empty string if there is no difference between the CIBs.
+
+    CommandRunner runner
+    string cib_old_xml original CIB
+    string cib_new_xml modified CIB
+    """
+    try:
+        cib_old_tmp_file = _write_tmp_file(cib_old_xml)
+        cib_new_tmp_file = _write_tmp_file(cib_new_xml)
+    except EnvironmentError as e:
+        raise LibraryError(reports.cib_save_tmp_error(str(e)))
+    stdout, stderr, retval = runner.run([
+        __exec("crm_diff"),
+        "--original", cib_old_tmp_file.name,
+        "--new", cib_new_tmp_file.name,
+        "--no-version",
+    ])
+    cib_old_tmp_file.close()
+    cib_new_tmp_file.close()
+    # 0 - success with no difference, 1 - success with difference or an error
+    if retval not in (0, 1) or (retval == 1 and not stdout.strip()):
+        raise LibraryError(
+            reports.cib_diff_error(join_multilines([stderr, stdout]))
+        )
+    return stdout.strip()
+
+def push_cib_diff_xml(runner, cib_diff_xml):
+    cmd = [
+        __exec("cibadmin"),
+        "--patch",
+        "--verbose",
+        "--xml-pipe",
+    ]
+    stdout, stderr, retval = runner.run(cmd, stdin_string=cib_diff_xml)
+    if retval != 0:
+        raise LibraryError(reports.cib_push_error(stderr, stdout))
+
+def _write_tmp_file(data):
+    tmp_file = tempfile.NamedTemporaryFile("w+", suffix=".pcs")
+    tmp_file.write(data)
+    tmp_file.flush()
+    return tmp_file
+
 def ensure_cib_version(runner, cib, version):
     """
     This method ensures that specified cib is verified by pacemaker with
@@ -214,19 +302,19 @@ def get_local_node_status(runner):
     except CrmMonErrorException:
         return {"offline": True}
     node_name = get_local_node_name(runner)
-    for node_status in cluster_status.node_section.nodes:
-        if node_status.attrs.name == node_name:
-            result = {
-                "offline": False,
-            }
-            for attr in (
-                'id', 'name', 'type', 'online', 'standby', 'standby_onfail',
-                'maintenance', 'pending', 'unclean', 'shutdown', 'expected_up',
-                'is_dc', 'resources_running',
-            ):
-                result[attr] = getattr(node_status.attrs, attr)
-            return result
-    raise LibraryError(reports.node_not_found(node_name))
+    node_status = cluster_status.get_node(node_name)
+    if node_status is None:
+        raise LibraryError(reports.node_not_found(node_name))
+    result = {
+        "offline": False,
+    }
+    for attr in (
+        'id', 'name', 'type', 'online', 'standby', 'standby_onfail',
+        'maintenance', 'pending', 'unclean', 'shutdown', 'expected_up',
+        'is_dc', 'resources_running',
+    ):
+        result[attr] = getattr(node_status.attrs, attr)
+    return result
 
 ### resources
 
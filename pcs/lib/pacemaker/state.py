@@ -10,14 +10,13 @@ from __future__ import (
     unicode_literals,
 )
 
-import os.path
-
 from lxml import etree
 
 from pcs import settings
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import is_true
+from pcs.lib.tools import get_file_stat_key
 
 class _Attrs(object):
     def __init__(self, owner_name, attrib, required_attrs):
@@ -55,18 +54,26 @@ class _Children(object):
         self.dom_part = dom_part
         self.children = children
         self.sections = sections
+        # the state does not change, children are wrapped on the first access
+        self.materialized = {}
 
     def __getattr__(self, name):
         if name in self.children.keys():
-            element_name, wrapper = self.children[name]
-            return [
-                wrapper(element)
-                for element in self.dom_part.findall('.//' + element_name)
-            ]
+            if name not in self.materialized:
+                element_name, wrapper = self.children[name]
+                self.materialized[name] = [
+                    wrapper(element)
+                    for element in self.dom_part.findall('.//' + element_name)
+                ]
+            return list(self.materialized[name])
 
         if name in self.sections.keys():
-            element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall('.//' + element_name)[0])
+            if name not in self.materialized:
+                element_name, wrapper = self.sections[name]
+                self.materialized[name] = wrapper(
+                    self.dom_part.findall('.//' + element_name)[0]
+                )
+            return self.materialized[name]
 
         raise AttributeError(
             "'{0}' does not declare child or section '{1}'"
@@ -133,21 +140,127 @@ class _NodeSection(_Element):
         'nodes': ('node', _Node),
     }
 
-def _get_valid_cluster_state_dom(xml):
+class ResourceState(object):
+    """
+    State of a primitive resource or of one instance of a cloned primitive
+    """
+    __slots__ = (
+        "id", "resource_agent", "role", "active", "managed", "failed",
+        "node_names", "group_id", "clone_id",
+    )
+
+    def __init__(self, element, group_id=None, clone_id=None):
+        """
+        etree element -- resource element of crm_mon xml
+        string group_id -- id of the group the resource is in, if any
+        string clone_id -- id of the clone or bundle the resource is in, if any
+        """
+        self.id = element.get("id")
+        self.resource_agent = element.get("resource_agent")
+        self.role = element.get("role")
+        self.active = is_true(element.get("active", "false"))
+        self.managed = is_true(element.get("managed", "true"))
+        self.failed = is_true(element.get("failed", "false"))
+        self.node_names = [node.get("name") for node in element.iter("node")]
+        self.group_id = group_id
+        self.clone_id = clone_id
+
+_crm_mon_schema_cache = {"source": None, "schema": None}
+
+def _get_crm_mon_schema():
+    """
+    Return the compiled crm_mon schema, None if the schema is not available
+    """
+    stat_key = get_file_stat_key(settings.crm_mon_schema)
+    if stat_key is None:
+        return None
+    source = [settings.crm_mon_schema] + stat_key
+    if _crm_mon_schema_cache["source"] != source:
+        _crm_mon_schema_cache["schema"] = etree.RelaxNG(
+            file=settings.crm_mon_schema
+        )
+        _crm_mon_schema_cache["source"] = source
+    return _crm_mon_schema_cache["schema"]
+
+def _get_valid_cluster_state_dom(xml, validate=True):
     try:
         dom = etree.fromstring(xml)
-        if os.path.isfile(settings.crm_mon_schema):
-            etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+        schema = _get_crm_mon_schema() if validate else None
+        if schema is not None:
+            schema.assertValid(dom)
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(reports.cluster_state_invalid_format())
 
+def _get_base_id(resource_id):
+    # clone instances are identified as resource_id:instance_number
+    return resource_id.rsplit(":", 1)[0]
+
 class ClusterState(_Element):
     sections = {
         'summary': ('summary', _SummarySection),
         'node_section': ('nodes', _NodeSection),
     }
 
-    def __init__(self, xml):
-        self.dom = _get_valid_cluster_state_dom(xml)
+    def __init__(self, xml, validate=True):
+        """
+        string xml -- crm_mon xml
+        bool validate -- check the xml against the crm_mon schema, set to False
+            for xml coming directly from crm_mon
+        """
+        self.dom = _get_valid_cluster_state_dom(xml, validate)
         super(ClusterState, self).__init__(self.dom)
+        self._node_index = None
+        self._resource_index = None
+
+    def get_node(self, name):
+        """
+        Return the state of a node specified by its name, None if not found
+        """
+        if self._node_index is None:
+            self._node_index = dict([
+                (node.attrs.name, node) for node in self.node_section.nodes
+            ])
+        return self._node_index.get(name)
+
+    def get_resource_states(self, resource_id):
+        """
+        Return states of primitives a resource consists of
+
+        string resource_id -- id of a primitive, a clone instance of a primitive
+            (id:N), a group, a group instance or a clone
+        """
+        if self._resource_index is None:
+            self._resource_index = self._build_resource_index()
+        return [
+            ResourceState(element, group_id, clone_id)
+            for element, group_id, clone_id
+                in self._resource_index.get(resource_id, [])
+        ]
+
+    def _build_resource_index(self):
+        # only elements are indexed, records are created for the queried ones
+        index = {}
+        resources_el = self.dom.find("resources")
+        if resources_el is None:
+            return index
+        for element in resources_el.iter("resource"):
+            group_id = None
+            clone_id = None
+            parent = element.getparent()
+            while parent is not resources_el:
+                if parent.tag == "group":
+                    group_id = parent.get("id")
+                elif parent.tag in ("clone", "bundle"):
+                    clone_id = parent.get("id")
+                parent = parent.getparent()
+            entry = (element, group_id, clone_id)
+            primitive_id = element.get("id")
+            id_set = set([primitive_id, _get_base_id(primitive_id)])
+            if group_id:
+                id_set.update([group_id, _get_base_id(group_id)])
+            if clone_id:
+                id_set.add(clone_id)
+            for resource_id in id_set:
+                index.setdefault(resource_id, []).append(entry)
+        return index
@@ -202,6 +202,106 @@ class GetCibXmlTest(LibraryPacemakerTest):
             ]
         )
 
+class GetCibConfigurationXmlTest(LibraryPacemakerTest):
+    def assert_configuration_xml(self, expected_xml, cib_xml):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = (cib_xml, "", 0)
+
+        assert_xml_equal(
+            expected_xml, lib.get_cib_configuration_xml(mock_runner)
+        )
+
+        mock_runner.run.assert_called_once_with(
+            [self.path("cibadmin"), "--local", "--query"]
+        )
+
+    def test_success(self):
+        self.assert_configuration_xml(
+            """
+            <cib epoch="2" validate-with="pacemaker-2.5">
+                <configuration><resources/></configuration>
+            </cib>
+            """,
+            """
+            <cib epoch="2" validate-with="pacemaker-2.5">
+                <configuration><resources/></configuration>
+                <status>
+                    <node_state id="1"><lrm><lrm_resources/></lrm></node_state>
+                    <node_state id="2"><lrm><lrm_resources/></lrm></node_state>
+                </status>
+            </cib>
+            """
+        )
+
+    def test_empty_status(self):
+        self.assert_configuration_xml(
+            '<cib><configuration><resources/></configuration></cib>',
+            '<cib><configuration><resources/></configuration><status/></cib>'
+        )
+
+    def test_status_in_comment_and_cdata(self):
+        self.assert_configuration_xml(
+            """
+            <cib>
+                <configuration>
+                    <!-- <status></status> -->
+                    <resources><primitive id="A">
+                        <meta_attributes id="A-meta">
+                            <nvpair id="A-n" name="n" value="&lt;status/&gt;"/>
+                        </meta_attributes>
+                    </primitive></resources>
+                </configuration>
+            </cib>
+            """,
+            """
+            <cib>
+                <configuration>
+                    <!-- <status></status> -->
+                    <resources><primitive id="A">
+                        <meta_attributes id="A-meta">
+                            <nvpair id="A-n" name="n" value="&lt;status/&gt;"/>
+                        </meta_attributes>
+                    </primitive></resources>
+                </configuration>
+                <status><![CDATA[</status>]]></status>
+            </cib>
+            """
+        )
+
+    def test_no_status(self):
+        self.assert_configuration_xml(
+            '<cib><configuration><resources/></configuration></cib>',
+            '<cib><configuration><resources/></configuration></cib>'
+        )
+
+    def test_error(self):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = ("some output", "some error", 1)
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_configuration_xml(mock_runner),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR,
+                {
+                    "reason": "some error\nsome output",
+                }
+            )
+        )
+
+    def test_invalid_xml(self):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = ("<cib><configuration>", "", 0)
+
+        assert_raise_library_error(
+            lambda: lib.get_cib_configuration_xml(mock_runner),
+            (
+                Severity.ERROR,
+                report_codes.CIB_LOAD_ERROR_BAD_FORMAT,
+                {}
+            )
+        )
+
 class GetCibTest(LibraryPacemakerTest):
     def test_success(self):
         xml = "<xml />"
@@ -281,6 +381,81 @@ class ReplaceCibConfigurationTest(LibraryPacemakerTest):
             stdin_string=xml
         )
 
+class DiffCibsXmlTest(LibraryPacemakerTest):
+    def fixture_runner(self, stdout, stderr, retval):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = (stdout, stderr, retval)
+        return mock_runner
+
+    def assert_crm_diff_called(self, mock_runner):
+        args = mock_runner.run.call_args[0][0]
+        self.assertEqual(self.path("crm_diff"), args[0])
+        self.assertEqual(
+            ["--original", "--new", "--no-version"],
+            [arg for arg in args if arg.startswith("--")]
+        )
+
+    def test_no_difference(self):
+        mock_runner = self.fixture_runner("", "", 0)
+        self.assertEqual(
+            "",
+            lib.diff_cibs_xml(mock_runner, "<cib/>", "<cib/>")
+        )
+        self.assert_crm_diff_called(mock_runner)
+
+    def test_difference(self):
+        mock_runner = self.fixture_runner("<diff/>\n", "", 1)
+        self.assertEqual(
+            "<diff/>",
+            lib.diff_cibs_xml(mock_runner, "<cib/>", "<cib><a/></cib>")
+        )
+        self.assert_crm_diff_called(mock_runner)
+
+    def test_error(self):
+        mock_runner = self.fixture_runner("", "some error", 1)
+        assert_raise_library_error(
+            lambda: lib.diff_cibs_xml(mock_runner, "<cib/>", "<cib/>"),
+            (
+                Severity.ERROR,
+                report_codes.CIB_DIFF_ERROR,
+                {
+                    "reason": "some error",
+                }
+            )
+        )
+
+class PushCibDiffXmlTest(LibraryPacemakerTest):
+    def test_success(self):
+        xml = "<xml/>"
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = ("", "", 0)
+
+        lib.push_cib_diff_xml(mock_runner, xml)
+
+        mock_runner.run.assert_called_once_with(
+            [
+                self.path("cibadmin"), "--patch", "--verbose", "--xml-pipe"
+            ],
+            stdin_string=xml
+        )
+
+    def test_error(self):
+        xml = "<xml/>"
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.return_value = ("expected output", "expected stderr", 1)
+
+        assert_raise_library_error(
+            lambda: lib.push_cib_diff_xml(mock_runner, xml),
+            (
+                Severity.ERROR,
+                report_codes.CIB_PUSH_ERROR,
+                {
+                    "reason": "expected stderr",
+                    "pushed_cib": "expected output",
+                }
+            )
+        )
+
 class UpgradeCibTest(TestCase):
     def setUp(self):
         self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
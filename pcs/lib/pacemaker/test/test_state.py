@@ -5,13 +5,14 @@ from __future__ import (
     unicode_literals,
 )
 
-from pcs.test.tools.pcs_unittest import TestCase
+from pcs.test.tools.pcs_unittest import TestCase, mock
 from lxml import etree
 
 from pcs.test.tools.assertions import assert_raise_library_error
 from pcs.test.tools.misc import get_test_resource as rc
 from pcs.test.tools.xml import get_xml_manipulation_creator_from_file
 
+from pcs.lib.pacemaker import state as state_module
 from pcs.lib.pacemaker.state import (
     ClusterState,
     _Attrs,
@@ -61,6 +62,13 @@ class ChildrenTest(TestCase):
         children = _Children('test', self.dom, {'anys': ('any', self.wrap)}, {})
         self.assertEqual(['any.1', 'any.2'], children.anys)
 
+    def test_children_wrapped_once(self):
+        wrap = mock.Mock(side_effect=self.wrap)
+        children = _Children('test', self.dom, {'anys': ('any', wrap)}, {})
+        children.anys.append('changed by a caller')
+        self.assertEqual(['any.1', 'any.2'], children.anys)
+        self.assertEqual(2, wrap.call_count)
+
     def test_raises_on_undeclared_children(self):
         children = _Children('test', self.dom, {}, {})
         self.assertRaises(AttributeError, lambda: children.some_section)
@@ -143,6 +151,16 @@ class WorkWithClusterStatusNodesTest(TestBase):
             ]
         )
 
+    def test_get_node(self):
+        self.covered_status.append_to_first_tag_name(
+            'nodes',
+            self.fixture_node_string(name='node1', id='1'),
+            self.fixture_node_string(name='node2', id='2'),
+        )
+        state = ClusterState(str(self.covered_status))
+        self.assertEqual('2', state.get_node('node2').attrs.id)
+        self.assertEqual(None, state.get_node('node3'))
+
 
 class WorkWithClusterStatusSummaryTest(TestBase):
     def test_nodes_count(self):
@@ -152,3 +170,136 @@ class WorkWithClusterStatusSummaryTest(TestBase):
     def test_resources_count(self):
         xml = str(self.covered_status)
         self.assertEqual(0, ClusterState(xml).summary.resources.attrs.count)
+
+
+class ClusterStateIndexTest(TestBase):
+    def fixture_resources(self):
+        self.covered_status.tree.append(etree.fromstring(
+            '''<resources>
+                <resource id="R1" resource_agent="ocf::heartbeat:Dummy"
+                    role="Started" active="true" managed="true" failed="false"
+                >
+                    <node name="node1" id="1" cached="false"/>
+                </resource>
+                <group id="G1" number_resources="1">
+                    <resource id="R2" role="Stopped" active="false"/>
+                </group>
+                <clone id="C1" multi_state="true">
+                    <resource id="R3:0" role="Master" managed="false">
+                        <node name="node1" id="1" cached="false"/>
+                    </resource>
+                    <resource id="R3:1" role="Slave" failed="true">
+                        <node name="node2" id="2" cached="false"/>
+                    </resource>
+                </clone>
+                <clone id="C2">
+                    <group id="G2:0" number_resources="1">
+                        <resource id="R4" role="Started">
+                            <node name="node1" id="1" cached="false"/>
+                        </resource>
+                    </group>
+                    <group id="G2:1" number_resources="1">
+                        <resource id="R4" role="Started">
+                            <node name="node2" id="2" cached="false"/>
+                        </resource>
+                    </group>
+                </clone>
+            </resources>'''
+        ))
+        return ClusterState(str(self.covered_status))
+
+    def assert_states(self, expected, state_list):
+        self.assertEqual(
+            expected,
+            [
+                (state.id, state.role, state.node_names)
+                for state in state_list
+            ]
+        )
+
+    def test_primitive(self):
+        state_list = self.fixture_resources().get_resource_states("R1")
+        self.assert_states([("R1", "Started", ["node1"])], state_list)
+        resource_state = state_list[0]
+        self.assertEqual(
+            "ocf::heartbeat:Dummy", resource_state.resource_agent
+        )
+        self.assertTrue(resource_state.active)
+        self.assertTrue(resource_state.managed)
+        self.assertFalse(resource_state.failed)
+        self.assertEqual(None, resource_state.group_id)
+        self.assertEqual(None, resource_state.clone_id)
+
+    def test_group(self):
+        state = self.fixture_resources()
+        self.assert_states(
+            [("R2", "Stopped", [])], state.get_resource_states("G1")
+        )
+        self.assertEqual("G1", state.get_resource_states("R2")[0].group_id)
+
+    def test_clone_instances(self):
+        state = self.fixture_resources()
+        expected = [
+            ("R3:0", "Master", ["node1"]),
+            ("R3:1", "Slave", ["node2"]),
+        ]
+        self.assert_states(expected, state.get_resource_states("R3"))
+        self.assert_states(expected, state.get_resource_states("C1"))
+        self.assert_states(expected[1:], state.get_resource_states("R3:1"))
+        resource_state = state.get_resource_states("R3:0")[0]
+        self.assertFalse(resource_state.managed)
+        self.assertEqual("C1", resource_state.clone_id)
+        self.assertTrue(state.get_resource_states("R3:1")[0].failed)
+
+    def test_cloned_group(self):
+        state = self.fixture_resources()
+        expected = [
+            ("R4", "Started", ["node1"]),
+            ("R4", "Started", ["node2"]),
+        ]
+        self.assert_states(expected, state.get_resource_states("R4"))
+        self.assert_states(expected, state.get_resource_states("G2"))
+        self.assert_states(expected, state.get_resource_states("C2"))
+        self.assert_states(expected[:1], state.get_resource_states("G2:0"))
+
+    def test_missing_resource(self):
+        self.assertEqual([], self.fixture_resources().get_resource_states("X"))
+        self.assertEqual(
+            [],
+            ClusterState(
+                str(self.create_covered_status())
+            ).get_resource_states("R1")
+        )
+
+
+class ClusterStateValidationTest(TestBase):
+    def setUp(self):
+        super(ClusterStateValidationTest, self).setUp()
+        patcher = mock.patch.dict(
+            state_module._crm_mon_schema_cache,
+            {"source": None, "schema": None}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("pcs.lib.pacemaker.state.get_file_stat_key")
+    @mock.patch("pcs.lib.pacemaker.state.etree.RelaxNG")
+    def test_schema_compiled_once(self, mock_relaxng, mock_stat_key):
+        mock_stat_key.return_value = [1, 2, 3]
+        schema = mock.Mock(spec_set=["assertValid"])
+        mock_relaxng.return_value = schema
+        ClusterState(str(self.covered_status))
+        ClusterState(str(self.covered_status))
+        self.assertEqual(1, mock_relaxng.call_count)
+        self.assertEqual(2, schema.assertValid.call_count)
+
+        mock_stat_key.return_value = [1, 2, 4]
+        ClusterState(str(self.covered_status))
+        self.assertEqual(2, mock_relaxng.call_count)
+
+    @mock.patch("pcs.lib.pacemaker.state.get_file_stat_key")
+    @mock.patch("pcs.lib.pacemaker.state.etree.RelaxNG")
+    def test_skip_validation(self, mock_relaxng, mock_stat_key):
+        mock_stat_key.return_value = [1, 2, 3]
+        ClusterState(str(self.covered_status), validate=False)
+        mock_relaxng.assert_not_called()
@@ -425,6 +425,42 @@ def node_communication_error_unable_to_connect(
         forceable=forceable
     )
 
+def node_communication_error_skipped_offline(
+    node, command, reason,
+    severity=ReportItemSeverity.ERROR, forceable=None
+):
+    """
+    a node has not been called as pcs was unable to connect to it recently
+    node string node address / name
+    reason string decription of the recent connection error
+    """
+    return ReportItem(
+        report_codes.NODE_COMMUNICATION_ERROR_SKIPPED_OFFLINE,
+        severity,
+        info={
+            "node": node,
+            "command": command,
+            "reason": reason,
+        },
+        forceable=forceable
+    )
+
+def node_communication_error_timed_out(
+    node, severity=ReportItemSeverity.ERROR, forceable=None
+):
+    """
+    a call to a node has not finished in time, its result is unknown
+    node string node address / name
+    """
+    return ReportItem(
+        report_codes.NODE_COMMUNICATION_ERROR_TIMED_OUT,
+        severity,
+        info={
+            "node": node,
+        },
+        forceable=forceable
+    )
+
 def corosync_config_distribution_started():
     """
     corosync configuration is about to be sent to nodes
@@ -458,6 +494,30 @@ def corosync_config_distribution_node_error(
         forceable=forceable
     )
 
+def corosync_config_unchanged_on_node(node):
+    """
+    corosync configuration has not been sent to a node which already has it
+    node string node address / name
+    """
+    return ReportItem.info(
+        report_codes.COROSYNC_CONFIG_UNCHANGED_ON_NODE,
+        info={"node": node}
+    )
+
+def corosync_config_distribution_summary(updated_node_count, node_count):
+    """
+    corosync configuration has been distributed to nodes
+    updated_node_count number of nodes which accepted the configuration
+    node_count number of nodes the configuration has been distributed to
+    """
+    return ReportItem.info(
+        report_codes.COROSYNC_CONFIG_DISTRIBUTION_SUMMARY,
+        info={
+            "updated_node_count": updated_node_count,
+            "node_count": node_count,
+        }
+    )
+
 def corosync_not_running_check_started():
     """
     we are about to make sure corosync is not running on nodes
@@ -923,6 +983,18 @@ def cib_push_error(reason, pushed_cib):
         }
     )
 
+def cib_diff_error(reason):
+    """
+    cannot obtain a diff of CIBs, crm_diff failed
+    string reason error description
+    """
+    return ReportItem.error(
+        report_codes.CIB_DIFF_ERROR,
+        info={
+            "reason": reason,
+        }
+    )
+
 def cib_save_tmp_error(reason):
     """
     cannot save CIB into a temporary file
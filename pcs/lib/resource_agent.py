@@ -5,19 +5,40 @@ from __future__ import (
     unicode_literals,
 )
 
+import hashlib
 import os
 import re
+import threading
 from lxml import etree
 
 from pcs import settings
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError, ReportItemSeverity
+from pcs.common.tools import iterate_parallel
 from pcs.lib.pacemaker.values import is_true
+from pcs.lib.tools import (
+    get_file_stat_key,
+    read_cache_file,
+    write_cache_file,
+)
 from pcs.common import report_codes
 
 
 _crm_resource = os.path.join(settings.pacemaker_binaries, "crm_resource")
 
+# Agents' metadata and names are cached on disk only if the caller allows it,
+# library users (e.g. tests) may not expect the cache to be there.
+_disk_cache = {"enabled": False}
+# index of agents' names loaded from the disk, see _get_agent_index
+_agent_index = {"index": None}
+_agent_index_lock = threading.Lock()
+
+def enable_disk_cache(enabled=True):
+    """
+    Allow or forbid caching agents' metadata and names on disk
+    """
+    _disk_cache["enabled"] = enabled
+
 
 class ResourceAgentError(Exception):
     # pylint: disable=super-init-not-called
@@ -38,15 +59,10 @@ def list_resource_agents_standards(runner):
     Return list of resource agents standards (ocf, lsb, ... ) on the local host
     CommandRunner runner
     """
-    # retval is number of standards found
-    stdout, dummy_stderr, dummy_retval = runner.run([
-        _crm_resource, "--list-standards"
-    ])
-    ignored_standards = frozenset([
-        # we are only interested in RESOURCE agents
-        "stonith",
-    ])
-    return _prepare_agent_list(stdout, ignored_standards)
+    index = _get_agent_index(runner)
+    if index is not None:
+        return list(index["standards"])
+    return _run_list_standards(runner)
 
 
 def list_resource_agents_ocf_providers(runner):
@@ -54,11 +70,10 @@ def list_resource_agents_ocf_providers(runner):
     Return list of resource agents ocf providers on the local host
     CommandRunner runner
     """
-    # retval is number of providers found
-    stdout, dummy_stderr, dummy_retval = runner.run([
-        _crm_resource, "--list-ocf-providers"
-    ])
-    return _prepare_agent_list(stdout)
+    index = _get_agent_index(runner)
+    if index is not None:
+        return list(index["ocf_providers"])
+    return _run_list_ocf_providers(runner)
 
 
 def list_resource_agents_standards_and_providers(runner):
@@ -92,13 +107,10 @@ def list_resource_agents(runner, standard_provider):
     CommandRunner runner
     string standard_provider standard[:provider], e.g. lsb, ocf, ocf:pacemaker
     """
-    # retval is 0 on success, anything else when no agents found
-    stdout, dummy_stderr, retval = runner.run([
-        _crm_resource, "--list-agents", standard_provider
-    ])
-    if retval != 0:
-        return []
-    return _prepare_agent_list(stdout)
+    index = _get_agent_index(runner)
+    if index is not None and standard_provider in index["agents"]:
+        return list(index["agents"][standard_provider])
+    return _run_list_agents(runner, standard_provider)
 
 
 def list_stonith_agents(runner):
@@ -106,12 +118,6 @@ def list_stonith_agents(runner):
     Return list of fence agents on the local host
     CommandRunner runner
     """
-    # retval is 0 on success, anything else when no agents found
-    stdout, dummy_stderr, retval = runner.run([
-        _crm_resource, "--list-agents", "stonith"
-    ])
-    if retval != 0:
-        return []
     ignored_agents = frozenset([
         "fence_ack_manual",
         "fence_check",
@@ -126,7 +132,121 @@ def list_stonith_agents(runner):
         "fence_virtd",
         "fence_vmware_helper",
     ])
-    return _prepare_agent_list(stdout, ignored_agents)
+    return [
+        name for name in list_resource_agents(runner, "stonith")
+        if name not in ignored_agents
+    ]
+
+
+def _run_list_standards(runner):
+    # retval is number of standards found
+    stdout, dummy_stderr, dummy_retval = runner.run([
+        _crm_resource, "--list-standards"
+    ])
+    ignored_standards = frozenset([
+        # we are only interested in RESOURCE agents
+        "stonith",
+    ])
+    return _prepare_agent_list(stdout, ignored_standards)
+
+
+def _run_list_ocf_providers(runner):
+    # retval is number of providers found
+    stdout, dummy_stderr, dummy_retval = runner.run([
+        _crm_resource, "--list-ocf-providers"
+    ])
+    return _prepare_agent_list(stdout)
+
+
+def _run_list_agents(runner, standard_provider):
+    # retval is 0 on success, anything else when no agents found
+    stdout, dummy_stderr, retval = runner.run([
+        _crm_resource, "--list-agents", standard_provider
+    ])
+    if retval != 0:
+        return []
+    return _prepare_agent_list(stdout)
+
+
+def _get_agent_index(runner):
+    """
+    Return the index of agents' names on the local host, None if not allowed
+
+    The index is cached on disk and it is rebuilt once an agent has been added
+    to or removed from the directories agents are stored in. It holds:
+        standards -- list of standards as list_resource_agents_standards
+            returns it
+        ocf_providers -- list of ocf providers
+        agents -- dict standard[:provider] -> list of agents' names
+    """
+    if not _disk_cache["enabled"]:
+        return None
+    key = [
+        [path, get_file_stat_key(path)]
+        for path in _get_agent_index_key_files()
+    ]
+    with _agent_index_lock:
+        index = _agent_index["index"]
+        if index is None:
+            index = read_cache_file(settings.agent_index_cache_file)
+        if (
+            not isinstance(index, dict)
+            or
+            index.get("key") != key
+            or
+            not all(
+                field in index
+                for field in ("standards", "ocf_providers", "agents")
+            )
+        ):
+            index = _build_agent_index(runner, key)
+            write_cache_file(settings.agent_index_cache_file, index)
+        _agent_index["index"] = index
+    return index
+
+
+def _get_agent_index_key_files():
+    # adding or removing a file changes mtime of the directory
+    ocf_dir = os.path.join(settings.ocf_root, "resource.d")
+    try:
+        ocf_providers = sorted(os.listdir(ocf_dir))
+    except OSError:
+        ocf_providers = []
+    return (
+        [_crm_resource, ocf_dir]
+        +
+        [os.path.join(ocf_dir, provider) for provider in ocf_providers]
+        +
+        [settings.lsb_agents_dir, settings.fence_agent_binaries]
+        +
+        settings.other_agents_dirs
+    )
+
+
+def _build_agent_index(runner, key):
+    standards, ocf_providers = iterate_parallel(
+        lambda list_function: list_function(runner),
+        [((_run_list_standards,), {}), ((_run_list_ocf_providers,), {})],
+        2
+    )
+    standard_list = (
+        standards
+        +
+        ["ocf:{0}".format(provider) for provider in ocf_providers]
+        +
+        ["stonith"]
+    )
+    agent_lists = iterate_parallel(
+        _run_list_agents,
+        [((runner, std), {}) for std in standard_list],
+        settings.agent_metadata_workers
+    )
+    return {
+        "key": key,
+        "standards": standards,
+        "ocf_providers": ocf_providers,
+        "agents": dict(zip(standard_list, agent_lists)),
+    }
 
 
 def _prepare_agent_list(agents_string, filter_list=None):
@@ -374,10 +494,42 @@ class Agent(object):
             or parse its metadata
         """
         if self._metadata is None:
-            self._metadata = self._parse_metadata(self._load_metadata())
+            self._metadata = self._parse_metadata(self._load_cached_metadata())
         return self._metadata
 
 
+    def _load_cached_metadata(self):
+        """
+        Return metadata from the on-disk cache, load and cache them if needed
+        """
+        key_files = self._get_metadata_key_files()
+        if not key_files or not _disk_cache["enabled"]:
+            return self._load_metadata()
+        key = [[path, get_file_stat_key(path)] for path in key_files]
+        if any(file_key is None for dummy_path, file_key in key):
+            return self._load_metadata()
+        name = self._get_metadata_cache_name()
+        metadata = _read_metadata_cache(name, key)
+        if metadata is None:
+            metadata = self._load_metadata()
+            _write_metadata_cache(name, key, metadata)
+        return metadata
+
+
+    def _get_metadata_cache_name(self):
+        return self.get_name()
+
+
+    def _get_metadata_key_files(self):
+        """
+        Return files metadata are generated from, None if they are not known
+
+        Cached metadata are valid as long as none of the files has changed.
+        Metadata are not cached if None is returned.
+        """
+        return None
+
+
     def _load_metadata(self):
         raise NotImplementedError()
 
@@ -432,6 +584,12 @@ class StonithdMetadata(FakeAgentMetadata):
         return parameter
 
 
+    def _get_metadata_key_files(self):
+        # stonithd comes with pacemaker, so its metadata change with pacemaker
+        # version
+        return [settings.stonithd_binary]
+
+
     def _load_metadata(self):
         stdout, stderr, dummy_retval = self._runner.run(
             [settings.stonithd_binary, "metadata"]
@@ -457,6 +615,30 @@ class CrmAgent(Agent):
         return self._full_agent_name
 
 
+    def _get_metadata_cache_name(self):
+        return self._full_agent_name
+
+
+    def _get_metadata_key_files(self):
+        name_parts = self._full_agent_name.split(":")
+        if name_parts[0] == "ocf" and len(name_parts) == 3:
+            agent_file = os.path.join(
+                settings.ocf_root, "resource.d", name_parts[1], name_parts[2]
+            )
+        elif name_parts[0] == "stonith" and len(name_parts) == 2:
+            agent_file = os.path.join(
+                settings.fence_agent_binaries, name_parts[1]
+            )
+        elif name_parts[0] == "lsb" and len(name_parts) == 2:
+            agent_file = os.path.join(settings.lsb_agents_dir, name_parts[1])
+        else:
+            # metadata of other agents (systemd, nagios...) are not generated
+            # from a single file
+            return None
+        # crm_resource may amend metadata so they depend on pacemaker as well
+        return [agent_file, _crm_resource]
+
+
     def is_valid_metadata(self):
         """
         If we are able to get metadata, we consider the agent existing and valid
@@ -506,6 +688,9 @@ class ResourceAgent(CrmAgent):
         super(ResourceAgent, self).__init__(runner, full_agent_name)
 
 class AbsentResourceAgent(ResourceAgent):
+    def _get_metadata_key_files(self):
+        return None
+
     def _load_metadata(self):
         return "<resource-agent/>"
 
@@ -635,3 +820,72 @@ def resource_agent_error_to_report_item(
     if e.__class__ == InvalidResourceAgentName:
         return reports.invalid_resource_agent_name(e.agent)
     raise e
+
+
+def _get_metadata_cache_path(name):
+    return os.path.join(
+        settings.agent_metadata_cache_dir,
+        "{0}.json".format(hashlib.sha1(name.encode("utf-8")).hexdigest())
+    )
+
+def _read_metadata_cache(name, key):
+    path = _get_metadata_cache_path(name)
+    entry = read_cache_file(path)
+    if (
+        not isinstance(entry, dict)
+        or
+        entry.get("name") != name
+        or
+        entry.get("key") != key
+        or
+        "metadata" not in entry
+    ):
+        return None
+    try:
+        # mark the entry as recently used, see _evict_metadata_cache
+        os.utime(path, None)
+    except OSError:
+        pass
+    metadata = entry["metadata"]
+    # json returns unicode in python2 while the runner returns str
+    if not isinstance(metadata, str):
+        metadata = metadata.encode("utf-8")
+    return metadata
+
+def _write_metadata_cache(name, key, metadata):
+    if write_cache_file(
+        _get_metadata_cache_path(name),
+        {"name": name, "key": key, "metadata": metadata}
+    ):
+        _evict_metadata_cache(
+            settings.agent_metadata_cache_dir,
+            settings.agent_metadata_cache_max_size
+        )
+
+def _evict_metadata_cache(cache_dir, max_size):
+    """
+    Remove least recently used entries until the cache fits in max_size bytes
+    """
+    entry_list = []
+    try:
+        file_name_list = os.listdir(cache_dir)
+    except OSError:
+        return
+    for file_name in file_name_list:
+        if not file_name.endswith(".json"):
+            continue
+        path = os.path.join(cache_dir, file_name)
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            continue
+        entry_list.append((file_stat.st_mtime, file_stat.st_size, path))
+    total_size = sum(size for dummy_mtime, size, dummy_path in entry_list)
+    for dummy_mtime, size, path in sorted(entry_list):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total_size -= size
@@ -8,7 +8,6 @@ from __future__ import (
 import json
 
 from pcs import settings
-from pcs.common import tools
 from pcs.lib import (
     external,
     reports,
@@ -30,17 +29,18 @@ def _run_parallel_and_raise_lib_error_on_failure(func, param_list):
     func -- function to be run
     param_list -- list of tuples: (*args, **kwargs)
     """
-    report_list = []
-
     def _parallel(*args, **kwargs):
         try:
             func(*args, **kwargs)
         except NodeCommunicationException as e:
-            report_list.append(node_communicator_exception_to_report_item(e))
+            return [node_communicator_exception_to_report_item(e)], None
         except LibraryError as e:
-            report_list.extend(e.args)
+            return list(e.args), None
+        return [], None
 
-    tools.run_parallel(_parallel, param_list)
+    report_list, dummy_value_list = external.run_node_tasks(
+        _parallel, param_list
+    )
 
     if report_list:
         raise LibraryError(*report_list)
@@ -7,6 +7,9 @@ from __future__ import (
 
 from lxml import etree
 from functools import partial
+import os
+import shutil
+import tempfile
 
 from pcs.test.tools.assertions import (
     ExtendedAssertionsMixin,
@@ -18,6 +21,7 @@ from pcs.test.tools.misc import create_patcher
 from pcs.test.tools.pcs_unittest import TestCase, mock
 from pcs.test.tools.xml import XmlManipulation
 
+from pcs import settings
 from pcs.common import report_codes
 from pcs.lib import resource_agent as lib_ra
 from pcs.lib.errors import ReportItemSeverity as severity, LibraryError
@@ -1630,3 +1634,243 @@ class AbsentResourceAgentTest(TestCase):
         self.assertEqual(([], []), absent.validate_parameters_values({
             "whatever": "anything"
         }))
+
+
+class AgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.agent_dir = os.path.join(self.temp_dir, "agents")
+        os.makedirs(os.path.join(self.agent_dir, "resource.d", "heartbeat"))
+        self.crm_resource = os.path.join(self.temp_dir, "crm_resource")
+        self.stonithd = os.path.join(self.temp_dir, "stonithd")
+        for path in [self.crm_resource, self.stonithd]:
+            self.write_file(path, "binary")
+        patchers = [
+            mock.patch.object(settings, "agent_metadata_cache_dir",
+                self.cache_dir
+            ),
+            mock.patch.object(settings, "ocf_root", self.agent_dir),
+            mock.patch.object(settings, "fence_agent_binaries", self.agent_dir),
+            mock.patch.object(settings, "stonithd_binary", self.stonithd),
+            mock.patch.object(lib_ra, "_crm_resource", self.crm_resource),
+            mock.patch.dict(lib_ra._disk_cache, {"enabled": True}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.return_value = (
+            "<resource-agent><shortdesc>Dummy</shortdesc></resource-agent>",
+            "",
+            0
+        )
+
+    def write_file(self, path, content):
+        with open(path, "w") as a_file:
+            a_file.write(content)
+
+    def write_dummy(self, content="dummy"):
+        self.write_file(
+            os.path.join(self.agent_dir, "resource.d", "heartbeat", "Dummy"),
+            content
+        )
+
+    def get_shortdesc(self, name="ocf:heartbeat:Dummy"):
+        return lib_ra.ResourceAgent(self.runner, name).get_shortdesc()
+
+    def test_metadata_loaded_once(self):
+        self.write_dummy()
+        self.assertEqual("Dummy", self.get_shortdesc())
+        self.assertEqual("Dummy", self.get_shortdesc())
+        self.assertEqual(1, self.runner.run.call_count)
+
+    def test_reload_when_agent_changed(self):
+        self.write_dummy()
+        self.get_shortdesc()
+        self.write_dummy("new dummy")
+        self.runner.run.return_value = (
+            "<resource-agent><shortdesc>New</shortdesc></resource-agent>",
+            "",
+            0
+        )
+        self.assertEqual("New", self.get_shortdesc())
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_reload_when_pacemaker_changed(self):
+        self.write_dummy()
+        self.get_shortdesc()
+        self.write_file(self.crm_resource, "new binary")
+        self.get_shortdesc()
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_not_cached_when_disabled(self):
+        self.write_dummy()
+        lib_ra.enable_disk_cache(False)
+        self.get_shortdesc()
+        self.get_shortdesc()
+        self.assertEqual(2, self.runner.run.call_count)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_not_cached_when_agent_file_unknown(self):
+        self.get_shortdesc()
+        self.get_shortdesc("systemd:pcsd")
+        self.get_shortdesc("systemd:pcsd")
+        self.assertEqual(3, self.runner.run.call_count)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_failure_not_cached(self):
+        self.write_dummy()
+        self.runner.run.return_value = ("", "error", 1)
+        for dummy in range(2):
+            self.assertRaises(
+                lib_ra.UnableToGetAgentMetadata,
+                lambda: self.get_shortdesc()
+            )
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_broken_cache_file(self):
+        self.write_dummy()
+        os.makedirs(self.cache_dir)
+        self.write_file(
+            lib_ra._get_metadata_cache_path("ocf:heartbeat:Dummy"),
+            "[broken"
+        )
+        self.assertEqual("Dummy", self.get_shortdesc())
+        self.assertEqual("Dummy", self.get_shortdesc())
+        self.assertEqual(1, self.runner.run.call_count)
+
+    def test_stonith_agents_and_stonithd(self):
+        self.write_file(os.path.join(self.agent_dir, "fence_xvm"), "fence")
+        for dummy in range(2):
+            lib_ra.StonithAgent(self.runner, "fence_xvm").get_shortdesc()
+            lib_ra.StonithdMetadata(self.runner).get_parameters()
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_evict_least_recently_used(self):
+        os.makedirs(self.cache_dir)
+        for name, mtime in [("a", 300), ("b", 100), ("c", 200)]:
+            path = os.path.join(self.cache_dir, "{0}.json".format(name))
+            self.write_file(path, "x" * 10)
+            os.utime(path, (mtime, mtime))
+        lib_ra._evict_metadata_cache(self.cache_dir, 20)
+        self.assertEqual(
+            ["a.json", "c.json"],
+            sorted(os.listdir(self.cache_dir))
+        )
+
+
+class AgentIndexTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.temp_dir, "cache", "index.json")
+        self.ocf_dir = os.path.join(self.temp_dir, "ocf", "resource.d")
+        os.makedirs(os.path.join(self.ocf_dir, "heartbeat"))
+        self.fence_dir = os.path.join(self.temp_dir, "fence")
+        os.makedirs(self.fence_dir)
+        patchers = [
+            mock.patch.object(
+                settings, "agent_index_cache_file", self.cache_file
+            ),
+            mock.patch.object(
+                settings, "ocf_root", os.path.join(self.temp_dir, "ocf")
+            ),
+            mock.patch.object(settings, "fence_agent_binaries", self.fence_dir),
+            mock.patch.object(settings, "other_agents_dirs", []),
+            mock.patch.dict(lib_ra._disk_cache, {"enabled": True}),
+            mock.patch.dict(lib_ra._agent_index, {"index": None}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.agents = {
+            "ocf": "Dummy\nIPaddr2\n",
+            "ocf:heartbeat": "Dummy\nIPaddr2\n",
+            "lsb": "network\n",
+            "stonith": "fence_xvm\nfence_check\n",
+        }
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.side_effect = self.run_crm_resource
+
+    def run_crm_resource(self, args):
+        if args[1] == "--list-standards":
+            return "ocf\nlsb\nstonith\n", "", 3
+        if args[1] == "--list-ocf-providers":
+            return "heartbeat\n", "", 1
+        if args[2] in self.agents:
+            return self.agents[args[2]], "", 0
+        return "", "", 1
+
+    def forget_process_cache(self):
+        lib_ra._agent_index["index"] = None
+
+    def test_listing_uses_index(self):
+        for dummy in range(2):
+            self.assertEqual(
+                ["lsb", "ocf:heartbeat"],
+                lib_ra.list_resource_agents_standards_and_providers(
+                    self.runner
+                )
+            )
+            self.assertEqual(
+                ["Dummy", "IPaddr2"],
+                lib_ra.list_resource_agents(self.runner, "ocf:heartbeat")
+            )
+            self.assertEqual(
+                ["fence_xvm"],
+                lib_ra.list_stonith_agents(self.runner)
+            )
+        # list standards, providers and agents of ocf, ocf:heartbeat, lsb and
+        # stonith
+        self.assertEqual(6, self.runner.run.call_count)
+
+    def test_index_shared_by_processes(self):
+        lib_ra.list_resource_agents_standards(self.runner)
+        self.forget_process_cache()
+        lib_ra.list_resource_agents_standards(self.runner)
+        self.assertEqual(6, self.runner.run.call_count)
+
+    def test_rebuild_when_agent_added(self):
+        lib_ra.list_stonith_agents(self.runner)
+        with open(os.path.join(self.fence_dir, "fence_ipmilan"), "w"):
+            pass
+        # make sure the directory's mtime changes
+        os.utime(self.fence_dir, (1, 1))
+        self.agents["stonith"] = "fence_ipmilan\nfence_xvm\n"
+        self.assertEqual(
+            ["fence_ipmilan", "fence_xvm"],
+            lib_ra.list_stonith_agents(self.runner)
+        )
+        self.assertEqual(12, self.runner.run.call_count)
+
+    def test_unknown_standard_listed_live(self):
+        self.assertEqual(
+            [],
+            lib_ra.list_resource_agents(self.runner, "ocf:pacemaker")
+        )
+        self.assertEqual(7, self.runner.run.call_count)
+
+    def test_not_used_when_disabled(self):
+        lib_ra.enable_disk_cache(False)
+        lib_ra.list_resource_agents_standards(self.runner)
+        lib_ra.list_resource_agents_standards(self.runner)
+        self.assertEqual(2, self.runner.run.call_count)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    @mock.patch.object(lib_ra.ResourceAgent, "is_valid_metadata")
+    def test_guess_name(self, mock_is_valid):
+        mock_is_valid.return_value = True
+        lib_ra.list_resource_agents_standards(self.runner)
+        self.runner.run.reset_mock()
+        self.assertEqual(
+            ["ocf:heartbeat:IPaddr2"],
+            [
+                agent.get_name()
+                for agent in lib_ra.guess_resource_agent_full_name(
+                    self.runner, "ipaddr2"
+                )
+            ]
+        )
+        self.runner.run.assert_not_called()
@@ -5,6 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
+import json
+import os
+
 
 def environment_file_to_dict(config):
     """
@@ -47,3 +50,56 @@ def dict_to_environment_file(config_dict):
     for key, val in sorted(config_dict.items()):
         lines.append("{key}={val}\n".format(key=key, val=val))
     return "".join(lines)
+
+
+def get_file_stat_key(path):
+    """
+    Return a value which changes when the file is replaced or modified
+    Return None if the file does not exist.
+
+    string path -- path to the file
+    """
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return [file_stat.st_ino, file_stat.st_mtime, file_stat.st_size]
+
+def read_cache_file(path):
+    """
+    Return data loaded from a JSON cache file, None if it cannot be read
+
+    string path -- path to the file
+    """
+    try:
+        with open(path) as cache_file:
+            return json.load(cache_file)
+    except (EnvironmentError, ValueError):
+        return None
+
+def write_cache_file(path, data):
+    """
+    Write data to a JSON cache file readable by everyone, replace it atomically
+    Return False if the file cannot be written.
+
+    Caches are only an optimization, their data are loaded again if they cannot
+    be saved (e.g. pcs is not run by root).
+
+    string path -- path to the file, its directory is created if needed
+    data -- data to be stored, must be serializable to JSON
+    """
+    tmp_path = "{0}.{1}".format(path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path), 0o755)
+        with open(tmp_path, "w") as cache_file:
+            json.dump(data, cache_file)
+        os.chmod(tmp_path, 0o644)
+        os.rename(tmp_path, path)
+    except EnvironmentError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
@@ -235,7 +235,27 @@ def resource_list_available(lib, argv, modifiers):
     search = argv[0] if argv else None
     agent_list = lib.resource_agent.list_agents(modifiers["describe"], search)
 
-    if not agent_list:
+    agent_found = False
+    # agents are printed as soon as their description is ready
+    try:
+        for agent_info in agent_list:
+            agent_found = True
+            name = agent_info["name"]
+            shortdesc = agent_info["shortdesc"]
+            if shortdesc:
+                print("{0} - {1}".format(
+                    name,
+                    _format_desc(
+                        len(name + " - "), shortdesc.replace("\n", " ")
+                    )
+                ))
+            else:
+                print(name)
+    except LibraryError as e:
+        # an error may be raised while the agents are being listed
+        utils.process_library_reports(e.args)
+
+    if not agent_found:
         if search:
             utils.err("No resource agents matching the filter.")
         utils.err(
@@ -243,17 +263,6 @@ def resource_list_available(lib, argv, modifiers):
             "Do you have resource agents installed?"
         )
 
-    for agent_info in agent_list:
-        name = agent_info["name"]
-        shortdesc = agent_info["shortdesc"]
-        if shortdesc:
-            print("{0} - {1}".format(
-                name,
-                _format_desc(len(name + " - "), shortdesc.replace("\n", " "))
-            ))
-        else:
-            print(name)
-
 
 def resource_list_options(lib, argv, modifiers):
     if len(argv) != 1:
@@ -1600,7 +1609,7 @@ def resource_master_create(dom, argv, update=False, master_id=None):
 
     return dom, master_element.getAttribute("id")
 
-def resource_remove(resource_id, output = True):
+def resource_remove(resource_id, output = True, cluster_state=None):
     dom = utils.get_cib_dom()
     # if resource is a clone or a master, work with its child instead
     cloned_resource = utils.dom_get_clone_ms_resource(dom, resource_id)
@@ -1618,23 +1627,37 @@ def resource_remove(resource_id, output = True):
             if retval != 0 and "unrecognized option '--wait'" in output:
                 output = ""
                 retval = 0
-                for res in reversed(
-                    group_dom.documentElement.getElementsByTagName("primitive")
-                ):
-                    res_id = res.getAttribute("id")
-                    res_stopped = False
-                    for _ in range(15):
-                        time.sleep(1)
-                        if not utils.resource_running_on(res_id)["is_running"]:
-                            res_stopped = True
-                            break
-                    if not res_stopped:
-                        break
+                # check all the members in one cluster state each second, give
+                # up if none of them has stopped for 15 seconds
+                running_ids = [
+                    res.getAttribute("id") for res in reversed(
+                        group_dom.documentElement.getElementsByTagName(
+                            "primitive"
+                        )
+                    )
+                ]
+                idle_ticks = 0
+                while running_ids and idle_ticks < 15:
+                    time.sleep(1)
+                    tick_state = utils.get_cluster_state()
+                    still_running_ids = [
+                        res_id for res_id in running_ids
+                        if utils.resource_running_on(res_id, tick_state)[
+                            "is_running"
+                        ]
+                    ]
+                    if len(still_running_ids) < len(running_ids):
+                        idle_ticks = 0
+                    else:
+                        idle_ticks += 1
+                    running_ids = still_running_ids
             stopped = True
-            state = utils.getClusterState()
+            cluster_state = utils.get_cluster_state()
             for res in group_dom.documentElement.getElementsByTagName("primitive"):
                 res_id = res.getAttribute("id")
-                if utils.resource_running_on(res_id, state)["is_running"]:
+                if utils.resource_running_on(res_id, cluster_state)[
+                    "is_running"
+                ]:
                     stopped = False
                     break
             if not stopped:
@@ -1646,8 +1669,10 @@ def resource_remove(resource_id, output = True):
                 if retval != 0 and output:
                     msg.append("\n" + output)
                 utils.err("\n".join(msg).strip())
+        # the group has been stopped, members do not need to check the cluster
+        # state again
         for res in group_dom.documentElement.getElementsByTagName("primitive"):
-            resource_remove(res.getAttribute("id"))
+            resource_remove(res.getAttribute("id"), cluster_state=cluster_state)
         sys.exit(0)
 
     # now we know resource is not a group, a clone nor a master
@@ -1667,11 +1692,11 @@ def resource_remove(resource_id, output = True):
         and
         not utils.usefile
         and
-        utils.resource_running_on(resource_id)["is_running"]
+        utils.resource_running_on(resource_id, cluster_state)["is_running"]
     ):
         sys.stdout.write("Attempting to stop: "+ resource_id + "...")
         sys.stdout.flush()
-        resource_disable([resource_id])
+        resource_disable([resource_id], cluster_state)
         output, retval = utils.run(["crm_resource", "--wait"])
         if retval != 0 and "unrecognized option '--wait'" in output:
             output = ""
@@ -2050,12 +2075,12 @@ def resource_show(argv, stonith=False):
             utils.err("unable to find resource '"+arg+"'")
         resource_found = False
 
-def resource_disable(argv):
+def resource_disable(argv, cluster_state=None):
     if len(argv) < 1:
         utils.err("You must specify a resource to disable")
 
     resource = argv[0]
-    if not is_managed(resource):
+    if not is_managed(resource, cluster_state):
         print("Warning: '%s' is unmanaged" % resource)
 
     if "--wait" in utils.pcs_options:
@@ -2123,8 +2148,9 @@ def resource_enable(argv):
     if resource_clone:
         resources_to_enable.append(resource_clone.getAttribute("id"))
 
+    cluster_state = utils.get_cluster_state()
     for res in resources_to_enable:
-        if not is_managed(res):
+        if not is_managed(res, cluster_state):
             print("Warning: '{0}' is unmanaged".format(res))
 
     if "--wait" in utils.pcs_options:
@@ -2310,28 +2336,15 @@ def resource_manage(argv, set_managed):
                     xpath = "(//primitive|//group|//clone|//master)[@id='"+res+"']/meta_attributes/nvpair[@name='is-managed']"
                     utils.run(["cibadmin", "-D", "--xpath", xpath])
 
-def is_managed(resource_id):
-    state_dom = utils.getClusterState()
-    for resource_el in state_dom.getElementsByTagName("resource"):
-        if resource_el.getAttribute("id") in [resource_id, resource_id + ":0"]:
-            if resource_el.getAttribute("managed") == "false":
-                return False
-            return True
-    for resource_el in state_dom.getElementsByTagName("group"):
-        if resource_el.getAttribute("id") in [resource_id, resource_id + ":0"]:
-            for primitive_el in resource_el.getElementsByTagName("resource"):
-                if primitive_el.getAttribute("managed") == "false":
-                    return False
-            return True
-    for resource_el in state_dom.getElementsByTagName("clone"):
-        if resource_el.getAttribute("id") == resource_id:
-            if resource_el.getAttribute("managed") == "false":
-                return False
-            for primitive_el in resource_el.getElementsByTagName("resource"):
-                if primitive_el.getAttribute("managed") == "false":
-                    return False
-            return True
-    utils.err("unable to find a resource/clone/master/group: %s" % resource_id)
+def is_managed(resource_id, cluster_state=None):
+    if cluster_state is None:
+        cluster_state = utils.get_cluster_state()
+    state_list = cluster_state.get_resource_states(resource_id)
+    if not state_list:
+        utils.err(
+            "unable to find a resource/clone/master/group: %s" % resource_id
+        )
+    return all(state.managed for state in state_list)
 
 def resource_failcount(argv):
     if len(argv) < 2:
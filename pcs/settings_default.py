@@ -25,6 +25,16 @@ pengine_binary = "/usr/libexec/pacemaker/pengine"
 crmd_binary = "/usr/libexec/pacemaker/crmd"
 cib_binary = "/usr/libexec/pacemaker/cib"
 stonithd_binary = "/usr/libexec/pacemaker/stonithd"
+ocf_root = "/usr/lib/ocf/"
+lsb_agents_dir = "/etc/init.d/"
+# directories of systemd, upstart and nagios agents
+other_agents_dirs = [
+    "/usr/lib/systemd/system/",
+    "/etc/systemd/system/",
+    "/run/systemd/system/",
+    "/etc/init/",
+    "/usr/share/nagios/plugins-metadata/",
+]
 pcs_version = "0.9.155"
 crm_report = pacemaker_binaries + "crm_report"
 crm_verify = pacemaker_binaries + "crm_verify"
@@ -44,3 +54,22 @@ sbd_config = "/etc/sysconfig/sbd"
 pacemaker_wait_timeout_status = 62
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
+pcs_daemon_socket = "/var/run/pcsd/pcs.sock"
+pcs_daemon_workers = 4
+pcs_daemon_request_timeout = 3600
+host_facts_cache_file = "/var/cache/pcs/host_facts.json"
+agent_metadata_cache_dir = "/var/cache/pcs/agent_metadata/"
+agent_metadata_cache_max_size = 8 * 1024 * 1024
+agent_metadata_workers = 8
+agent_index_cache_file = "/var/cache/pcs/agent_index.json"
+cluster_properties_cache_file = "/var/cache/pcs/cluster_properties.json"
+# calls to nodes running at once, time in seconds a call and all calls may take
+node_tasks_max_workers = 32
+node_task_timeout = 300
+node_tasks_deadline = None
+# nodes pcs has been unable to connect to are skipped or probed for a while
+node_reachability_cache_file = "/var/cache/pcs/node_reachability.json"
+node_offline_cache_period = 60
+node_offline_probe_timeout = 2
+# requests to nodes sent at once by the asyncio communicator
+node_async_max_connections = 256
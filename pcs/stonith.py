@@ -114,7 +114,27 @@ def stonith_list_available(lib, argv, modifiers):
     search = argv[0] if argv else None
     agent_list = lib.stonith_agent.list_agents(modifiers["describe"], search)
 
-    if not agent_list:
+    agent_found = False
+    # agents are printed as soon as their description is ready
+    try:
+        for agent_info in agent_list:
+            agent_found = True
+            name = agent_info["name"]
+            shortdesc = agent_info["shortdesc"]
+            if shortdesc:
+                print("{0} - {1}".format(
+                    name,
+                    resource._format_desc(
+                        len(name + " - "), shortdesc.replace("\n", " ")
+                    )
+                ))
+            else:
+                print(name)
+    except LibraryError as e:
+        # an error may be raised while the agents are being listed
+        utils.process_library_reports(e.args)
+
+    if not agent_found:
         if search:
             utils.err("No stonith agents matching the filter.")
         utils.err(
@@ -122,19 +142,6 @@ def stonith_list_available(lib, argv, modifiers):
             "Do you have fence agents installed?"
         )
 
-    for agent_info in agent_list:
-        name = agent_info["name"]
-        shortdesc = agent_info["shortdesc"]
-        if shortdesc:
-            print("{0} - {1}".format(
-                name,
-                resource._format_desc(
-                    len(name + " - "), shortdesc.replace("\n", " ")
-                )
-            ))
-        else:
-            print(name)
-
 
 def stonith_list_options(lib, argv, modifiers):
     if len(argv) != 1:
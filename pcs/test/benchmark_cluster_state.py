@@ -0,0 +1,126 @@
+"""
+Micro-benchmark of the crm_mon cluster state model
+
+Not run by the test suite, run it from the repository root:
+    python -m pcs.test.benchmark_cluster_state [node count] [resource count]
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import sys
+import timeit
+
+from pcs.lib.pacemaker.state import ClusterState
+
+
+def _fixture_node(node_id):
+    return (
+        '<node name="node{0}" id="{0}" online="true" standby="false" '
+        'standby_onfail="false" maintenance="false" pending="false" '
+        'unclean="false" shutdown="false" expected_up="true" '
+        'is_dc="{1}" resources_running="0" type="member" />'
+    ).format(node_id, "true" if node_id == 1 else "false")
+
+def _fixture_resource(resource_id, node_name, role="Started"):
+    return (
+        '<resource id="{0}" resource_agent="ocf::heartbeat:Dummy" '
+        'role="{2}" active="true" orphaned="false" managed="true" '
+        'failed="false" failure_ignored="false" nodes_running_on="1">'
+        '<node name="{1}" id="1" cached="false"/>'
+        '</resource>'
+    ).format(resource_id, node_name, role)
+
+def fixture_crm_mon(node_count, resource_count):
+    """
+    Return crm_mon xml with a mix of primitives, groups and clones
+
+    Each clone instance counts as a resource.
+    """
+    node_list = [_fixture_node(i) for i in range(1, node_count + 1)]
+    resource_list = []
+    index = 0
+    while index < resource_count:
+        node_name = "node{0}".format(index % node_count + 1)
+        kind = index // 10 % 3
+        if kind == 0:
+            resource_list.append(
+                _fixture_resource("R{0}".format(index), node_name)
+            )
+            index += 1
+        elif kind == 1:
+            resource_list.append(
+                '<group id="G{0}" number_resources="5">'.format(index)
+            )
+            resource_list.extend([
+                _fixture_resource("R{0}".format(index + i), node_name)
+                for i in range(5)
+            ])
+            resource_list.append("</group>")
+            index += 5
+        else:
+            resource_list.append(
+                '<clone id="C{0}" multi_state="false" unique="false" '
+                'managed="true" failed="false" failure_ignored="false">'
+                .format(index)
+            )
+            resource_list.extend([
+                _fixture_resource(
+                    "R{0}".format(index), "node{0}".format(i + 1)
+                )
+                for i in range(node_count)
+            ])
+            resource_list.append("</clone>")
+            index += node_count
+    return (
+        '<crm_mon version="1.1.15">'
+        '<summary><current_dc present="true"/>'
+        '<nodes_configured number="{0}" expected_votes="unknown"/>'
+        '<resources_configured number="{1}"/></summary>'
+        '<nodes>{2}</nodes><resources>{3}</resources>'
+        '</crm_mon>'
+    ).format(
+        node_count, resource_count, "".join(node_list), "".join(resource_list)
+    )
+
+def scan_nodes(state, name_list):
+    # the way nodes used to be looked up: a wrapped node list for each name
+    return [
+        [node for node in state.node_section.nodes if node.attrs.name == name]
+        for name in name_list
+    ]
+
+def main(argv):
+    node_count = int(argv[0]) if argv else 32
+    resource_count = int(argv[1]) if len(argv) > 1 else 5000
+    repeat = 10
+    xml = fixture_crm_mon(node_count, resource_count)
+    name_list = ["node{0}".format(i) for i in range(1, node_count + 1)]
+    id_list = ["R{0}".format(i) for i in range(0, resource_count, 25)]
+
+    def lookup_nodes():
+        state = ClusterState(xml, validate=False)
+        return [state.get_node(name) for name in name_list]
+
+    def lookup_resources():
+        state = ClusterState(xml, validate=False)
+        return [state.get_resource_states(id) for id in id_list]
+
+    for label, statement in [
+        ("parse", lambda: ClusterState(xml, validate=False)),
+        ("parse+validate", lambda: ClusterState(xml)),
+        (
+            "scan nodes",
+            lambda: scan_nodes(ClusterState(xml, validate=False), name_list)
+        ),
+        ("index nodes", lookup_nodes),
+        ("index resources", lookup_resources),
+    ]:
+        seconds = min(timeit.repeat(statement, number=repeat, repeat=3))
+        print("{0:<16} {1:8.3f} ms".format(label, seconds / repeat * 1000))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+"""
+Micro-benchmark of the corosync.conf parser
+
+Not run by the test suite, run it from the repository root:
+    python -m pcs.test.benchmark_corosync_config_parser [node count] [repeat]
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import sys
+import timeit
+
+from pcs.lib.corosync import config_parser
+
+
+def fixture_config(node_count, comment_count=5):
+    lines = [
+        "totem {",
+        "    version: 2",
+        "    cluster_name: benchmark",
+        "    transport: udpu",
+        "}",
+        "",
+        "nodelist {",
+    ]
+    for node_id in range(1, node_count + 1):
+        lines.extend(
+            ["    # comment {0}".format(i) for i in range(comment_count)]
+        )
+        lines.extend([
+            "    node {",
+            "        ring0_addr: node{0}".format(node_id),
+            "        nodeid: {0}".format(node_id),
+            "    }",
+            "",
+        ])
+    lines.extend([
+        "}",
+        "",
+        "quorum {",
+        "    provider: corosync_votequorum",
+        "}",
+        "",
+        "logging {",
+        "    to_syslog: yes",
+        "}",
+    ])
+    return "\n".join(lines)
+
+def get_nodes(config):
+    return [
+        attr[1]
+        for nodelist in config.get_sections("nodelist")
+        for node in nodelist.get_sections("node")
+        for attr in node.get_attributes("ring0_addr")
+    ]
+
+def main(argv):
+    node_count = int(argv[0]) if argv else 60
+    repeat = int(argv[1]) if len(argv) > 1 else 200
+    text = fixture_config(node_count)
+    config = config_parser.parse_string(text)
+    for label, statement in [
+        ("parse", lambda: config_parser.parse_string(text)),
+        ("export", config.export),
+        ("get nodes", lambda: get_nodes(config)),
+    ]:
+        seconds = min(timeit.repeat(statement, number=repeat, repeat=3))
+        print("{0:<10} {1:8.3f} ms".format(
+            label, seconds / repeat * 1000
+        ))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,51 @@
+"""
+Benchmark of the time pcs takes to start and run a trivial command
+
+Monitoring runs pcs every few seconds on every node. Not run by the test
+suite as its result depends on the speed and load of the machine, run it from
+the repository root:
+    python -m pcs.test.benchmark_startup [run count]
+It exits with 1 if the start-up takes longer than STARTUP_TIME_BUDGET.
+"""
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import subprocess
+import sys
+import time
+
+
+# Maximal time in seconds pcs may spend importing its modules and running
+# a trivial command. Do not raise this without a good reason.
+STARTUP_TIME_BUDGET = 0.5
+
+_STARTUP_SCRIPT = """
+from pcs import app
+app.main(["--version"])
+"""
+
+def run_trivial_command():
+    start = time.time()
+    subprocess.check_call(
+        [sys.executable, "-c", _STARTUP_SCRIPT],
+        stdout=subprocess.PIPE,
+    )
+    return time.time() - start
+
+def main(argv):
+    run_count = int(argv[0]) if argv else 5
+    # the best of several runs, the others may be slowed down by the machine
+    # being busy
+    startup_time = min(run_trivial_command() for dummy in range(run_count))
+    print("pcs start-up took {0:.3f}s, the budget is {1}s".format(
+        startup_time, STARTUP_TIME_BUDGET
+    ))
+    if startup_time > STARTUP_TIME_BUDGET:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from pcs.test.tools.misc import testdir
+from pcs.test.tools.pcs_unittest import TestCase
+
+
+# Command modules are imported on demand. Monitoring runs pcs every few
+# seconds on every node, a trivial command must not import them.
+_COMMAND_MODULES = [
+    "pcs.acl", "pcs.alert", "pcs.batch", "pcs.booth", "pcs.cluster",
+    "pcs.config", "pcs.constraint", "pcs.daemon", "pcs.node", "pcs.pcsd",
+    "pcs.prop", "pcs.qdevice", "pcs.quorum", "pcs.resource", "pcs.status",
+    "pcs.stonith",
+]
+
+_STARTUP_SCRIPT = """
+import json, sys
+from pcs import app
+try:
+    app.main(["--version"])
+except SystemExit:
+    pass
+sys.stdout.write(json.dumps({
+    "modules": [name for name in sys.modules if name.startswith("pcs.")],
+}))
+"""
+
+def run_trivial_command(env_extend=None):
+    env = dict(os.environ)
+    env.update(env_extend or {})
+    process = subprocess.Popen(
+        [sys.executable, "-c", _STARTUP_SCRIPT],
+        stdout=subprocess.PIPE,
+        cwd=os.path.dirname(os.path.dirname(testdir)),
+        env=env,
+    )
+    stdout, dummy_stderr = process.communicate()
+    # skip the output of the command itself
+    return json.loads(stdout.decode("utf-8").splitlines()[-1])
+
+
+class StartupTest(TestCase):
+    def assert_command_modules_not_imported(self, modules):
+        for module in _COMMAND_MODULES:
+            self.assertFalse(module in modules, module)
+        self.assertEqual(
+            [],
+            [name for name in modules if name.startswith("pcs.lib.commands")]
+        )
+
+    def test_command_modules_not_imported(self):
+        self.assert_command_modules_not_imported(
+            run_trivial_command()["modules"]
+        )
+
+    def test_version_does_not_import_utils(self):
+        modules = run_trivial_command()["modules"]
+        self.assertFalse("pcs.utils" in modules)
+        self.assertFalse("pcs.usage" in modules)
+
+    def test_completion_does_not_import_utils(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            for dummy in range(2):
+                modules = run_trivial_command({
+                    "COMP_WORDS": "pcs res",
+                    "COMP_LENGTHS": "3 3",
+                    "COMP_CWORD": "1",
+                    "PCS_AUTO_COMPLETE": "1",
+                    "XDG_CACHE_HOME": cache_dir,
+                })["modules"]
+            self.assert_command_modules_not_imported(modules)
+            self.assertFalse("pcs.utils" in modules)
+            self.assertFalse("pcs.usage" in modules)
+        finally:
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,246 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import sys
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs import batch, utils
+
+
+class ParseBatchTest(TestCase):
+    def test_skip_empty_lines_and_comments(self):
+        self.assertEqual(
+            [
+                (2, ["resource", "create", "R", "ocf:heartbeat:Dummy"], {}),
+                (5, ["constraint", "order", "A", "then", "B"], {}),
+            ],
+            batch.parse_batch([
+                "\n",
+                "resource create R ocf:heartbeat:Dummy\n",
+                "# a comment\n",
+                "   \n",
+                "pcs constraint order A then B\n",
+            ])
+        )
+
+    def test_quoting_and_options(self):
+        self.assertEqual(
+            [
+                (
+                    1,
+                    ["resource", "create", "R", "Dummy", "clone", "meta",
+                        "description=a b"],
+                    {"--group": "G", "--force": ""},
+                ),
+            ],
+            batch.parse_batch([
+                "resource create R Dummy --clone meta 'description=a b'"
+                    " --group G --force"
+            ])
+        )
+
+    @mock.patch("pcs.utils.err", side_effect=SystemExit(1))
+    def test_unsupported_command(self, mock_err):
+        self.assertRaises(
+            SystemExit,
+            lambda: batch.parse_batch(["status", "cluster start"])
+        )
+        mock_err.assert_called_once_with(
+            "line 1: 'status' cannot be run in a batch, supported commands"
+            " are: acl, alert, constraint, property, resource, stonith"
+        )
+
+    @mock.patch("pcs.utils.err", side_effect=SystemExit(1))
+    def test_unsupported_subcommand(self, mock_err):
+        self.assertRaises(
+            SystemExit,
+            lambda: batch.parse_batch([
+                "property set a=b",
+                "resource cleanup R",
+            ])
+        )
+        mock_err.assert_called_once_with(
+            "line 2: 'resource cleanup R' cannot be run in a batch, supported"
+            " resource commands are: add_operation, ban, clear, clone, create,"
+            " defaults, delete, disable, enable, group, manage, master, meta,"
+            " move, op, remove_operation, unclone, ungroup, unmanage, update,"
+            " utilization"
+        )
+
+    @mock.patch("pcs.utils.err", side_effect=SystemExit(1))
+    def test_missing_subcommand(self, mock_err):
+        self.assertRaises(
+            SystemExit,
+            lambda: batch.parse_batch(["property"])
+        )
+        mock_err.assert_called_once_with(
+            "line 1: 'property' cannot be run in a batch, supported property"
+            " commands are: set, unset"
+        )
+
+    @mock.patch("pcs.utils.err", side_effect=SystemExit(1))
+    def test_forbidden_option(self, mock_err):
+        self.assertRaises(
+            SystemExit,
+            lambda: batch.parse_batch(["resource enable R --wait"])
+        )
+        mock_err.assert_called_once_with(
+            "line 1: option '--wait' cannot be used in a batch"
+        )
+
+    @mock.patch("pcs.utils.err", side_effect=SystemExit(1))
+    def test_duplicate_option(self, mock_err):
+        self.assertRaises(
+            SystemExit,
+            lambda: batch.parse_batch(["resource enable R --force --force"])
+        )
+        mock_err.assert_called_once_with(
+            "line 1: --force can only be used once"
+        )
+
+
+class RunBatchTest(TestCase):
+    def setUp(self):
+        self.orig = (utils.usefile, utils.filename, utils.pcs_options)
+        utils.usefile, utils.filename = False, ""
+        utils.pcs_options = {"--debug": ""}
+        self.calls = []
+
+    def tearDown(self):
+        utils.usefile, utils.filename, utils.pcs_options = self.orig
+
+    def command(self, argv):
+        self.calls.append(
+            (argv, utils.usefile, utils.filename, dict(utils.pcs_options))
+        )
+
+    def failing_command(self, argv):
+        sys.exit(1)
+
+    def test_run_commands_against_file(self):
+        batch.run_batch(
+            {"resource": self.command, "constraint": self.command},
+            [
+                (1, ["resource", "enable", "R"], {"--force": ""}),
+                (3, ["constraint", "remove", "C"], {}),
+            ],
+            "/tmp/cib.xml"
+        )
+        self.assertEqual(
+            [
+                (
+                    ["enable", "R"], True, "/tmp/cib.xml",
+                    {"--force": "", "--debug": ""}
+                ),
+                (["remove", "C"], True, "/tmp/cib.xml", {"--debug": ""}),
+            ],
+            self.calls
+        )
+        self.assertEqual(
+            (False, "", {"--debug": ""}),
+            (utils.usefile, utils.filename, utils.pcs_options)
+        )
+
+    @mock.patch("pcs.batch.sys.stderr")
+    def test_stop_on_failure(self, mock_stderr):
+        self.assertRaises(
+            SystemExit,
+            lambda: batch.run_batch(
+                {"resource": self.failing_command, "stonith": self.command},
+                [
+                    (1, ["resource", "enable", "R"], {}),
+                    (2, ["stonith", "enable", "S"], {}),
+                ],
+                "/tmp/cib.xml"
+            )
+        )
+        self.assertEqual([], self.calls)
+        mock_stderr.write.assert_called_once_with(
+            "Error: batch failed on line 1: resource enable R, no changes have"
+            " been pushed\n"
+        )
+        self.assertEqual(
+            (False, "", {"--debug": ""}),
+            (utils.usefile, utils.filename, utils.pcs_options)
+        )
+
+    def test_restore_on_exception(self):
+        def raising_command(argv):
+            raise ValueError("an error")
+        self.assertRaises(
+            ValueError,
+            lambda: batch.run_batch(
+                {"resource": raising_command},
+                [(1, ["resource", "enable", "R"], {"--force": ""})],
+                "/tmp/cib.xml"
+            )
+        )
+        self.assertEqual(
+            (False, "", {"--debug": ""}),
+            (utils.usefile, utils.filename, utils.pcs_options)
+        )
+
+    def test_successful_exit_continues(self):
+        def exiting_command(argv):
+            sys.exit(0)
+        batch.run_batch(
+            {"resource": exiting_command, "stonith": self.command},
+            [
+                (1, ["resource", "enable", "R"], {}),
+                (2, ["stonith", "enable", "S"], {}),
+            ],
+            "/tmp/cib.xml"
+        )
+        self.assertEqual(1, len(self.calls))
+
+
+@mock.patch("pcs.batch.run_batch")
+@mock.patch("pcs.utils.push_cib_diff")
+@mock.patch("pcs.utils.diff_cib_files")
+@mock.patch("pcs.utils.run", return_value=("", 0))
+@mock.patch("pcs.utils.get_cib", return_value="<cib/>")
+class BatchCmdTest(TestCase):
+    def setUp(self):
+        self.orig = (utils.usefile, utils.filename, utils.pcs_options)
+        utils.usefile, utils.filename, utils.pcs_options = False, "", {}
+
+    def tearDown(self):
+        utils.usefile, utils.filename, utils.pcs_options = self.orig
+
+    def run_batch_cmd(self):
+        with mock.patch(
+            "pcs.batch.read_batch", return_value=["property set a=b"]
+        ):
+            batch.batch_cmd({}, [])
+
+    @mock.patch("pcs.batch.print", create=True)
+    def test_push_changes_made_by_batch(
+        self, mock_print, mock_get_cib, mock_run, mock_diff, mock_push,
+        mock_run_batch
+    ):
+        mock_diff.return_value = "<diff/>"
+        self.run_batch_cmd()
+        original_file, new_file = mock_diff.call_args[0]
+        self.assertEqual(
+            new_file, mock_run_batch.call_args[0][2]
+        )
+        self.assertNotEqual(original_file, new_file)
+        mock_push.assert_called_once_with("<diff/>")
+        mock_print.assert_called_once_with("CIB updated")
+
+    @mock.patch("pcs.utils.err", side_effect=SystemExit(1))
+    def test_diff_failed(
+        self, mock_err, mock_get_cib, mock_run, mock_diff, mock_push,
+        mock_run_batch
+    ):
+        mock_diff.return_value = None
+        self.assertRaises(SystemExit, self.run_batch_cmd)
+        mock_err.assert_called_once_with(
+            "unable to diff the CIBs, no changes have been pushed"
+        )
+        mock_push.assert_not_called()
@@ -6,6 +6,7 @@ from __future__ import (
 )
 
 from pcs.test.tools.pcs_unittest import TestCase
+import threading
 import time
 
 from pcs.common import tools
@@ -65,6 +66,46 @@ class RunParallelTestCase(TestCase):
         self.assertTrue(elapsed_time < sum([i + 1 for i in range(x)]))
 
 
+class IterateParallelTest(TestCase):
+    def test_results_in_order(self):
+        # later items finish first
+        data_list = [([0.1 * (5 - i), i], {}) for i in range(5)]
+        def worker(delay, value):
+            time.sleep(delay)
+            return value
+        self.assertEqual(
+            [0, 1, 2, 3, 4],
+            list(tools.iterate_parallel(worker, data_list, 5))
+        )
+
+    def test_bounded_workers(self):
+        lock = threading.Lock()
+        counter = {"running": 0, "max": 0}
+        def worker():
+            with lock:
+                counter["running"] += 1
+                counter["max"] = max(counter["max"], counter["running"])
+            time.sleep(0.05)
+            with lock:
+                counter["running"] -= 1
+        list(tools.iterate_parallel(worker, [([], {})] * 10, 3))
+        self.assertEqual(3, counter["max"])
+
+    def test_exception_raised_in_order(self):
+        def worker(value):
+            if value == 1:
+                raise TestException()
+            return value
+        results = tools.iterate_parallel(
+            worker, [([i], {}) for i in range(3)], 2
+        )
+        self.assertEqual(0, next(results))
+        self.assertRaises(TestException, lambda: next(results))
+
+    def test_empty(self):
+        self.assertEqual([], list(tools.iterate_parallel(len, [], 2)))
+
+
 class JoinMultilinesTest(TestCase):
     def test_empty_input(self):
         self.assertEqual(
@@ -0,0 +1,137 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+
+from pcs.test.tools.pcs_unittest import TestCase
+
+from pcs import daemon, settings
+
+
+class DaemonServerMixin(object):
+    request_timeout = 60
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "pcs.sock")
+        server = daemon.create_server(self.socket_path)
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                settings.pcs_daemon_request_timeout = self.request_timeout
+                daemon.serve(server, 2)
+            finally:
+                os._exit(0)
+        server.close()
+
+    def tearDown(self):
+        os.kill(self.pid, signal.SIGKILL)
+        os.waitpid(self.pid, 0)
+        shutil.rmtree(self.temp_dir)
+
+    def send(self, request_line):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self.socket_path)
+            client.sendall(request_line.encode("utf-8") + b"\n")
+            return json.loads(client.makefile("rb").readline().decode("utf-8"))
+        finally:
+            client.close()
+
+    def request(self, argv, **kwargs):
+        kwargs["argv"] = argv
+        return self.send(json.dumps(kwargs))
+
+
+class DaemonTest(DaemonServerMixin, TestCase):
+    def test_socket_accessible_by_owner_only(self):
+        self.assertEqual(0o700, os.stat(self.socket_path).st_mode & 0o777)
+
+    def test_run_command(self):
+        self.assertEqual(
+            {
+                "stdout": "{0}\n".format(settings.pcs_version),
+                "stderr": "",
+                "code": 0,
+            },
+            self.request(["--version"])
+        )
+
+    def test_requests_are_isolated(self):
+        cib_file = os.path.join(self.temp_dir, "cib.xml")
+        self.assertEqual(1, self.request(["-f", cib_file, "bad-command"])["code"])
+        self.assertEqual(0, self.request(["--version"])["code"])
+
+    def test_error_exit_code(self):
+        response = self.request(["daemon"])
+        self.assertEqual(1, response["code"])
+        self.assertEqual(
+            "Error: Cannot run pcs daemon from pcs daemon\n",
+            response["stderr"]
+        )
+
+    def test_invalid_request(self):
+        self.assertEqual(
+            {
+                "stdout": "",
+                "stderr": "Error: invalid request: argv must be a non-empty "
+                    "list of strings\n"
+                ,
+                "code": 1,
+            },
+            self.request([])
+        )
+        self.assertEqual(1, self.send("not a json")["code"])
+        self.assertEqual(1, self.send("{}")["code"])
+
+    def test_debug_counts_printed(self):
+        response = self.request(["--debug", "help"])
+        self.assertEqual(0, response["code"])
+        self.assertIn("Number of CIB reads: 0\n", response["stdout"])
+
+    def test_finished_workers_reaped(self):
+        self.request(["--version"])
+        for dummy_i in range(50):
+            if not self.get_worker_pids():
+                return
+            time.sleep(0.1)
+        self.fail("a finished worker has not been reaped")
+
+    def get_worker_pids(self):
+        pid_list = []
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                with open(os.path.join("/proc", name, "stat")) as stat_file:
+                    stat = stat_file.read()
+            except (IOError, OSError):
+                continue
+            # the process name may contain spaces, it ends with ")"
+            if int(stat.rsplit(")", 1)[1].split()[1]) == self.pid:
+                pid_list.append(int(name))
+        return pid_list
+
+
+class DaemonTimeoutTest(DaemonServerMixin, TestCase):
+    request_timeout = 1
+
+    def test_worker_stopped_after_timeout(self):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.settimeout(10)
+            client.connect(self.socket_path)
+            # no request is sent, the worker waits for it until the deadline
+            self.assertEqual(b"", client.makefile("rb").readline())
+        finally:
+            client.close()
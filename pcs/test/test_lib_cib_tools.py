@@ -120,6 +120,117 @@ class FindUniqueIdTest(CibToolsTest):
         self.fixture_add_primitive_with_id("myId-3")
         self.assertEqual("myId-2", lib.find_unique_id(self.cib.tree, "myId"))
 
+class IdIndexTest(CibToolsTest):
+    def setUp(self):
+        super(IdIndexTest, self).setUp()
+        self.fixture_add_primitive_with_id("myId")
+        self.resources = self.cib.tree.find(".//resources")
+
+    def test_index_not_kept_if_not_registered(self):
+        self.assertIsNot(
+            lib.get_id_index(self.cib.tree),
+            lib.get_id_index(self.cib.tree)
+        )
+
+    def test_removed_element(self):
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.resources.remove(self.resources.find("primitive"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertEqual("myId", lib.find_unique_id(self.cib.tree, "myId"))
+
+    def test_changed_id(self):
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.resources.find("primitive").set("id", "newId")
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_element_moved_to_status(self):
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.cib.tree.find(".//status").append(
+            self.resources.find("primitive")
+        )
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_created_element_with_checked_id(self):
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "otherId"))
+        etree.SubElement(self.resources, "primitive", id="otherId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "otherId"))
+
+    def test_created_element_with_generated_id(self):
+        new_id = lib.find_unique_id(self.cib.tree, "myId")
+        self.assertEqual("myId-1", new_id)
+        etree.SubElement(self.resources, "primitive", id=new_id)
+        self.assertEqual("myId-2", lib.find_unique_id(self.cib.tree, "myId"))
+
+    def test_created_element_not_checked_before(self):
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        primitive = etree.SubElement(self.resources, "primitive", id="B")
+        etree.SubElement(primitive, "meta_attributes", id="B-meta")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "B"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "B-meta"))
+        self.assertEqual("B-1", lib.find_unique_id(self.cib.tree, "B"))
+
+    def test_duplicate_id_removed(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.resources.remove(self.resources.find("primitive"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+
+    def test_id_with_quotes(self):
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "my'Id\""))
+
+
+class RegisteredIdIndexTest(CibToolsTest):
+    def setUp(self):
+        super(RegisteredIdIndexTest, self).setUp()
+        self.fixture_add_primitive_with_id("myId")
+        self.resources = self.cib.tree.find(".//resources")
+        lib.register_id_index(self.cib.tree)
+        self.addCleanup(lib.unregister_id_index, self.cib.tree)
+
+    def test_index_kept_for_the_document(self):
+        index = lib.get_id_index(self.cib.tree)
+        self.assertIs(index, lib.get_id_index(self.resources))
+        self.assertIs(index, lib.get_id_index(self.cib.tree.getroottree()))
+        self.assertIsNot(index, lib.get_id_index(self.create_cib().tree))
+
+    def test_index_not_kept_after_unregistering(self):
+        index = lib.get_id_index(self.cib.tree)
+        lib.unregister_id_index(self.cib.tree)
+        self.assertIsNot(index, lib.get_id_index(self.cib.tree))
+
+    def test_registered_element(self):
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "B"))
+        primitive = etree.SubElement(self.resources, "primitive", id="B")
+        etree.SubElement(primitive, "meta_attributes", id="B-meta")
+        self.assertIs(primitive, lib.register_ids(primitive))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "B"))
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "B-meta"))
+        self.assertEqual("B-1", lib.find_unique_id(self.cib.tree, "B"))
+
+    def test_miss_answered_from_index(self):
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        # the document is not searched again, not registered ids are not seen
+        etree.SubElement(self.resources, "primitive", id="B")
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "B"))
+
+    def test_registered_element_in_status(self):
+        lib.get_id_index(self.cib.tree)
+        status = self.cib.tree.find(".//status")
+        lib.register_ids(etree.SubElement(status, "node_state", id="B"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "B"))
+
+    def test_removed_element(self):
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "myId"))
+        self.resources.remove(self.resources.find("primitive"))
+        self.assertFalse(lib.does_id_exist(self.cib.tree, "myId"))
+        self.assertEqual("myId", lib.find_unique_id(self.cib.tree, "myId"))
+
+    def test_element_added_by_get_sub_element(self):
+        lib.get_id_index(self.cib.tree)
+        lib.get_sub_element(self.resources, "group", new_id="B")
+        self.assertTrue(lib.does_id_exist(self.cib.tree, "B"))
+
+
 class CreateNvsetIdTest(TestCase):
     def test_create_plain_id_when_no_confilicting_id_there(self):
         context = etree.fromstring('<cib><a id="b"/></cib>')
@@ -0,0 +1,101 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import shutil
+import tempfile
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs.lib import config_file_cache
+from pcs.lib.corosync import config_parser
+
+
+class ConfigFileCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.path = os.path.join(self.temp_dir, "corosync.conf")
+        self.write("totem {\n    version: 2\n}\n")
+        self.load_count = 0
+        patchers = [
+            mock.patch.dict(
+                config_file_cache._config_file_cache, {"enabled": True}
+            ),
+            mock.patch.dict(config_file_cache._cache, {}, clear=True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write(self, text):
+        with open(self.path, "w") as conf_file:
+            conf_file.write(text)
+
+    def load(self):
+        self.load_count += 1
+        with open(self.path) as conf_file:
+            return config_parser.parse_string(conf_file.read())
+
+    def get(self, path=None, kind="corosync.conf"):
+        return config_file_cache.get(
+            path or self.path,
+            kind,
+            self.load,
+            lambda conf_root: conf_root.copy()
+        )
+
+    def test_parsed_once(self):
+        self.assertEqual("totem {\n    version: 2\n}\n", self.get().export())
+        self.assertEqual("totem {\n    version: 2\n}\n", self.get().export())
+        self.assertEqual(1, self.load_count)
+
+    def test_callers_get_copies(self):
+        self.get().get_sections("totem")[0].set_attribute("version", "3")
+        self.get().add_section(config_parser.Section("quorum"))
+        self.assertEqual("totem {\n    version: 2\n}\n", self.get().export())
+        self.assertEqual(1, self.load_count)
+
+    def test_file_changed(self):
+        self.get()
+        self.write("totem {\n    version: 3\n}\n")
+        self.assertEqual("totem {\n    version: 3\n}\n", self.get().export())
+        self.assertEqual(2, self.load_count)
+
+    def test_invalidate(self):
+        self.get()
+        self.get(kind="other parser")
+        config_file_cache.invalidate(self.path)
+        self.get()
+        self.get(kind="other parser")
+        self.assertEqual(4, self.load_count)
+
+    def test_missing_file_not_cached(self):
+        path = os.path.join(self.temp_dir, "missing.conf")
+        load = mock.Mock(side_effect=IOError("No such file or directory"))
+        for dummy_i in range(2):
+            self.assertRaises(
+                IOError,
+                lambda: config_file_cache.get(path, "corosync.conf", load, None)
+            )
+        self.assertEqual(2, load.call_count)
+        self.assertEqual({}, config_file_cache._cache)
+
+    def test_parse_error_not_cached(self):
+        self.write("totem {\n")
+        for dummy_i in range(2):
+            self.assertRaises(
+                config_parser.MissingClosingBraceException, self.get
+            )
+        self.assertEqual(2, self.load_count)
+
+    def test_disabled(self):
+        config_file_cache._config_file_cache["enabled"] = False
+        self.get()
+        self.get()
+        self.assertEqual(2, self.load_count)
+        self.assertEqual({}, config_file_cache._cache)
@@ -0,0 +1,212 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import errno
+import socket
+import threading
+import time
+try:
+    # python2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from httplib import HTTPConnection
+    from urllib2 import HTTPError as urllib_HTTPError
+except ImportError:
+    # python3
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from http.client import HTTPConnection
+    from urllib.error import HTTPError as urllib_HTTPError
+
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs.lib import connection_pool
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.connection_ports.add(self.client_address[1])
+            self.server.cookies.append(self.headers.get("Cookie"))
+            self.server.paths.append(self.path)
+        code = 403 if self.path == "/forbidden" else 200
+        response = "{0} {1}".format(self.path, body.decode("utf-8"))
+        response = response.encode("utf-8")
+        self.send_response(code)
+        if self.path == "/broken":
+            # the connection breaks in the middle of the response
+            self.send_header("Content-Length", str(len(response) + 10))
+            self.end_headers()
+            self.wfile.write(response)
+            self.close_connection = True
+            return
+        self.send_header("Content-Length", str(len(response)))
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(response)
+        if self.path == "/idle-close":
+            # close the connection without telling the client
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    # keep-alive connections are served at once
+    daemon_threads = True
+
+
+class _PlainConnection(HTTPConnection):
+    # the pool connects over TLS, the test server speaks plain HTTP
+    def __init__(self, pool, host):
+        HTTPConnection.__init__(self, host)
+        self.pool_host = host
+
+
+class ConnectionPoolTest(TestCase):
+    def setUp(self):
+        self.server = _Server(("127.0.0.1", 0), _RequestHandler)
+        self.server.connection_ports = set()
+        self.server.cookies = []
+        self.server.paths = []
+        self.server.lock = threading.Lock()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        patcher = mock.patch.object(
+            connection_pool, "_PooledHTTPSConnection", _PlainConnection
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = connection_pool.ConnectionPool()
+        self.addCleanup(self.pool.close)
+
+    def assert_counts(self, opened, reused):
+        self.assertEqual(
+            (opened, reused), (self.pool.opened_count, self.pool.reused_count)
+        )
+
+    def open(self, path, data="data"):
+        opener = connection_pool.urllib_build_opener(
+            connection_pool._PooledHTTPSHandler(self.pool),
+            connection_pool.urllib_HTTPCookieProcessor()
+        )
+        opener.addheaders.append(("Cookie", "token=1234"))
+        return opener.open(
+            "https://127.0.0.1:{0}{1}".format(
+                self.server.server_address[1], path
+            ),
+            data.encode("utf-8")
+        )
+
+    def test_connection_reused(self):
+        for dummy in range(3):
+            response = self.open("/remote/status")
+            self.assertEqual(200, response.getcode())
+            self.assertEqual(b"/remote/status data", response.read())
+        self.assertEqual(1, len(self.server.connection_ports))
+        self.assert_counts(1, 2)
+        self.assertEqual(["token=1234"] * 3, self.server.cookies)
+
+    def test_connection_closed_by_server(self):
+        self.open("/close")
+        self.open("/remote/status")
+        self.assertEqual(2, len(self.server.connection_ports))
+        self.assert_counts(2, 0)
+
+    def test_http_error(self):
+        with self.assertRaises(urllib_HTTPError) as context_manager:
+            self.open("/forbidden")
+        self.assertEqual(403, context_manager.exception.code)
+        self.assertEqual(b"/forbidden data", context_manager.exception.read())
+        self.open("/remote/status")
+        self.assertEqual(1, len(self.server.connection_ports))
+
+    def test_stale_connection_replaced(self):
+        self.open("/idle-close")
+        # wait for the server to close the connection
+        for dummy in range(50):
+            idle_list = list(self.pool._idle_connections.values())[0]
+            if connection_pool.is_connection_dropped(idle_list[0]):
+                break
+            time.sleep(0.1)
+        response = self.open("/remote/status")
+        self.assertEqual(b"/remote/status data", response.read())
+        self.assert_counts(2, 0)
+        self.assertEqual(["/idle-close", "/remote/status"], self.server.paths)
+
+    def test_broken_response_not_resent(self):
+        self.open("/remote/status")
+        self.assertRaises(
+            connection_pool.HTTPException, lambda: self.open("/broken")
+        )
+        self.assert_counts(1, 1)
+        self.assertEqual(["/remote/status", "/broken"], self.server.paths)
+        self.assertEqual(
+            [[]], list(self.pool._idle_connections.values())
+        )
+
+    def test_parallel_requests(self):
+        result_list = []
+        def worker():
+            result_list.append(self.open("/remote/status").read())
+        thread_list = [threading.Thread(target=worker) for dummy in range(8)]
+        for thread in thread_list:
+            thread.start()
+        for thread in thread_list:
+            thread.join()
+        self.assertEqual([b"/remote/status data"] * 8, result_list)
+        self.assertEqual(8, self.pool.opened_count + self.pool.reused_count)
+
+
+class ConnectErrorTest(TestCase):
+    def test_connection_refused(self):
+        # a port nothing listens on
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        server.close()
+        pool = connection_pool.ConnectionPool()
+        with self.assertRaises(connection_pool.ConnectError) as context_manager:
+            pool.request("127.0.0.1:{0}".format(port), "POST", "/", b"", {})
+        self.assertEqual(errno.ECONNREFUSED, context_manager.exception.errno)
+        self.assertEqual(
+            str(context_manager.exception.error),
+            str(context_manager.exception)
+        )
+
+
+class IsConnectionDroppedTest(TestCase):
+    def test_not_connected(self):
+        self.assertTrue(connection_pool.is_connection_dropped(
+            _PlainConnection(None, "127.0.0.1")
+        ))
+
+
+class IsIdleConnectionClosedTest(TestCase):
+    def test_closed_without_response(self):
+        self.assertTrue(connection_pool.is_idle_connection_closed(
+            connection_pool.BadStatusLine("")
+        ))
+
+    def test_broken_status_line(self):
+        self.assertFalse(connection_pool.is_idle_connection_closed(
+            connection_pool.BadStatusLine("garbage")
+        ))
+
+    def test_reset_or_broken_pipe(self):
+        for error_number in (errno.ECONNRESET, errno.EPIPE):
+            self.assertFalse(connection_pool.is_idle_connection_closed(
+                socket.error(error_number, "error")
+            ))
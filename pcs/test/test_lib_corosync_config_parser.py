@@ -604,6 +604,56 @@ child1 {
         self.assertEqual(child1.parent, None)
         ac(str(root), "")
 
+    def test_index_follows_changes(self):
+        root = config_parser.Section("root")
+        child1 = config_parser.Section("child")
+        child2 = config_parser.Section("child")
+        other = config_parser.Section("other")
+        root.add_section(child1)
+        root.add_section(other)
+        root.add_section(child2)
+        root.add_attribute("name", "value1")
+        root.add_attribute("other", "value")
+        root.add_attribute("name", "value2")
+
+        self.assertEqual([child1, child2], root.get_sections("child"))
+        root.del_section(child1)
+        self.assertEqual([child2], root.get_sections("child"))
+        other.add_section(child2)
+        self.assertEqual([], root.get_sections("child"))
+        self.assertEqual([child2], other.get_sections("child"))
+
+        root.set_attribute("name", "value3")
+        self.assertEqual([["name", "value3"]], root.get_attributes("name"))
+        root.del_attributes_by_name("name")
+        root.add_attribute("name", "value4")
+        self.assertEqual([["name", "value4"]], root.get_attributes("name"))
+        self.assertEqual(
+            [["other", "value"], ["name", "value4"]], root.get_attributes()
+        )
+        root.del_attribute(["other", "value"])
+        self.assertEqual([], root.get_attributes("other"))
+
+    def test_copy(self):
+        root = config_parser.Section("root")
+        child = config_parser.Section("child")
+        root.add_section(child)
+        root.add_attribute("name", "value")
+        child.add_attribute("name", "value")
+
+        root_copy = child.get_root().copy()
+        ac(str(root_copy), str(root))
+        self.assertEqual(None, root_copy.parent)
+        child_copy = root_copy.get_sections("child")[0]
+        self.assertEqual(root_copy, child_copy.parent)
+
+        child_copy.set_attribute("name", "changed")
+        root_copy.set_attribute("name", "changed")
+        child_copy.add_section(config_parser.Section("new"))
+        self.assertEqual([["name", "value"]], root.get_attributes())
+        self.assertEqual([["name", "value"]], child.get_attributes())
+        self.assertEqual([], child.get_sections())
+
     def test_get_root(self):
         root = config_parser.Section("root")
         child1 = config_parser.Section("child1")
@@ -899,6 +949,48 @@ section1 {
         )
 
 
+    def test_error_line_numbers(self):
+        with self.assertRaises(
+            config_parser.UnexpectedClosingBraceException
+        ) as context_manager:
+            config_parser.parse_string("# comment\nsection {\n}\n\n}\n")
+        self.assertEqual(5, context_manager.exception.line_number)
+        self.assertEqual(
+            "unexpected closing brace on line 5",
+            str(context_manager.exception)
+        )
+
+        with self.assertRaises(
+            config_parser.MissingClosingBraceException
+        ) as context_manager:
+            config_parser.parse_string(
+                "section1 {\n}\nsection2 {\n  section3 {\n  }\n"
+            )
+        self.assertEqual(3, context_manager.exception.line_number)
+
+    def test_export_round_trip(self):
+        string = """\
+# comment
+totem {
+  version: 2
+    interface {
+      ringnumber: 0
+    }
+}
+nodelist {
+    node {
+        ring0_addr: node1
+    }
+    node {
+        ring0_addr: node2
+    }
+}
+"""
+        exported = config_parser.parse_string(string).export()
+        self.assertEqual(
+            exported, config_parser.parse_string(exported).export()
+        )
+
     def test_comment(self):
         string= """\
 # junk1
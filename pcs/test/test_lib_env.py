@@ -21,7 +21,9 @@ from pcs.test.tools.pcs_unittest import mock
 
 from pcs.lib.env import LibraryEnvironment
 from pcs.common import report_codes
-from pcs.lib import reports
+from pcs import settings
+from pcs.lib import config_file_cache, reports
+from pcs.lib.cib.tools import get_id_index
 from pcs.lib.cluster_conf_facade import ClusterConfFacade
 from pcs.lib.corosync.config_facade import ConfigFacade as CorosyncConfigFacade
 from pcs.lib.errors import (
@@ -213,6 +215,100 @@ class LibraryEnvironmentTest(TestCase):
         self.assertEqual(1, mock_ensure_cib_version.call_count)
         self.assertFalse(env.cib_upgraded)
 
+    @patch_env("get_cib_xml")
+    @patch_env("get_cib_configuration_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_get_cib_without_status_live(
+        self, mock_get_cib_configuration_xml, mock_get_cib_xml
+    ):
+        mock_get_cib_configuration_xml.return_value = (
+            '<cib><configuration/></cib>'
+        )
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        assert_xml_equal(
+            '<cib><configuration/></cib>',
+            etree.tostring(env.get_cib(with_status=False)).decode()
+        )
+        mock_get_cib_configuration_xml.assert_called_once_with(
+            "mock cmd runner"
+        )
+        mock_get_cib_xml.assert_not_called()
+
+    def test_get_cib_without_status_file(self):
+        env = LibraryEnvironment(
+            self.mock_logger,
+            self.mock_reporter,
+            cib_data=(
+                '<cib><configuration><resources/></configuration>'
+                '<status><node_state id="1"><lrm/></node_state></status></cib>'
+            )
+        )
+        cib = env.get_cib(with_status=False)
+        assert_xml_equal(
+            '<cib><configuration><resources/></configuration></cib>',
+            etree.tostring(cib).decode()
+        )
+        cib.find(".//resources").append(etree.Element("primitive"))
+        env.push_cib(cib)
+        assert_xml_equal(
+            """
+            <cib>
+                <configuration><resources><primitive/></resources></configuration>
+                <status><node_state id="1"><lrm/></node_state></status>
+            </cib>
+            """,
+            env._get_cib_xml()
+        )
+
+    def test_get_cib_without_status_file_tricky_xml(self):
+        cib_xml = (
+            '<cib><configuration><!-- <status/> --><resources/>'
+            '</configuration><status><![CDATA[</status>]]></status></cib>'
+        )
+        env = LibraryEnvironment(
+            self.mock_logger, self.mock_reporter, cib_data=cib_xml
+        )
+        cib = env.get_cib(with_status=False)
+        assert_xml_equal(
+            '<cib><configuration><!-- <status/> --><resources/>'
+            '</configuration></cib>',
+            etree.tostring(cib).decode()
+        )
+        env.push_cib(cib)
+        assert_xml_equal(cib_xml, env._get_cib_xml())
+        self.assertIsNone(cib.find("./status"))
+
+    def test_get_cib_without_status_file_empty_status(self):
+        env = LibraryEnvironment(
+            self.mock_logger,
+            self.mock_reporter,
+            cib_data="<cib><configuration/><status/></cib>"
+        )
+        cib = env.get_cib(with_status=False)
+        assert_xml_equal(
+            "<cib><configuration/></cib>", etree.tostring(cib).decode()
+        )
+        env.push_cib(cib)
+        assert_xml_equal(
+            "<cib><configuration/><status/></cib>", env._get_cib_xml()
+        )
+
+    def test_id_index_kept_until_cib_pushed(self):
+        env = LibraryEnvironment(
+            self.mock_logger,
+            self.mock_reporter,
+            cib_data="<cib><configuration><resources/></configuration></cib>"
+        )
+        cib = env.get_cib()
+        index = get_id_index(cib)
+        self.assertIs(index, get_id_index(cib))
+        env.push_cib(cib)
+        self.assertIsNot(index, get_id_index(cib))
+
     @patch_env("replace_cib_configuration_xml")
     @mock.patch.object(
         LibraryEnvironment,
@@ -244,6 +340,82 @@ class LibraryEnvironmentTest(TestCase):
         )
         self.assertFalse(env.cib_upgraded)
 
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("push_cib_diff_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_diff_live(
+        self, mock_get_cib_xml, mock_diff_cibs, mock_push_diff,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = '<cib/>'
+        mock_diff_cibs.return_value = "<diff/>"
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        cib = env.get_cib()
+        cib.append(etree.Element("configuration"))
+        env.push_cib(cib)
+        mock_diff_cibs.assert_called_once_with(
+            "mock cmd runner",
+            "<cib/>",
+            "<cib><configuration/></cib>"
+        )
+        mock_push_diff.assert_called_once_with("mock cmd runner", "<diff/>")
+        mock_replace_cib.assert_not_called()
+
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("push_cib_diff_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_diff_no_change_live(
+        self, mock_get_cib_xml, mock_diff_cibs, mock_push_diff,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = '<cib/>'
+        mock_diff_cibs.return_value = ""
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        env.push_cib(env.get_cib())
+        mock_diff_cibs.assert_called_once_with(
+            "mock cmd runner", "<cib/>", "<cib/>"
+        )
+        mock_push_diff.assert_not_called()
+        mock_replace_cib.assert_not_called()
+
+    @patch_env("replace_cib_configuration_xml")
+    @patch_env("push_cib_diff_xml")
+    @patch_env("diff_cibs_xml")
+    @patch_env("get_cib_xml")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_push_cib_diff_failed_live(
+        self, mock_get_cib_xml, mock_diff_cibs, mock_push_diff,
+        mock_replace_cib
+    ):
+        mock_get_cib_xml.return_value = '<cib/>'
+        mock_diff_cibs.side_effect = LibraryError(
+            reports.cib_diff_error("crm_diff error")
+        )
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        cib = env.get_cib()
+        cib.append(etree.Element("configuration"))
+        env.push_cib(cib)
+        mock_push_diff.assert_not_called()
+        mock_replace_cib.assert_called_once_with(
+            "mock cmd runner", "<cib><configuration/></cib>"
+        )
+
     @patch_env("qdevice_reload_on_nodes")
     @patch_env("check_corosync_offline_on_nodes")
     @patch_env("reload_corosync_config")
@@ -332,7 +504,8 @@ class LibraryEnvironmentTest(TestCase):
             self.mock_reporter,
             "mock node list",
             new_corosync_data,
-            False
+            False,
+            skip_unchanged_nodes=True
         )
         mock_is_running.assert_called_once_with("mock cmd runner", "corosync")
         mock_reload.assert_called_once_with("mock cmd runner")
@@ -382,7 +555,8 @@ class LibraryEnvironmentTest(TestCase):
             self.mock_reporter,
             "mock node list",
             new_corosync_data,
-            False
+            False,
+            skip_unchanged_nodes=True
         )
         mock_is_running.assert_called_once_with("mock cmd runner", "corosync")
         mock_reload.assert_not_called()
@@ -434,7 +608,8 @@ class LibraryEnvironmentTest(TestCase):
             self.mock_reporter,
             "mock node list",
             new_corosync_data,
-            False
+            False,
+            skip_unchanged_nodes=True
         )
         mock_reload.assert_called_once_with("mock cmd runner")
         mock_qdevice_reload.assert_called_once_with(
@@ -490,7 +665,8 @@ class LibraryEnvironmentTest(TestCase):
             self.mock_reporter,
             "mock node list",
             new_corosync_data,
-            False
+            False,
+            skip_unchanged_nodes=True
         )
         mock_reload.assert_not_called()
         mock_qdevice_reload.assert_not_called()
@@ -550,6 +726,62 @@ class LibraryEnvironmentTest(TestCase):
         mock_reload.assert_not_called()
         mock_qdevice_reload.assert_not_called()
 
+    @patch_env("qdevice_reload_on_nodes")
+    @patch_env("reload_corosync_config")
+    @patch_env("is_service_running")
+    @patch_env("distribute_corosync_conf")
+    @mock.patch.object(
+        LibraryEnvironment,
+        "node_communicator",
+        lambda self: "mock node communicator"
+    )
+    def test_corosync_conf_not_set_unchanged(
+        self, mock_distribute, mock_is_running, mock_reload,
+        mock_qdevice_reload
+    ):
+        corosync_data = open(rc("corosync.conf")).read()
+        mock_distribute.return_value = []
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+        conf_facade = CorosyncConfigFacade.from_string(corosync_data)
+        conf_facade._need_qdevice_reload = True
+
+        env.push_corosync_conf(conf_facade)
+        self.assertEqual(1, mock_distribute.call_count)
+        mock_is_running.assert_not_called()
+        mock_reload.assert_not_called()
+        mock_qdevice_reload.assert_not_called()
+
+    @patch_env("is_service_running", lambda runner, service: False)
+    @patch_env("distribute_corosync_conf")
+    @patch_env("get_local_corosync_conf")
+    @mock.patch.object(settings, "corosync_conf_file", rc("corosync.conf"))
+    @mock.patch.dict(config_file_cache._config_file_cache, {"enabled": True})
+    @mock.patch.dict(config_file_cache._cache, {}, clear=True)
+    @mock.patch.object(
+        LibraryEnvironment,
+        "node_communicator",
+        lambda self: "mock node communicator"
+    )
+    @mock.patch.object(
+        LibraryEnvironment,
+        "cmd_runner",
+        lambda self: "mock cmd runner"
+    )
+    def test_corosync_conf_cached(self, mock_get_corosync, mock_distribute):
+        corosync_data = open(rc("corosync.conf")).read()
+        mock_get_corosync.return_value = corosync_data
+        env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
+
+        conf_facade = env.get_corosync_conf()
+        conf_facade.config.add_attribute("changed", "value")
+        self.assertEqual(corosync_data, env.get_corosync_conf().config.export())
+        self.assertEqual(1, mock_get_corosync.call_count)
+
+        env.push_corosync_conf(conf_facade)
+        self.assertEqual(1, mock_distribute.call_count)
+        env.get_corosync_conf()
+        self.assertEqual(2, mock_get_corosync.call_count)
+
     @patch_env("NodeCommunicator")
     def test_node_communicator_no_options(self, mock_comm):
         expected_comm = mock.MagicMock()
@@ -8,6 +8,7 @@ from __future__ import (
 from pcs.test.tools.pcs_unittest import TestCase
 import os.path
 import logging
+import threading
 try:
     # python2
     from urllib2 import (
@@ -33,6 +34,7 @@ from pcs.test.tools.misc import outdent
 from pcs import settings
 from pcs.common import report_codes
 from pcs.lib import reports
+from pcs.lib.node import NodeAddresses
 from pcs.lib.errors import (
     LibraryError,
     ReportItemSeverity as severity
@@ -1035,6 +1037,112 @@ class ParallelCommunicationHelperTest(TestCase):
             ]
         )
 
+    @mock.patch.object(settings, "node_task_timeout", 0.1)
+    def test_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        func = lambda node: release.wait(10) if node.label == "node2" else None
+        assert_raise_library_error(
+            lambda: lib.parallel_nodes_communication_helper(
+                func,
+                [
+                    ([NodeAddresses(node)], {})
+                    for node in ["node1", "node2", "node3"]
+                ],
+                self.mock_reporter,
+                skip_offline_nodes=False
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_COMMUNICATION_ERROR_TIMED_OUT,
+                {
+                    "node": "node2",
+                },
+                report_codes.SKIP_OFFLINE_NODES
+            )
+        )
+
+    @mock.patch.object(settings, "node_task_timeout", 0.1)
+    def test_timeout_skip_offline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        lib.parallel_nodes_communication_helper(
+            lambda node: release.wait(10),
+            [([NodeAddresses("node1")], {})],
+            self.mock_reporter,
+            skip_offline_nodes=True
+        )
+        assert_report_item_list_equal(
+            self.mock_reporter.report_item_list,
+            [
+                (
+                    severity.WARNING,
+                    report_codes.NODE_COMMUNICATION_ERROR_TIMED_OUT,
+                    {
+                        "node": "node1",
+                    }
+                ),
+            ]
+        )
+
+
+class RunNodeTasksTest(TestCase):
+    @mock.patch.object(settings, "node_task_timeout", 0.1)
+    def test_timed_out_call_result_thrown_away(self):
+        release = threading.Event()
+        finished = threading.Event()
+        self.addCleanup(release.set)
+        def func(node):
+            if node.label == "node1":
+                release.wait(10)
+                finished.set()
+            return (
+                [reports.corosync_config_accepted_by_node(node.label)],
+                node.label
+            )
+        report_items, value_list = lib.run_node_tasks(
+            func,
+            [([NodeAddresses(node)], {}) for node in ["node1", "node2"]]
+        )
+        release.set()
+        finished.wait(10)
+        assert_report_item_list_equal(
+            report_items,
+            [
+                (
+                    severity.ERROR,
+                    report_codes.NODE_COMMUNICATION_ERROR_TIMED_OUT,
+                    {
+                        "node": "node1",
+                    }
+                ),
+                (
+                    severity.INFO,
+                    report_codes.COROSYNC_CONFIG_ACCEPTED_BY_NODE,
+                    {
+                        "node": "node2",
+                    }
+                ),
+            ]
+        )
+        self.assertEqual([None, "node2"], value_list)
+
+    def test_raise_exception_when_all_finished(self):
+        called = []
+        def func(node):
+            called.append(node)
+            if node == "node1":
+                raise ValueError("an error")
+            return [], node
+        self.assertRaises(
+            ValueError,
+            lambda: lib.run_node_tasks(
+                func, [([node], {}) for node in ["node1", "node2"]]
+            )
+        )
+        self.assertEqual(["node1", "node2"], sorted(called))
+
+
 class IsCmanClusterTest(TestCase):
     def template_test(self, version_description, is_cman, corosync_retval=0):
         mock_runner = mock.MagicMock(spec_set=lib.CommandRunner)
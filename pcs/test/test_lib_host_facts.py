@@ -0,0 +1,109 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import shutil
+import tempfile
+
+from pcs.test.tools.assertions import assert_raise_library_error
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs import settings
+from pcs.common import report_codes
+from pcs.lib import host_facts
+from pcs.lib.errors import ReportItemSeverity as severity
+from pcs.lib.external import CommandRunner
+
+
+class HostFactsTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.temp_dir, "cache", "facts.json")
+        self.binary = os.path.join(self.temp_dir, "corosync")
+        self.write_binary("corosync 1")
+        patchers = [
+            mock.patch.object(
+                settings, "host_facts_cache_file", self.cache_file
+            ),
+            mock.patch.object(settings, "corosync_binaries", self.temp_dir),
+            mock.patch.dict(host_facts._facts_cache, {"facts": None}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.return_value = (
+            "Corosync Cluster Engine, version '1.4.7'", "", 0
+        )
+
+    def write_binary(self, content):
+        with open(self.binary, "w") as binary:
+            binary.write(content)
+
+    def forget_process_cache(self):
+        host_facts._facts_cache["facts"] = None
+
+    def test_detect_and_cache(self):
+        self.assertTrue(host_facts.is_cman_cluster(self.runner))
+        self.assertTrue(host_facts.is_cman_cluster(self.runner))
+        self.assertEqual(1, self.runner.run.call_count)
+        with open(self.cache_file) as cache_file:
+            self.assertTrue(json.load(cache_file)["is_cman_cluster"]["value"])
+
+    def test_cache_shared_by_processes(self):
+        host_facts.is_cman_cluster(self.runner)
+        self.forget_process_cache()
+        self.assertTrue(host_facts.is_cman_cluster(self.runner))
+        self.assertEqual(1, self.runner.run.call_count)
+
+    def test_refresh_when_binary_changed(self):
+        host_facts.is_cman_cluster(self.runner)
+        self.write_binary("corosync 2.x")
+        self.runner.run.return_value = (
+            "Corosync Cluster Engine, version '2.4.0'", "", 0
+        )
+        self.forget_process_cache()
+        self.assertFalse(host_facts.is_cman_cluster(self.runner))
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_broken_cache_file(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as cache_file:
+            cache_file.write("[broken")
+        self.assertTrue(host_facts.is_cman_cluster(self.runner))
+        self.assertEqual(1, self.runner.run.call_count)
+
+    def test_cache_file_not_writable(self):
+        with open(os.path.join(self.temp_dir, "cache"), "w"):
+            pass
+        self.assertTrue(host_facts.is_cman_cluster(self.runner))
+        self.forget_process_cache()
+        self.assertTrue(host_facts.is_cman_cluster(self.runner))
+        self.assertEqual(2, self.runner.run.call_count)
+
+    @mock.patch("pcs.lib.host_facts.live.has_wait_for_idle_support")
+    def test_ensure_wait_for_idle_support(self, mock_has_support):
+        mock_has_support.return_value = False
+        assert_raise_library_error(
+            lambda: host_facts.ensure_wait_for_idle_support(self.runner),
+            (
+                severity.ERROR,
+                report_codes.WAIT_FOR_IDLE_NOT_SUPPORTED,
+                {},
+            )
+        )
+        assert_raise_library_error(
+            lambda: host_facts.ensure_wait_for_idle_support(self.runner),
+            (
+                severity.ERROR,
+                report_codes.WAIT_FOR_IDLE_NOT_SUPPORTED,
+                {},
+            )
+        )
+        mock_has_support.assert_called_once_with(self.runner)
@@ -0,0 +1,402 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+import time
+try:
+    # python2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    # python3
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+from pcs.test.tools.assertions import (
+    assert_raise_library_error,
+    assert_report_item_list_equal,
+)
+from pcs.test.tools.custom_mock import MockLibraryReportProcessor
+from pcs.test.tools.pcs_unittest import TestCase, mock, skipUnless
+
+from pcs.common import report_codes
+from pcs.lib import external, nodes_task
+from pcs.lib.corosync import live as corosync_live
+from pcs.lib.errors import ReportItemSeverity as severity
+from pcs.lib.node import NodeAddresses, NodeAddressesList
+
+if external.ASYNC_SUPPORTED:
+    import asyncio
+    from pcs.lib import node_communicator_async as lib
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.respond("")
+
+    def do_POST(self):
+        self.respond(
+            self.rfile.read(int(self.headers["Content-Length"]))
+            .decode("utf-8")
+        )
+
+    def respond(self, body):
+        with self.server.lock:
+            self.server.connection_ports.add(self.client_address[1])
+            self.server.requests.append(
+                (self.command, self.path, body, self.headers.get("Cookie"))
+            )
+        if self.path == "/sleep":
+            time.sleep(1)
+        if self.path == "/broken":
+            # the connection breaks in the middle of the response
+            self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Len")
+            self.close_connection = True
+            return
+        if self.path == "/remote/get_corosync_conf_hash":
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(self.server.conf_hash)))
+            self.end_headers()
+            self.wfile.write(self.server.conf_hash.encode("utf-8"))
+            return
+        code = {
+            "/bad_request": 400,
+            "/unauthorized": 401,
+            "/forbidden": 403,
+            "/not_found": 404,
+            "/error": 500,
+        }.get(self.path, 200)
+        response = "{0} {1}".format(self.path, body).encode("utf-8")
+        self.send_response(code)
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (response[:3], response[3:]):
+                self.wfile.write(
+                    "{0:x}\r\n".format(len(chunk)).encode("ascii")
+                    + chunk + b"\r\n"
+                )
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+        if self.path == "/idle-close":
+            # close the connection without telling the client
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class AsyncNodeCommunicatorTestBase(TestCase):
+    def setUp(self):
+        self.server = _Server(("127.0.0.1", 0), _RequestHandler)
+        self.server.connection_ports = set()
+        self.server.requests = []
+        self.server.lock = threading.Lock()
+        self.server.conf_hash = ""
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.reporter = MockLibraryReportProcessor()
+        self.communicator = self.fixture_communicator()
+
+    def fixture_communicator(self, **kwargs):
+        port = self.server.server_address[1]
+        communicator = lib.AsyncNodeCommunicator(
+            mock.MagicMock(), self.reporter, {"node1": "token1"}, **kwargs
+        )
+        # the test server speaks plain HTTP on a random port
+        communicator._open_connection = lambda host: asyncio.open_connection(
+            "127.0.0.1", port
+        )
+        return communicator
+
+    def call_host(self, host, request, data):
+        return self.communicator.run(
+            self.communicator.call_host_async(host, request, data)
+        )
+
+
+@skipUnless(
+    external.ASYNC_SUPPORTED, "asyncio communicator requires python 3.5+"
+)
+class AsyncNodeCommunicatorTest(AsyncNodeCommunicatorTestBase):
+    def assert_raises_node_exception(self, exception_class, request, reason):
+        with self.assertRaises(exception_class) as context_manager:
+            self.call_host("node1", request, None)
+        self.assertEqual(
+            ("node1", request, reason),
+            (
+                context_manager.exception.node,
+                context_manager.exception.command,
+                context_manager.exception.reason,
+            )
+        )
+
+    def test_call_node(self):
+        self.assertEqual(
+            "/remote/set_data a=b",
+            self.communicator.run(self.communicator.call_node_async(
+                NodeAddresses("node1"), "remote/set_data", "a=b"
+            ))
+        )
+        self.assertEqual(
+            [("POST", "/remote/set_data", "a=b", "token=token1")],
+            self.server.requests
+        )
+        assert_report_item_list_equal(
+            self.reporter.report_item_list,
+            [
+                (
+                    severity.DEBUG,
+                    report_codes.NODE_COMMUNICATION_STARTED,
+                    {
+                        "target": "https://node1:2224/remote/set_data",
+                        "data": "a=b",
+                    }
+                ),
+                (
+                    severity.DEBUG,
+                    report_codes.NODE_COMMUNICATION_FINISHED,
+                    {
+                        "target": "https://node1:2224/remote/set_data",
+                        "response_code": 200,
+                        "response_data": "/remote/set_data a=b",
+                    }
+                ),
+            ]
+        )
+
+    def test_get_request_without_data(self):
+        self.call_host("node2", "remote/status", None)
+        self.assertEqual(
+            [("GET", "/remote/status", "", None)], self.server.requests
+        )
+
+    def test_chunked_response(self):
+        self.assertEqual(
+            "/chunked ", self.call_host("node1", "chunked", None)
+        )
+
+    def test_concurrent_calls_reuse_connections(self):
+        communicator = self.fixture_communicator(max_connections=2)
+        result_list = communicator.run_all([
+            communicator.call_host_async(
+                "node1", "remote/status", "step={0}".format(step)
+            )
+            for step in range(6)
+        ])
+        self.assertEqual(
+            ["/remote/status step={0}".format(step) for step in range(6)],
+            result_list
+        )
+        self.assertTrue(len(self.server.connection_ports) <= 2)
+
+    def test_http_errors(self):
+        self.assert_raises_node_exception(
+            external.NodeCommandUnsuccessfulException,
+            "bad_request",
+            "/bad_request"
+        )
+        self.assert_raises_node_exception(
+            external.NodeAuthenticationException,
+            "unauthorized",
+            "HTTP error: 401"
+        )
+        self.assert_raises_node_exception(
+            external.NodePermissionDeniedException,
+            "forbidden",
+            "HTTP error: 403"
+        )
+        self.assert_raises_node_exception(
+            external.NodeUnsupportedCommandException,
+            "not_found",
+            "HTTP error: 404"
+        )
+        self.assert_raises_node_exception(
+            external.NodeCommunicationException,
+            "error",
+            "HTTP error: 500"
+        )
+
+    def test_timeout(self):
+        self.communicator = self.fixture_communicator(request_timeout=0.1)
+        self.assert_raises_node_exception(
+            external.NodeConnectionException, "sleep", "Connection timed out"
+        )
+
+    def test_unable_to_connect(self):
+        port = self.server.server_address[1]
+        self.server.server_close()
+        self.communicator._open_connection = (
+            lambda host: asyncio.open_connection("127.0.0.1", port)
+        )
+        with self.assertRaises(external.NodeConnectionException):
+            self.call_host("node1", "remote/status", None)
+        self.assertEqual(
+            report_codes.NODE_COMMUNICATION_NOT_CONNECTED,
+            self.reporter.report_item_list[-1].code
+        )
+
+    def run_in_loop(self, call_list):
+        # calls are run one by one in one event loop, so they share connections
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        try:
+            for request, data in call_list:
+                result = loop.run_until_complete(
+                    self.communicator.call_host_async("node1", request, data)
+                )
+                # let the server close the connection
+                time.sleep(0.1)
+            return result
+        finally:
+            loop.run_until_complete(self.communicator.close_async())
+
+    def test_idle_closed_connection_replaced(self):
+        self.assertEqual(
+            "/remote/status a=b",
+            self.run_in_loop([("idle-close", ""), ("remote/status", "a=b")])
+        )
+        self.assertEqual(
+            ["/idle-close", "/remote/status"],
+            [request[1] for request in self.server.requests]
+        )
+        self.assertEqual(2, len(self.server.connection_ports))
+
+    def test_broken_response_not_resent(self):
+        with self.assertRaises(external.NodeConnectionException):
+            self.run_in_loop([("remote/status", ""), ("broken", "a=b")])
+        self.assertEqual(
+            ["/remote/status", "/broken"],
+            [request[1] for request in self.server.requests]
+        )
+        self.assertEqual(1, len(self.server.connection_ports))
+
+    def test_workflow_helper(self):
+        node_list = [NodeAddresses("node1"), NodeAddresses("node2")]
+        def workflow(node):
+            request = "forbidden" if node.label == "node2" else "remote/status"
+            return self.communicator.call_node_async(node, request, None)
+        assert_raise_library_error(
+            lambda: lib.parallel_nodes_workflow_helper(
+                self.communicator,
+                workflow,
+                [([node], {}) for node in node_list],
+                self.reporter
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_COMMUNICATION_ERROR_PERMISSION_DENIED,
+                {
+                    "node": "node2",
+                    "command": "forbidden",
+                    "reason": "HTTP error: 403",
+                },
+                report_codes.SKIP_OFFLINE_NODES
+            )
+        )
+        self.assertEqual(
+            ["/forbidden", "/remote/status"],
+            sorted([request[1] for request in self.server.requests])
+        )
+
+
+@skipUnless(
+    external.ASYNC_SUPPORTED, "asyncio communicator requires python 3.5+"
+)
+class DistributeCorosyncConfTest(AsyncNodeCommunicatorTestBase):
+    def setUp(self):
+        super(DistributeCorosyncConfTest, self).setUp()
+        self.node_list = NodeAddressesList(
+            [NodeAddresses("node1"), NodeAddresses("node2")]
+        )
+
+    def test_send_config(self):
+        self.assertEqual(
+            list(self.node_list),
+            lib.distribute_corosync_conf(
+                self.communicator, self.reporter, self.node_list, "conf"
+            )
+        )
+        self.assertEqual(
+            [
+                ("POST", "/remote/set_corosync_conf", "corosync_conf=conf", None),
+                (
+                    "POST", "/remote/set_corosync_conf", "corosync_conf=conf",
+                    "token=token1"
+                ),
+            ],
+            sorted(self.server.requests, key=lambda request: str(request[3]))
+        )
+
+    def test_skip_unchanged_nodes(self):
+        self.server.conf_hash = corosync_live.get_corosync_conf_hash("conf")
+        self.assertEqual(
+            [],
+            lib.distribute_corosync_conf(
+                self.communicator, self.reporter, self.node_list, "conf",
+                skip_unchanged_nodes=True
+            )
+        )
+        self.assertEqual(
+            ["/remote/get_corosync_conf_hash"] * 2,
+            [request[1] for request in self.server.requests]
+        )
+        self.assertEqual(
+            [
+                report_codes.COROSYNC_CONFIG_DISTRIBUTION_STARTED,
+                report_codes.COROSYNC_CONFIG_UNCHANGED_ON_NODE,
+                report_codes.COROSYNC_CONFIG_UNCHANGED_ON_NODE,
+                report_codes.COROSYNC_CONFIG_DISTRIBUTION_SUMMARY,
+            ],
+            [
+                report.code for report in self.reporter.report_item_list
+                if report.severity != severity.DEBUG
+            ]
+        )
+
+    def test_changed_nodes_updated(self):
+        self.server.conf_hash = "other hash"
+        self.assertEqual(
+            list(self.node_list),
+            lib.distribute_corosync_conf(
+                self.communicator, self.reporter, self.node_list, "conf",
+                skip_unchanged_nodes=True
+            )
+        )
+        self.assertEqual(
+            ["/remote/get_corosync_conf_hash"] * 2
+                +
+                ["/remote/set_corosync_conf"] * 2
+            ,
+            sorted([request[1] for request in self.server.requests])
+        )
+
+    def test_called_from_nodes_task(self):
+        self.assertEqual(
+            list(self.node_list),
+            nodes_task.distribute_corosync_conf(
+                self.communicator, self.reporter, self.node_list, "conf"
+            )
+        )
+        self.assertEqual(
+            ["/remote/set_corosync_conf"] * 2,
+            [request[1] for request in self.server.requests]
+        )
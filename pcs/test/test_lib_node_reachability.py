@@ -0,0 +1,203 @@
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+
+from pcs.test.tools.assertions import assert_report_item_equal
+from pcs.test.tools.custom_mock import MockLibraryReportProcessor
+from pcs.test.tools.pcs_unittest import TestCase, mock
+
+from pcs import settings
+from pcs.common import report_codes
+from pcs.lib import connection_pool, external, node_reachability
+from pcs.lib.errors import ReportItemSeverity as severity
+
+
+class ReachabilityCacheTestCase(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.cache_file = os.path.join(self.temp_dir, "reachability.json")
+        patchers = [
+            mock.patch.object(
+                settings, "node_reachability_cache_file", self.cache_file
+            ),
+            mock.patch.object(settings, "node_offline_cache_period", 60),
+            mock.patch.dict(
+                node_reachability._reachability,
+                {"enabled": True, "skip_offline": False}
+            ),
+            mock.patch.dict(
+                node_reachability._offline_cache, {"offline": None}
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def forget_process_cache(self):
+        node_reachability._offline_cache["offline"] = None
+
+
+class NodeReachabilityTest(ReachabilityCacheTestCase):
+    def test_record_failure_shared_by_processes(self):
+        self.assertIsNone(node_reachability.get_offline_reason("node1"))
+        node_reachability.record_failure("node1", "No route to host")
+        self.forget_process_cache()
+        self.assertEqual(
+            "No route to host", node_reachability.get_offline_reason("node1")
+        )
+        self.assertIsNone(node_reachability.get_offline_reason("node2"))
+
+    def test_record_success(self):
+        node_reachability.record_failure("node1", "No route to host")
+        node_reachability.record_failure("node2", "No route to host")
+        node_reachability.record_success("node1")
+        self.forget_process_cache()
+        self.assertIsNone(node_reachability.get_offline_reason("node1"))
+        self.assertIsNotNone(node_reachability.get_offline_reason("node2"))
+
+    def test_failure_expires(self):
+        with open(self.cache_file, "w") as cache_file:
+            json.dump(
+                {
+                    "node1": {"time": time.time() - 61, "reason": "old"},
+                    "node2": {"time": time.time() - 30, "reason": "recent"},
+                },
+                cache_file
+            )
+        self.assertIsNone(node_reachability.get_offline_reason("node1"))
+        self.assertEqual(
+            "recent", node_reachability.get_offline_reason("node2")
+        )
+        node_reachability.record_failure("node3", "new")
+        with open(self.cache_file) as cache_file:
+            self.assertEqual(
+                ["node2", "node3"], sorted(json.load(cache_file).keys())
+            )
+
+    def test_disabled(self):
+        node_reachability._reachability["enabled"] = False
+        node_reachability.record_failure("node1", "No route to host")
+        self.assertIsNone(node_reachability.get_offline_reason("node1"))
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_probe(self):
+        server = socket.socket()
+        self.addCleanup(server.close)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        self.assertIsNone(node_reachability.probe("127.0.0.1", port))
+        server.close()
+        self.assertIsNotNone(node_reachability.probe("127.0.0.1", port))
+
+
+@mock.patch("pcs.lib.node_reachability.probe")
+@mock.patch(
+    "pcs.lib.external.NodeCommunicator._NodeCommunicator__get_opener"
+)
+class NodeCommunicatorReachabilityTest(ReachabilityCacheTestCase):
+    def setUp(self):
+        super(NodeCommunicatorReachabilityTest, self).setUp()
+        self.reporter = MockLibraryReportProcessor()
+        self.communicator = external.NodeCommunicator(
+            mock.MagicMock(logging.Logger), self.reporter, {}
+        )
+
+    def fixture_opener(self, mock_get_opener):
+        opener = mock.MagicMock()
+        mock_get_opener.return_value = opener
+        response = mock.MagicMock(["getcode", "read"])
+        response.getcode.return_value = 200
+        response.read.return_value = b"response"
+        opener.open.return_value = response
+        return opener
+
+    def test_connection_failure_recorded(self, mock_get_opener, mock_probe):
+        opener = self.fixture_opener(mock_get_opener)
+        opener.open.side_effect = external.urllib_URLError(
+            connection_pool.ConnectError(socket.error("No route to host"))
+        )
+        self.assertRaises(
+            external.NodeConnectionException,
+            lambda: self.communicator.call_host("node1", "remote/status", None)
+        )
+        self.assertEqual(
+            "No route to host", node_reachability.get_offline_reason("node1")
+        )
+        mock_probe.assert_not_called()
+
+    def test_response_failure_not_recorded(self, mock_get_opener, mock_probe):
+        opener = self.fixture_opener(mock_get_opener)
+        opener.open.side_effect = external.urllib_URLError(
+            socket.timeout("timed out")
+        )
+        self.assertRaises(
+            external.NodeConnectionException,
+            lambda: self.communicator.call_host("node1", "remote/status", None)
+        )
+        self.assertIsNone(node_reachability.get_offline_reason("node1"))
+        mock_probe.assert_not_called()
+
+    def test_skip_known_offline(self, mock_get_opener, mock_probe):
+        opener = self.fixture_opener(mock_get_opener)
+        node_reachability.record_failure("node1", "No route to host")
+        node_reachability._reachability["skip_offline"] = True
+        with self.assertRaises(
+            external.NodeKnownOfflineException
+        ) as context_manager:
+            self.communicator.call_host("node1", "remote/status", None)
+        opener.open.assert_not_called()
+        mock_probe.assert_not_called()
+        assert_report_item_equal(
+            external.node_communicator_exception_to_report_item(
+                context_manager.exception,
+                severity.WARNING
+            ),
+            (
+                severity.WARNING,
+                report_codes.NODE_COMMUNICATION_ERROR_SKIPPED_OFFLINE,
+                {
+                    "node": "node1",
+                    "command": "remote/status",
+                    "reason": "No route to host",
+                }
+            )
+        )
+
+    def test_probe_known_offline_fails(self, mock_get_opener, mock_probe):
+        opener = self.fixture_opener(mock_get_opener)
+        mock_probe.return_value = "timed out"
+        node_reachability.record_failure("node1", "No route to host")
+        with self.assertRaises(
+            external.NodeConnectionException
+        ) as context_manager:
+            self.communicator.call_host("node1", "remote/status", None)
+        self.assertEqual("timed out", context_manager.exception.reason)
+        opener.open.assert_not_called()
+        mock_probe.assert_called_once_with("node1")
+        self.assertEqual(
+            "timed out", node_reachability.get_offline_reason("node1")
+        )
+
+    def test_probe_known_offline_succeeds(self, mock_get_opener, mock_probe):
+        self.fixture_opener(mock_get_opener)
+        mock_probe.return_value = None
+        node_reachability.record_failure("node1", "No route to host")
+        self.assertEqual(
+            "response",
+            self.communicator.call_host("node1", "remote/status", None)
+        )
+        mock_probe.assert_called_once_with("node1")
+        self.assertIsNone(node_reachability.get_offline_reason("node1"))
@@ -15,7 +15,12 @@ from pcs.test.tools.custom_mock import MockLibraryReportProcessor
 from pcs.test.tools.pcs_unittest import mock
 
 from pcs.common import report_codes
-from pcs.lib.external import NodeCommunicator, NodeAuthenticationException
+from pcs.lib.corosync import live as corosync_live
+from pcs.lib.external import (
+    NodeCommunicator,
+    NodeAuthenticationException,
+    NodeUnsupportedCommandException,
+)
 from pcs.lib.node import NodeAddresses, NodeAddressesList
 from pcs.lib.errors import ReportItemSeverity as severity
 
@@ -246,6 +251,77 @@ class DistributeCorosyncConfTest(TestCase):
             ]
         )
 
+    def test_skip_unchanged_nodes(self):
+        conf_text = "test conf text"
+        nodes = ["node1", "node2", "node3"]
+        node_addrs_list = NodeAddressesList(
+            [NodeAddresses(addr) for addr in nodes]
+        )
+        remote_hashes = {
+            "node1": corosync_live.get_corosync_conf_hash(conf_text),
+            "node2": corosync_live.get_corosync_conf_hash("old conf text"),
+        }
+        def call_node(node, request, data):
+            if request == "remote/get_corosync_conf_hash":
+                if node.label not in remote_hashes:
+                    raise NodeUnsupportedCommandException(
+                        node.label, request, "HTTP error: 404"
+                    )
+                return remote_hashes[node.label] + "\n"
+            return "Succeeded"
+        communicator = mock.MagicMock(spec_set=NodeCommunicator)
+        communicator.call_node.side_effect = call_node
+
+        updated_node_list = lib.distribute_corosync_conf(
+            communicator,
+            self.mock_reporter,
+            node_addrs_list,
+            conf_text,
+            skip_unchanged_nodes=True
+        )
+
+        self.assertEqual(
+            ["node2", "node3"], [node.label for node in updated_node_list]
+        )
+        self.assertEqual(
+            ["node2", "node3"],
+            sorted([
+                call[1][0].label
+                for call in communicator.call_node.mock_calls
+                if call[1][1] == "remote/set_corosync_conf"
+            ])
+        )
+        assert_report_item_list_equal(
+            self.mock_reporter.report_item_list,
+            [
+                (
+                    severity.INFO,
+                    report_codes.COROSYNC_CONFIG_DISTRIBUTION_STARTED,
+                    {}
+                ),
+                (
+                    severity.INFO,
+                    report_codes.COROSYNC_CONFIG_UNCHANGED_ON_NODE,
+                    {"node": nodes[0]}
+                ),
+                (
+                    severity.INFO,
+                    report_codes.COROSYNC_CONFIG_ACCEPTED_BY_NODE,
+                    {"node": nodes[1]}
+                ),
+                (
+                    severity.INFO,
+                    report_codes.COROSYNC_CONFIG_ACCEPTED_BY_NODE,
+                    {"node": nodes[2]}
+                ),
+                (
+                    severity.INFO,
+                    report_codes.COROSYNC_CONFIG_DISTRIBUTION_SUMMARY,
+                    {"updated_node_count": 2, "node_count": 3}
+                ),
+            ]
+        )
+
 class CheckCorosyncOfflineTest(TestCase):
     def setUp(self):
         self.mock_reporter = MockLibraryReportProcessor()
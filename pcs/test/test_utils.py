@@ -5,8 +5,14 @@ from __future__ import (
     unicode_literals,
 )
 
+import json
+import os
+import shutil
 import sys
+import tempfile
+import threading
 from pcs.test.tools import pcs_unittest as unittest
+from pcs.test.tools.pcs_unittest import mock
 import xml.dom.minidom
 import xml.etree.cElementTree as ET
 from time import sleep
@@ -20,7 +26,8 @@ except ImportError:
 from pcs.test.tools.xml import dom_get_child_elements
 from pcs.test.tools.misc import get_test_resource as rc
 
-from pcs import utils
+from pcs import settings, utils
+from pcs.lib.pacemaker.state import ClusterState
 
 cib_with_nodes = rc("cib-empty-withnodes.xml")
 empty_cib = rc("cib-empty.xml")
@@ -976,6 +983,48 @@ class UtilsTest(unittest.TestCase):
             }
         )
 
+    @mock.patch("pcs.utils.getClusterStateXml")
+    def test_resource_running_on_cluster_state(self, mock_state_xml):
+        state = ClusterState("""
+<crm_mon>
+    <summary />
+    <nodes />
+    <resources>
+        <group id="myGroup">
+            <resource id="myFirst" role="Started" failed="false">
+                <node name="rh70-node1" />
+            </resource>
+            <resource id="mySecond" role="Started" failed="false">
+                <node name="rh70-node1" />
+            </resource>
+            <resource id="myFailed" role="Started" failed="true">
+                <node name="rh70-node1" />
+            </resource>
+        </group>
+    </resources>
+</crm_mon>
+        """, validate=False)
+
+        self.assertEqual(
+            utils.resource_running_on("mySecond", state)["nodes_started"],
+            ["rh70-node1"]
+        )
+        self.assertEqual(
+            utils.resource_running_on("myGroup", state, stopped=True),
+            {
+                'message':
+                    "Resource 'myGroup' is running on node rh70-node1.",
+                'is_running': True,
+                'nodes_master': [],
+                'nodes_slave': [],
+                'nodes_started': ["rh70-node1"],
+            }
+        )
+        self.assertFalse(
+            utils.resource_running_on("myGroup", state)["is_running"]
+        )
+        mock_state_xml.assert_not_called()
+
     def test_get_operations_from_transitions(self):
         transitions = utils.parse(rc("transitions01.xml"))
         self.assertEqual(
@@ -1798,6 +1847,479 @@ class UtilsTest(unittest.TestCase):
         self.assertEqual(node.getAttribute("id"), node_id)
 
 
+class ParseTokensTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual({}, utils.parse_tokens(""))
+        self.assertEqual({}, utils.parse_tokens("  \n"))
+
+    def test_format_1(self):
+        self.assertEqual(
+            {"node1": "token1", "node2": "token2"},
+            utils.parse_tokens('{"node1": "token1", "node2": "token2"}')
+        )
+
+    def test_format_2(self):
+        self.assertEqual(
+            {"node1": "token1"},
+            utils.parse_tokens("""{
+                "format_version": 2,
+                "data_version": 3,
+                "tokens": {"node1": "token1"}
+            }""")
+        )
+
+    def test_unknown_format(self):
+        self.assertEqual(
+            None,
+            utils.parse_tokens(
+                '{"format_version": 3, "data_version": 1, "tokens": {}}'
+            )
+        )
+        self.assertEqual(None, utils.parse_tokens("[]"))
+        self.assertEqual(None, utils.parse_tokens("{broken"))
+
+
+@mock.patch("pcs.utils.run_pcsdcli")
+class ReadTokensTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tokens_file = os.path.join(self.temp_dir, "tokens")
+        self.env_patcher = mock.patch.dict(
+            os.environ, {"PCS_TOKEN_FILE": self.tokens_file}
+        )
+        self.env_patcher.start()
+
+    def tearDown(self):
+        self.env_patcher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def write_tokens(self, tokens):
+        with open(self.tokens_file, "w") as tokens_file:
+            tokens_file.write(json.dumps({
+                "format_version": 2,
+                "data_version": 1,
+                "tokens": tokens,
+            }))
+
+    def test_missing_file(self, mock_pcsdcli):
+        self.assertEqual({}, utils.readTokens())
+        mock_pcsdcli.assert_not_called()
+
+    def test_read_file(self, mock_pcsdcli):
+        self.write_tokens({"node1": "token1"})
+        self.assertEqual({"node1": "token1"}, utils.readTokens())
+        mock_pcsdcli.assert_not_called()
+
+    def test_cache(self, mock_pcsdcli):
+        self.write_tokens({"node1": "token1"})
+        with mock.patch("pcs.utils.parse_tokens") as mock_parse:
+            mock_parse.return_value = {"node1": "token1"}
+            utils.readTokens()
+            tokens = utils.readTokens()
+            self.assertEqual(1, mock_parse.call_count)
+        tokens["node2"] = "token2"
+        self.assertEqual({"node1": "token1"}, utils.readTokens())
+
+    def test_file_changed(self, mock_pcsdcli):
+        self.write_tokens({"node1": "token1"})
+        self.assertEqual({"node1": "token1"}, utils.readTokens())
+        self.write_tokens({"node1": "token1", "node2": "token2"})
+        self.assertEqual(
+            {"node1": "token1", "node2": "token2"}, utils.readTokens()
+        )
+
+    def test_fallback_to_pcsd(self, mock_pcsdcli):
+        with open(self.tokens_file, "w") as tokens_file:
+            tokens_file.write('{"format_version": 3, "tokens": {}}')
+        mock_pcsdcli.return_value = (
+            {"status": "ok", "data": {"node1": "token1"}}, 0
+        )
+        self.assertEqual({"node1": "token1"}, utils.readTokens())
+        mock_pcsdcli.assert_called_once_with("read_tokens")
+
+
+class DomIdIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dom = xml.dom.minidom.parseString("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="myId"/>
+                    </resources>
+                </configuration>
+                <status>
+                    <node_state id="statusId"/>
+                </status>
+            </cib>
+        """)
+        self.resources = self.dom.getElementsByTagName("resources")[0]
+
+    def test_does_id_exist(self):
+        self.assertTrue(utils.does_id_exist(self.dom, "myId"))
+        self.assertTrue(utils.does_id_exist(self.resources, "myId"))
+        self.assertFalse(utils.does_id_exist(self.dom, "otherId"))
+        self.assertFalse(utils.does_id_exist(self.dom, "statusId"))
+
+    def test_not_cib(self):
+        dom = xml.dom.minidom.parseString(
+            '<resources id="top"><primitive id="myId"/></resources>'
+        )
+        self.assertTrue(utils.does_id_exist(dom, "top"))
+        self.assertTrue(utils.does_id_exist(dom, "myId"))
+        self.assertFalse(utils.does_id_exist(dom, "otherId"))
+
+    def test_find_unique_id(self):
+        self.assertEqual("myId-1", utils.find_unique_id(self.dom, "myId"))
+        self.assertEqual("otherId", utils.find_unique_id(self.dom, "otherId"))
+
+    def test_removed_element(self):
+        self.assertTrue(utils.does_id_exist(self.dom, "myId"))
+        self.resources.removeChild(
+            self.resources.getElementsByTagName("primitive")[0]
+        )
+        self.assertFalse(utils.does_id_exist(self.dom, "myId"))
+
+    def test_created_element(self):
+        new_id = utils.find_unique_id(self.dom, "myId")
+        primitive = self.dom.createElement("primitive")
+        primitive.setAttribute("id", new_id)
+        self.resources.appendChild(primitive)
+        self.assertEqual("myId-2", utils.find_unique_id(self.dom, "myId"))
+        self.assertTrue(utils.does_id_exist(self.dom, new_id))
+
+
+    def test_created_element_not_checked_before(self):
+        self.assertTrue(utils.does_id_exist(self.dom, "myId"))
+        primitive = self.dom.createElement("primitive")
+        primitive.setAttribute("id", "B")
+        meta = self.dom.createElement("meta_attributes")
+        meta.setAttribute("id", "B-meta")
+        primitive.appendChild(meta)
+        self.resources.appendChild(primitive)
+        self.assertTrue(utils.does_id_exist(self.dom, "B"))
+        self.assertTrue(utils.does_id_exist(self.dom, "B-meta"))
+        self.assertEqual("B-1", utils.find_unique_id(self.dom, "B"))
+
+    def test_id_set_to_element_in_document(self):
+        self.assertFalse(utils.does_id_exist(self.dom, "B"))
+        primitive = self.dom.createElement("primitive")
+        self.resources.appendChild(primitive)
+        self.assertFalse(utils.does_id_exist(self.dom, "B"))
+        primitive.setAttribute("id", "B")
+        self.assertTrue(utils.does_id_exist(self.dom, "B"))
+
+    def test_index_kept_for_the_document(self):
+        index = utils._get_dom_id_index(self.dom)
+        self.assertIs(index, utils._get_dom_id_index(self.resources))
+        self.assertIsNot(
+            index,
+            utils._get_dom_id_index(xml.dom.minidom.parseString("<cib/>"))
+        )
+
+    def test_not_rebuilt_if_document_not_changed(self):
+        self.assertFalse(utils.does_id_exist(self.dom, "otherId"))
+        with mock.patch.object(utils._DomIdIndex, "_build_index") as build:
+            self.assertFalse(utils.does_id_exist(self.dom, "otherId"))
+            self.assertEqual("myId-1", utils.find_unique_id(self.dom, "myId"))
+            build.assert_not_called()
+
+    def test_rebuilt_if_document_changed(self):
+        self.assertFalse(utils.does_id_exist(self.dom, "otherId"))
+        self.resources.appendChild(self.dom.createElement("group"))
+        with mock.patch.object(utils._DomIdIndex, "_build_index") as build:
+            utils.does_id_exist(self.dom, "otherId")
+            build.assert_called_once_with()
+
+class ClusterPropertiesDefinitionTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.temp_dir, "cache", "props.json")
+        patchers = [
+            mock.patch.object(
+                settings, "cluster_properties_cache_file", self.cache_file
+            ),
+            mock.patch.dict(
+                utils._cluster_properties_definition, {"definition": None}
+            ),
+            mock.patch("pcs.utils.pcs_options", {}),
+            mock.patch("pcs.utils.cmd_runner"),
+        ]
+        for daemon in ["pengine", "crmd", "cib"]:
+            path = os.path.join(self.temp_dir, daemon)
+            with open(path, "w") as binary:
+                binary.write(daemon)
+            patchers.append(mock.patch.object(
+                settings, "{0}_binary".format(daemon), path
+            ))
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.runner = utils.cmd_runner.return_value
+        self.runner.run.side_effect = lambda args: (
+            """
+            <resource-agent>
+                <parameters>
+                    <parameter name="{0}-prop">
+                        <content type="boolean" default="false"/>
+                    </parameter>
+                </parameters>
+            </resource-agent>
+            """.format(os.path.basename(args[0])),
+            "",
+            0
+        )
+
+    def forget_process_cache(self):
+        utils._cluster_properties_definition["definition"] = None
+
+    def test_load_and_cache(self):
+        definition = utils.get_cluster_properties_definition()
+        self.assertEqual(
+            ["cib-prop", "crmd-prop", "pengine-prop"],
+            sorted(definition.keys())
+        )
+        self.assertEqual("false", definition["crmd-prop"]["default"])
+        self.assertEqual("crmd", definition["crmd-prop"]["source"])
+        self.assertEqual(3, self.runner.run.call_count)
+        self.forget_process_cache()
+        self.assertEqual(definition, utils.get_cluster_properties_definition())
+        self.assertEqual(3, self.runner.run.call_count)
+
+    def test_reload_when_binary_changed(self):
+        utils.get_cluster_properties_definition()
+        with open(settings.cib_binary, "w") as binary:
+            binary.write("new cib")
+        self.forget_process_cache()
+        utils.get_cluster_properties_definition()
+        self.assertEqual(6, self.runner.run.call_count)
+
+    def test_no_cache(self):
+        utils.pcs_options["--no-cache"] = ""
+        utils.get_cluster_properties_definition()
+        self.forget_process_cache()
+        utils.get_cluster_properties_definition()
+        self.assertEqual(6, self.runner.run.call_count)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+
+class CmdRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.orig = (utils.usefile, utils.filename)
+        patcher = mock.patch.dict(utils._cmd_runner_cache, {}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        utils.usefile, utils.filename = self.orig
+
+    def test_runner_follows_cib_file(self):
+        utils.usefile, utils.filename = False, ""
+        live_runner = utils.cmd_runner()
+        self.assertNotIn("CIB_file", live_runner._env_vars)
+        self.assertIs(live_runner, utils.cmd_runner())
+
+        utils.usefile, utils.filename = True, "/tmp/cib.xml"
+        file_runner = utils.cmd_runner()
+        self.assertEqual("/tmp/cib.xml", file_runner._env_vars["CIB_file"])
+        self.assertIs(file_runner, utils.cmd_runner())
+
+        utils.usefile, utils.filename = False, ""
+        self.assertIs(live_runner, utils.cmd_runner())
+
+
+@mock.patch("pcs.utils.run")
+class CibSnapshotTest(unittest.TestCase):
+    cib = """
+        <cib>
+            <configuration>
+                <resources>
+                    <group id="G1"><primitive id="R1"/></group>
+                    <group id="G2"><primitive id="R2"/></group>
+                </resources>
+            </configuration>
+        </cib>
+    """
+
+    def setUp(self):
+        self.usefile = utils.usefile
+        utils.usefile = False
+        utils.invalidate_cib_snapshot()
+
+    def tearDown(self):
+        utils.usefile = self.usefile
+        utils.invalidate_cib_snapshot()
+
+    def test_query_cib_once(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        read_count = utils.get_cib_read_count()
+
+        utils.get_cib_dom()
+        utils.get_cib_etree()
+        self.assertTrue(utils.does_exist('//primitive[@id="R1"]'))
+        self.assertFalse(utils.does_exist('//primitive[@id="R3"]'))
+
+        mock_run.assert_called_once_with(["cibadmin", "-l", "-Q"])
+        self.assertEqual(read_count + 1, utils.get_cib_read_count())
+
+    def test_xpath_single_match(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        group = xml.dom.minidom.parseString(
+            utils.get_cib_xpath('//group/primitive[@id="R2"]/..')
+        ).documentElement
+        self.assertEqual("group", group.tagName)
+        self.assertEqual("G2", group.getAttribute("id"))
+
+    def test_xpath_more_matches(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        element = xml.dom.minidom.parseString(
+            utils.get_cib_xpath("//group")
+        ).documentElement
+        self.assertEqual("xpath-query", element.tagName)
+        self.assertEqual(
+            ["G1", "G2"],
+            [
+                group.getAttribute("id")
+                for group in element.getElementsByTagName("group")
+            ]
+        )
+
+    def test_xpath_attribute_match(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        self.assertTrue(utils.does_exist('//group/@id'))
+        self.assertFalse(utils.does_exist('//clone/@id'))
+        group = xml.dom.minidom.parseString(
+            utils.get_cib_xpath('//group[@id="G2"]/@id')
+        ).documentElement
+        self.assertEqual("group", group.tagName)
+        self.assertEqual("G2", group.getAttribute("id"))
+
+    def test_xpath_not_node_set(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        self.assertFalse(utils.does_exist('count(//group)'))
+        self.assertEqual("", utils.get_cib_xpath('count(//group)'))
+
+    def test_xpath_no_match(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        self.assertEqual("", utils.get_cib_xpath("//clone"))
+        self.assertEqual("", utils.get_cib_xpath("//invalid[["))
+
+    def test_invalidated_by_cib_replace(self, mock_run):
+        mock_run.return_value = (self.cib, 0)
+        utils.replace_cib_configuration(
+            utils.get_cib_dom().getElementsByTagName("configuration")[0]
+        )
+        utils.get_cib_dom()
+        self.assertEqual(
+            [
+                mock.call(["cibadmin", "-l", "-Q"]),
+                mock.call(
+                    ["cibadmin", "--replace", "-V", "--xml-pipe", "-o",
+                        "configuration"
+                    ],
+                    False,
+                    mock.ANY
+                ),
+                mock.call(["cibadmin", "-l", "-Q"]),
+            ],
+            mock_run.mock_calls
+        )
+
+
+@mock.patch("pcs.utils.run")
+class ReplaceCibConfigurationDiffTest(unittest.TestCase):
+    cib = """
+        <cib epoch="1">
+            <configuration><resources/></configuration>
+            <status><node_state id="1"/></status>
+        </cib>
+    """
+
+    def setUp(self):
+        self.usefile = utils.usefile
+        utils.usefile = False
+        utils.invalidate_cib_snapshot()
+
+    def tearDown(self):
+        utils.usefile = self.usefile
+        utils.invalidate_cib_snapshot()
+
+    def fixture_run(self, diff_output, diff_retval, diffed_cibs):
+        def run(args, *dummy_args, **dummy_kwargs):
+            if args[0] == "crm_diff":
+                for path in (args[2], args[4]):
+                    with open(path) as cib_file:
+                        diffed_cibs.append(cib_file.read())
+                return diff_output, diff_retval
+            return self.cib, 0
+        return run
+
+    def test_push_diff(self, mock_run):
+        diffed_cibs = []
+        mock_run.side_effect = self.fixture_run("<diff/>", 1, diffed_cibs)
+        new_cib = utils.get_cib_etree()
+        new_cib.set("epoch", "5")
+        new_cib.find("status").append(ET.Element("node_state", {"id": "2"}))
+        ET.SubElement(new_cib.find(".//resources"), "primitive", {"id": "R"})
+
+        utils.replace_cib_configuration(new_cib)
+
+        self.assertEqual(
+            mock.call(
+                ["cibadmin", "--patch", "-V", "--xml-pipe"], False, "<diff/>"
+            ),
+            mock_run.mock_calls[-1]
+        )
+        # only the configuration section is diffed
+        old_cib, new_cib = [ET.fromstring(cib) for cib in diffed_cibs]
+        self.assertEqual(None, old_cib.find("status"))
+        self.assertEqual(None, new_cib.find("status"))
+        self.assertEqual("1", new_cib.get("epoch"))
+        self.assertEqual(0, len(old_cib.findall(".//primitive")))
+        self.assertEqual(1, len(new_cib.findall(".//primitive")))
+
+    def test_no_difference(self, mock_run):
+        mock_run.side_effect = self.fixture_run("", 0, [])
+        utils.replace_cib_configuration(utils.get_cib_dom())
+        self.assertEqual("crm_diff", mock_run.mock_calls[-1][1][0][0])
+
+    def test_diff_error_fallback_to_replace(self, mock_run):
+        mock_run.side_effect = self.fixture_run("", 1, [])
+        utils.replace_cib_configuration(utils.get_cib_dom())
+        self.assertEqual(
+            mock.call(
+                [
+                    "cibadmin", "--replace", "-V", "--xml-pipe",
+                    "-o", "configuration"
+                ],
+                False,
+                mock.ANY
+            ),
+            mock_run.mock_calls[-1]
+        )
+
+
+class IsCibModifyingCommandTest(unittest.TestCase):
+    def test_queries(self):
+        for command in (
+            ["cibadmin", "-l", "-Q"],
+            ["cibadmin", "-Q", "--xpath", "//nodes"],
+            ["crm_mon", "--one-shot", "--as-xml"],
+            ["crm_resource", "--show-metadata", "ocf:heartbeat:Dummy"],
+            ["corosync-quorumtool", "-p"],
+        ):
+            self.assertFalse(utils._is_cib_modifying_command(command))
+
+    def test_writes(self):
+        for command in (
+            ["cibadmin", "--replace", "--xml-file", "cib.xml"],
+            ["cibadmin", "-o", "resources", "-D", "--xpath", "//primitive"],
+            ["crm_resource", "-r", "R1", "--meta", "-p", "target-role"],
+            ["crm_attribute", "--type", "crm_config", "--name", "a"],
+        ):
+            self.assertTrue(utils._is_cib_modifying_command(command))
+
+
 class RunParallelTest(unittest.TestCase):
     def fixture_create_worker(self, log, name, sleepSeconds=0):
         def worker():
@@ -1833,6 +2355,97 @@ class RunParallelTest(unittest.TestCase):
         self.assertEqual(log, ['second', 'first'])
 
 
+class RunForNodesTest(unittest.TestCase):
+    def test_results_in_order_of_nodes(self):
+        def action(node, suffix):
+            # the first node finishes last
+            sleep(.03 if node == "node1" else 0)
+            return node + suffix
+        self.assertEqual(
+            ["node1-x", "node2-x", "node3-x"],
+            utils.run_for_nodes(action, ["node1", "node2", "node3"], "-x")
+        )
+
+
+class IterateForNodesTest(unittest.TestCase):
+    def test_results_as_nodes_answer(self):
+        called = []
+        def action(node, suffix):
+            called.append(node)
+            sleep({"node1": .2, "node2": 0, "node3": .1}[node])
+            return node + suffix
+        iterator = utils.iterate_for_nodes(
+            action, ["node1", "node2", "node3"], "-x"
+        )
+        self.assertEqual(("node2", "node2-x"), next(iterator))
+        self.assertEqual(("node3", "node3-x"), next(iterator))
+        self.assertEqual(("node1", "node1-x"), next(iterator))
+        self.assertEqual(["node1", "node2", "node3"], sorted(called))
+
+    @mock.patch.object(settings, "node_task_timeout", 0.1)
+    def test_timed_out_node_failed(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        def action(node):
+            if node == "node1":
+                release.wait(10)
+            return 0, node
+        self.assertEqual(
+            [
+                ("node2", (0, "node2")),
+                (
+                    "node1",
+                    (
+                        2,
+                        "Unable to finish the operation in time, its result "
+                            "is unknown"
+                    )
+                ),
+            ],
+            list(utils.iterate_for_nodes(action, ["node1", "node2"]))
+        )
+
+@mock.patch("pcs.utils.is_rhel6", lambda: False)
+@mock.patch("pcs.utils.sendHTTPRequest")
+class SetCorosyncConfigOnNodesTest(unittest.TestCase):
+    def fixture_send(self, mock_send, failing_nodes=()):
+        def send(node, request, data, print_result, print_success):
+            self.assertEqual("remote/set_corosync_conf", request)
+            self.assertEqual("corosync_conf=config", data)
+            self.assertEqual((False, False), (print_result, print_success))
+            if node in failing_nodes:
+                return 2, "Unable to connect to {0}".format(node)
+            return 0, "Succeeded\n"
+        mock_send.side_effect = send
+
+    @mock.patch("pcs.utils.print", create=True)
+    def test_success(self, mock_print, mock_send):
+        self.fixture_send(mock_send)
+        utils.setCorosyncConfigOnNodes(["node1", "node2"], "config")
+        self.assertEqual(2, mock_send.call_count)
+        mock_print.assert_has_calls([
+            mock.call("node1: Succeeded"),
+            mock.call("node2: Succeeded"),
+        ])
+
+    @mock.patch("pcs.utils.print", create=True)
+    @mock.patch("pcs.utils.err")
+    def test_failure(self, mock_err, mock_print, mock_send):
+        self.fixture_send(mock_send, failing_nodes=["node1", "node3"])
+        utils.setCorosyncConfigOnNodes(["node1", "node2", "node3"], "config")
+        self.assertEqual(3, mock_send.call_count)
+        mock_print.assert_called_once_with("node2: Succeeded")
+        self.assertEqual(2, mock_err.call_count)
+        mock_err.assert_has_calls([
+            mock.call(
+                "Unable to set corosync config: Unable to connect to node1",
+                False
+            ),
+            mock.call(
+                "Unable to set corosync config: Unable to connect to node3"
+            ),
+        ])
+
 class PrepareNodeNamesTest(unittest.TestCase):
     def test_return_original_when_is_in_pacemaker_nodes(self):
         node = 'test'
@@ -26,6 +26,8 @@ def full_usage():
     out += strip_extras(config([],False))
     out += strip_extras(pcsd([],False))
     out += strip_extras(alert([], False))
+    out += strip_extras(batch([], False))
+    out += strip_extras(daemon([], False))
     print(out.strip())
     print("Examples:\n" + examples.replace(" \ ",""))
 
@@ -159,6 +161,8 @@ Options:
     -f file     Perform actions on file instead of active CIB.
     --debug     Print all network traffic and external commands run.
     --version   Print pcs version information.
+    --no-cache  Do not use cached names and metadata of agents and cluster
+                properties.
 
 Commands:
     cluster     Configure cluster options and nodes.
@@ -175,6 +179,8 @@ Commands:
     pcsd        Manage pcs daemon.
     node        Manage cluster nodes.
     alert       Set pacemaker alerts.
+    batch       Run many commands against the CIB and push it once.
+    daemon      Run pcs commands requested over a local socket.
 """
 # Advanced usage to possibly add later
 #  --corosync_conf=<corosync file> Specify alternative corosync.conf file
@@ -656,11 +662,16 @@ Commands:
         scope=configuration.  Do not specify a scope if you want to edit
         the saved CIB using pcs (pcs -f <command>).
 
-    cib-push <filename> [scope=<scope> | --config] [--wait[=<n>]]
+    cib-push <filename> [--wait[=<n>]]
+            [diff-against=<filename_original> | scope=<scope> | --config]
         Push the raw xml from <filename> to the CIB (Cluster Information Base).
         You can obtain the CIB by running the 'pcs cluster cib' command, which
         is recommended first step when you want to perform desired
         modifications (pcs -f <command>) for the one-off push.
+        If diff-against is specified, pcs diffs contents of filename against
+        contents of filename_original and pushes only the changes to the CIB.
+        This is faster than pushing the whole CIB and it does not overwrite
+        changes made to the CIB by others meanwhile.
         Specify scope to push a specific section of the CIB.  Valid values
         of the scope are: configuration, nodes, resources, constraints,
         crm_config, rsc_defaults, op_defaults.  --config is the same as
@@ -1201,7 +1212,9 @@ Commands:
         Show specified configuration checkpoint.
 
     checkpoint restore <checkpoint_number>
-        Restore cluster configuration to specified checkpoint.
+        Restore cluster configuration to specified checkpoint.  Only the
+        differences between the current configuration and the checkpoint are
+        pushed to the cluster.
 
     import-cman output=<filename> [input=<filename>] [--interactive]
             [output-format=corosync.conf|cluster.conf] [dist=<dist>]
@@ -1563,13 +1576,63 @@ Commands:
         return output
 
 
+def batch(args=[], pout=True):
+    output = """
+Usage: pcs batch [<filename>] [dry-run] [--wait[=n]]
+Run many pcs commands against the CIB and push the result once.
+
+Commands:
+    [<filename>] [dry-run] [--wait[=n]]
+        Read pcs commands from the specified file or from stdin if no file is
+        specified or the filename is '-', one command per line. Empty lines
+        and lines starting with # are ignored, the leading 'pcs' of a command
+        is optional. Only acl, alert, constraint, property, resource and
+        stonith commands which edit the CIB are allowed, commands affecting
+        the running cluster (e.g. resource cleanup) are not. The commands are
+        run one by one against a copy of the CIB. If all of them succeed, the
+        resulting CIB is validated and the changes made by the commands are
+        pushed at once. If any of them fails, nothing is pushed. If dry-run is
+        specified, changes which would be made to the CIB are printed instead
+        of being pushed. If --wait is specified, pcs will wait up to 'n'
+        seconds for the changes to take effect.
+"""
+    if pout:
+        print(sub_usage(args, output))
+    else:
+        return output
+
+
+def daemon(args=[], pout=True):
+    output = """
+Usage: pcs daemon [socket=<path>] [workers=<n>]
+Run pcs commands requested over a local socket.
+
+Commands:
+    [socket=<path>] [workers=<n>]
+        Listen on the specified UNIX socket (default /var/run/pcsd/pcs.sock)
+        accessible by root only. Each request is a JSON object on one line
+        containing argv (pcs arguments), CIB_user, CIB_user_groups and stdin.
+        The request is run in a separate process forked from the daemon so it
+        does not pay python start-up and imports. The response is a JSON
+        object on one line containing stdout, stderr and code (exit code). At
+        most 'n' requests (default 4) are run at the same time. A request
+        not finished in an hour is stopped and reported as failed.
+"""
+    if pout:
+        print(sub_usage(args, output))
+    else:
+        return output
+
+
 def show(main_usage_name, rest_usage_names):
     usage_map = {
         "acl": acl,
         "alert": alert,
+        "batch": batch,
         "cluster": cluster,
         "config": config,
         "constraint": constraint,
+        "daemon": daemon,
         "node": node,
         "pcsd": pcsd,
         "property": property,
@@ -7,12 +7,14 @@ from __future__ import (
 
 import os
 import sys
+import copy
+import errno
+import fcntl
 import subprocess
-import ssl
-import inspect
 import xml.dom.minidom
 from xml.dom.minidom import parseString, parse
 import xml.etree.ElementTree as ET
+from lxml import etree
 import re
 import json
 import tempfile
@@ -22,8 +24,8 @@ from io import BytesIO
 import tarfile
 import getpass
 import base64
-import threading
 import logging
+import weakref
 
 
 from pcs import settings, usage
@@ -31,11 +33,19 @@ from pcs.cli.common.reports import (
     process_library_reports,
     LibraryReportProcessorToConsole as LibraryReportProcessorToConsole,
 )
+from pcs.common.executor import ParallelExecutor
 from pcs.common.tools import (
     join_multilines,
     simple_cache,
 )
-from pcs.lib import reports, sbd
+from pcs.lib import (
+    config_file_cache,
+    connection_pool,
+    node_reachability,
+    reports,
+    sbd,
+)
+from pcs.lib.cib.tools import IdIndex
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import (
@@ -44,7 +54,6 @@ from pcs.lib.external import (
     DisableServiceError,
     enable_service,
     EnableServiceError,
-    is_cman_cluster as lib_is_cman_cluster,
     is_service_enabled,
     is_service_running,
     is_systemctl,
@@ -54,8 +63,16 @@ from pcs.lib.external import (
 import pcs.lib.resource_agent as lib_ra
 import pcs.lib.corosync.config_parser as corosync_conf_parser
 from pcs.lib.corosync.config_facade import ConfigFacade as corosync_conf_facade
-from pcs.lib.pacemaker.live import has_wait_for_idle_support
+from pcs.lib.host_facts import (
+    has_wait_for_idle_support,
+    is_cman_cluster as lib_is_cman_cluster,
+)
 from pcs.lib.pacemaker.state import ClusterState
+from pcs.lib.tools import (
+    get_file_stat_key,
+    read_cache_file,
+    write_cache_file,
+)
 from pcs.lib.pacemaker.values import(
     is_boolean,
     is_score as is_score_value,
@@ -84,20 +101,14 @@ except ImportError:
 try:
     # python2
     from urllib2 import (
-        build_opener as urllib_build_opener,
         install_opener as urllib_install_opener,
-        HTTPCookieProcessor as urllib_HTTPCookieProcessor,
-        HTTPSHandler as urllib_HTTPSHandler,
         HTTPError as urllib_HTTPError,
         URLError as urllib_URLError
     )
 except ImportError:
     # python3
     from urllib.request import (
-        build_opener as urllib_build_opener,
-        install_opener as urllib_install_opener,
-        HTTPCookieProcessor as urllib_HTTPCookieProcessor,
-        HTTPSHandler as urllib_HTTPSHandler
+        install_opener as urllib_install_opener
     )
     from urllib.error import (
         HTTPError as urllib_HTTPError,
@@ -233,8 +244,80 @@ def remove_uid_gid_file(uid,gid):
         file_removed = True
 
     return file_removed
+# newest format of the tokens file understood by parse_tokens
+TOKENS_FILE_FORMAT = 2
+
+# tokens read from the tokens file, valid as long as the file does not change
+_tokens_cache = {
+    "source": None,
+    "tokens": None,
+}
+
+def get_tokens_file_path():
+    # keep in sync with token_file_path in pcsd/cfgsync.rb
+    if os.environ.get("PCS_TOKEN_FILE"):
+        return os.environ["PCS_TOKEN_FILE"]
+    if os.geteuid() == 0:
+        return settings.pcsd_tokens_location
+    return os.path.expanduser("~/.pcs/tokens")
+
+def parse_tokens(text):
+    """
+    Return tokens from the tokens file content, None if its format is unknown
+
+    string text -- content of the tokens file
+    """
+    if not text.strip():
+        return {}
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if "format_version" not in data or "tokens" not in data:
+        # format 1: {"node": "token"}
+        tokens = data
+    elif data["format_version"] in list(range(2, TOKENS_FILE_FORMAT + 1)):
+        tokens = data["tokens"] or {}
+    else:
+        return None
+    if not isinstance(tokens, dict):
+        return None
+    return tokens
+
+def _read_tokens_file():
+    """
+    Return tokens from the tokens file, None if pcsd is needed to read them
+    """
+    path = get_tokens_file_path()
+    try:
+        with open(path) as tokens_file:
+            # pcsd writes the file holding an exclusive lock
+            fcntl.flock(tokens_file.fileno(), fcntl.LOCK_SH)
+            try:
+                file_stat = os.fstat(tokens_file.fileno())
+                source = (
+                    path, file_stat.st_ino, file_stat.st_mtime,
+                    file_stat.st_size
+                )
+                if _tokens_cache["source"] != source:
+                    _tokens_cache["tokens"] = parse_tokens(tokens_file.read())
+                    _tokens_cache["source"] = source
+                tokens = _tokens_cache["tokens"]
+            finally:
+                fcntl.flock(tokens_file.fileno(), fcntl.LOCK_UN)
+    except EnvironmentError as e:
+        if e.errno == errno.ENOENT:
+            return {}
+        return None
+    return None if tokens is None else dict(tokens)
+
 # Returns a dictionary {'nodeA':'tokenA'}
 def readTokens():
+    tokens = _read_tokens_file()
+    if tokens is not None:
+        return tokens
     tokens = {}
     output, retval = run_pcsdcli("read_tokens")
     if retval == 0 and output['status'] == 'ok' and output['data']:
@@ -257,6 +340,37 @@ def setCorosyncConfig(node,config):
         if status != 0:
             err("Unable to set corosync config: {0}".format(data))
 
+def setCorosyncConfigOnNodes(node_list, config):
+    """
+    Send cluster.conf / corosync.conf to nodes in parallel, exit on any error
+
+    All the nodes are called even if some of them fail, each failure is
+    reported and pcs exits after that.
+    """
+    if is_rhel6():
+        request = "remote/set_cluster_conf"
+        data = urllib_urlencode({"cluster_conf": config})
+        error_msg = "Unable to set cluster.conf: {0}"
+    else:
+        request = "remote/set_corosync_conf"
+        data = urllib_urlencode({"corosync_conf": config})
+        error_msg = "Unable to set corosync config: {0}"
+    result_list = run_for_nodes(
+        sendHTTPRequest, node_list, request, data, False, False
+    )
+    error_list = []
+    # print results in the order of nodes as if the nodes were called one by
+    # one, errors are reported once all the nodes have been called
+    for node, (status, output) in zip(node_list, result_list):
+        if status == 0:
+            print("{0}: {1}".format(node, output.strip()))
+        else:
+            error_list.append(error_msg.format(output))
+    if error_list:
+        for error in error_list[:-1]:
+            err(error, False)
+        err(error_list[-1])
+
 def getPacemakerNodeStatus(node):
     return sendHTTPRequest(
         node, "remote/pacemaker_node_status", None, False, False
@@ -295,9 +409,11 @@ def disableCluster(node):
 def destroyCluster(node, quiet=False):
     return sendHTTPRequest(node, 'remote/cluster_destroy', None, not quiet, not quiet)
 
-def restoreConfig(node, tarball_data):
+def restoreConfig(node, tarball_data, quiet=False):
     data = urllib_urlencode({"tarball": tarball_data})
-    return sendHTTPRequest(node, "remote/config_restore", data, False, True)
+    return sendHTTPRequest(
+        node, "remote/config_restore", data, False, not quiet
+    )
 
 def pauseConfigSyncing(node, delay_seconds=300):
     data = urllib_urlencode({"sync_thread_pause": delay_seconds})
@@ -366,20 +482,8 @@ def removeLocalNode(node, node_to_remove, pacemaker_remove=False):
 # 4 = Permission denied
 def sendHTTPRequest(host, request, data = None, printResult = True, printSuccess = True):
     url = 'https://' + host + ':2224/' + request
-    # enable self-signed certificates
-    # https://www.python.org/dev/peps/pep-0476/
-    # http://bugs.python.org/issue21308
-    if (
-        hasattr(ssl, "_create_unverified_context")
-        and
-        "context" in inspect.getargspec(urllib_HTTPSHandler.__init__).args
-    ):
-        opener = urllib_build_opener(
-            urllib_HTTPSHandler(context=ssl._create_unverified_context()),
-            urllib_HTTPCookieProcessor()
-        )
-    else:
-        opener = urllib_build_opener(urllib_HTTPCookieProcessor())
+    # connections are pooled and kept alive, see connection_pool
+    opener = connection_pool.build_opener()
 
     tokens = readTokens()
     if "--debug" in pcs_options:
@@ -409,12 +513,30 @@ def sendHTTPRequest(host, request, data = None, printResult = True, printSuccess
     if cookies:
         opener.addheaders.append(('Cookie', ";".join(cookies)))
 
+    # skip or probe nodes which have been unreachable recently
+    offline_reason = node_reachability.get_offline_reason(host)
+    if offline_reason is not None:
+        if node_reachability.is_skip_offline():
+            msg = (
+                "Skipping {host}, unable to connect to it recently ({reason})"
+                .format(host=host, reason=offline_reason)
+            )
+            if printResult:
+                print(msg)
+            return (2, msg)
+        probe_error = node_reachability.probe(host)
+        if probe_error is not None:
+            return __handle_HTTP_connection_error(
+                host, probe_error, printResult, unreachable=True
+            )
+
     # send the request
     urllib_install_opener(opener)
     try:
         result = opener.open(url,data)
         # python3 returns bytes not str
         html = result.read().decode("utf-8")
+        node_reachability.record_success(host)
         if printResult or printSuccess:
             print(host + ": " + html.strip())
         if "--debug" in pcs_options:
@@ -425,6 +547,7 @@ def sendHTTPRequest(host, request, data = None, printResult = True, printSuccess
             print()
         return (0,html)
     except urllib_HTTPError as e:
+        node_reachability.record_success(host)
         if "--debug" in pcs_options:
             print("Response Code: " + str(e.code))
             html = e.read().decode("utf-8")
@@ -455,13 +578,20 @@ def sendHTTPRequest(host, request, data = None, printResult = True, printSuccess
             print(output[1])
         return output
     except urllib_URLError as e:
-        return __handle_HTTP_connection_error(host, str(e.reason), printResult)
+        return __handle_HTTP_connection_error(
+            host, str(e.reason), printResult,
+            unreachable=node_reachability.is_unreachable_error(e.reason)
+        )
     except HTTPException:
         return __handle_HTTP_connection_error(
             host, "Connection error", printResult
         )
 
-def __handle_HTTP_connection_error(host, reason,  print_result):
+def __handle_HTTP_connection_error(
+    host, reason,  print_result, unreachable=False
+):
+    if unreachable:
+        node_reachability.record_failure(host, reason)
     if "--debug" in pcs_options:
         print("Response Reason: {0}".format(reason))
     msg = "Unable to connect to {host} ({reason})".format(
@@ -527,7 +657,25 @@ def getCorosyncConf(conf=None):
     return out
 
 def getCorosyncConfParsed(conf=None, text=None):
-    conf_text = getCorosyncConf(conf) if text is None else text
+    if text is not None:
+        return _parse_corosync_conf(text)
+    if not conf:
+        if is_rhel6():
+            conf = settings.cluster_conf_file
+        else:
+            conf = settings.corosync_conf_file
+    if is_rhel6():
+        kind, copy_conf = "cluster.conf dom", _copy_dom
+    else:
+        kind, copy_conf = "corosync.conf", lambda conf_root: conf_root.copy()
+    return config_file_cache.get(
+        conf,
+        kind,
+        lambda: _parse_corosync_conf(getCorosyncConf(conf)),
+        copy_conf
+    )
+
+def _parse_corosync_conf(conf_text):
     if is_rhel6():
         try:
             return parseString(conf_text)
@@ -552,6 +700,8 @@ def setCorosyncConf(corosync_config, conf_file=None):
         err("Unable to write {0}, try running as root.\n{1}".format(
             conf_file, e.strerror
         ))
+    finally:
+        config_file_cache.invalidate(conf_file)
 
 def reloadCorosync():
     if is_rhel6():
@@ -629,15 +779,14 @@ def _enable_auto_tie_breaker_for_sbd(corosync_conf):
 def addNodeToCorosync(node):
 # Before adding, make sure node isn't already in corosync.conf
     node0, node1 = parse_multiring_node(node)
-    corosync_conf_text = getCorosyncConf()
-    for c_node in getNodesFromCorosyncConf(conf_text=corosync_conf_text):
+    for c_node in getNodesFromCorosyncConf():
         if (c_node == node0) or (c_node == node1):
             err("node already exists in corosync.conf")
     if "--corosync_conf" not in pcs_options:
         for c_node in getCorosyncActiveNodes():
             if (c_node == node0) or (c_node == node1):
                 err("Node already exists in running corosync")
-    corosync_conf = getCorosyncConfParsed(text=corosync_conf_text)
+    corosync_conf = getCorosyncConfParsed()
     new_nodeid = getNextNodeID(corosync_conf)
 
     nodelists = corosync_conf.get_sections("nodelist")
@@ -793,22 +942,20 @@ def need_to_handle_qdevice_service():
     if is_rhel6():
         return False
     try:
-        cfg = corosync_conf_facade.from_string(
-            open(settings.corosync_conf_file).read()
-        )
+        cfg = corosync_conf_facade(_get_corosync_conf_root())
         return cfg.has_quorum_device()
     except (EnvironmentError, corosync_conf_parser.CorosyncConfParserException):
         # corosync.conf not present or not valid => no qdevice specified
         return False
 
 def getNextNodeID(corosync_conf):
-    currentNodes = []
+    currentNodes = set()
     highest = 0
     for nodelist in corosync_conf.get_sections("nodelist"):
         for node in nodelist.get_sections("node"):
             for attr in node.get_attributes("nodeid"):
                 nodeid = int(attr[1])
-                currentNodes.append(nodeid)
+                currentNodes.add(nodeid)
                 if nodeid > highest:
                     highest = nodeid
 
@@ -832,15 +979,15 @@ def parse_multiring_node(node):
             % node
         )
 
-def need_ring1_address(corosync_conf_text):
+def need_ring1_address(corosync_conf_text=None):
+    """
+    string corosync_conf_text -- config to check, the local config if None
+    """
     if is_rhel6():
         # ring1 address is required regardless of transport
         # it has to be added to cluster.conf in order to set up ring1
         # in corosync by cman
-        try:
-            dom = parseString(corosync_conf_text)
-        except xml.parsers.expat.ExpatError as e:
-            err("Unable parse cluster.conf: %s" % e)
+        dom = getCorosyncConfParsed(text=corosync_conf_text)
         rrp = False
         for el in dom.getElementsByTagName("totem"):
             if el.getAttribute("rrp_mode") in ["active", "passive"]:
@@ -851,10 +998,11 @@ def need_ring1_address(corosync_conf_text):
     udpu_transport = False
     rrp = False
     for totem in corosync_conf.get_sections("totem"):
-        for attr in totem.get_attributes():
-            if attr[0] == "transport" and attr[1] == "udpu":
+        for attr in totem.get_attributes("transport"):
+            if attr[1] == "udpu":
                 udpu_transport = True
-            if attr[0] == "rrp_mode" and attr[1] in ["active", "passive"]:
+        for attr in totem.get_attributes("rrp_mode"):
+            if attr[1] in ["active", "passive"]:
                 rrp = True
     return udpu_transport and rrp
 
@@ -866,7 +1014,7 @@ def is_cman_with_udpu_transport():
 
 def get_cluster_conf_cman_options():
     try:
-        dom = parse(settings.cluster_conf_file)
+        dom = _get_cluster_conf_dom()
     except (EnvironmentError, xml.parsers.expat.ExpatError) as e:
         err("Unable to read cluster.conf: %s" % e)
     cman = dom.getElementsByTagName("cman")
@@ -878,6 +1026,28 @@ def get_cluster_conf_cman_options():
         options[name] = value
     return options
 
+def _get_corosync_conf_root():
+    def load():
+        with open(settings.corosync_conf_file) as conf_file:
+            return corosync_conf_parser.parse_string(conf_file.read())
+    return config_file_cache.get(
+        settings.corosync_conf_file,
+        "corosync.conf",
+        load,
+        lambda conf_root: conf_root.copy()
+    )
+
+def _get_cluster_conf_dom():
+    return config_file_cache.get(
+        settings.cluster_conf_file,
+        "cluster.conf dom",
+        lambda: parse(settings.cluster_conf_file),
+        _copy_dom
+    )
+
+def _copy_dom(dom):
+    return dom.cloneNode(True)
+
 # Restore default behavior before starting subprocesses
 def subprocess_setup():
     signal.signal(signal.SIGPIPE, signal.SIG_DFL)
@@ -944,21 +1114,31 @@ def run(
     except OSError as e:
         print(e.strerror)
         err("unable to locate command: " + args[0])
+    finally:
+        if _is_cib_modifying_command([command] + args[1:]):
+            invalidate_cib_snapshot()
 
     return output, returnVal
 
-@simple_cache
+# CIB file (None for the live CIB) -> command runner working with it
+_cmd_runner_cache = {}
+
 def cmd_runner():
-    env_vars = dict()
-    if usefile:
-        env_vars["CIB_file"] = filename
-    env_vars.update(os.environ)
-    env_vars["LC_ALL"] = "C"
-    return CommandRunner(
-        logging.getLogger("old_cli"),
-        get_report_processor(),
-        env_vars
-    )
+    # A runner is bound to the CIB it works with. The CIB may change during
+    # a run, pcs batch runs its commands against a temporary CIB file.
+    cib_file = filename if usefile else None
+    if cib_file not in _cmd_runner_cache:
+        env_vars = dict()
+        if cib_file:
+            env_vars["CIB_file"] = cib_file
+        env_vars.update(os.environ)
+        env_vars["LC_ALL"] = "C"
+        _cmd_runner_cache[cib_file] = CommandRunner(
+            logging.getLogger("old_cli"),
+            get_report_processor(),
+            env_vars
+        )
+    return _cmd_runner_cache[cib_file]
 
 def run_pcsdcli(command, data=None):
     if not data:
@@ -1110,18 +1290,11 @@ def map_for_error_list(callab, iterab):
     return error_list
 
 def run_parallel(worker_list, wait_seconds=1):
-    thread_list = []
-    for worker in worker_list:
-        thread = threading.Thread(target=worker)
-        thread.daemon = True
-        thread.start()
-        thread_list.append(thread)
-
-    while thread_list:
-        for thread in thread_list:
-            thread.join(wait_seconds)
-            if not thread.is_alive():
-                thread_list.remove(thread)
+    # wait_seconds is kept for compatibility, the executor is woken up as soon
+    # as a worker finishes
+    ParallelExecutor(
+        max_workers=settings.node_tasks_max_workers
+    ).run(lambda worker: worker(), [((worker, ), {}) for worker in worker_list])
 
 def create_task(report, action, node, *args, **kwargs):
     def worker():
@@ -1134,6 +1307,46 @@ def create_task_list(report, action, node_list, *args, **kwargs):
         create_task(report, action, node, *args, **kwargs) for node in node_list
     ]
 
+def run_for_nodes(action, node_list, *args, **kwargs):
+    """
+    Run action(node, *args, **kwargs) for all nodes in parallel
+    Return a list of the action's results in the order of node_list.
+    """
+    executor = ParallelExecutor(max_workers=settings.node_tasks_max_workers)
+    return [
+        result.get_value()
+        for result in executor.run(
+            action, [((node, ) + args, kwargs) for node in node_list]
+        )
+    ]
+
+def iterate_for_nodes(action, node_list, *args, **kwargs):
+    """
+    Run action(node, *args, **kwargs) for all nodes in parallel
+    Yield (node, result of the action) as soon as the action finishes for
+    a node. Once the iteration is stopped, the remaining nodes are not waited
+    for. The action returns (retval, output) like sendHTTPRequest, an action
+    not finished in time is yielded as failed and its result is thrown away
+    whenever it finishes.
+    """
+    executor = ParallelExecutor(
+        max_workers=settings.node_tasks_max_workers,
+        task_timeout=settings.node_task_timeout,
+        deadline=settings.node_tasks_deadline,
+    )
+    for result in executor.iterate(
+        action,
+        [((node, ) + args, kwargs) for node in node_list],
+        ordered=False
+    ):
+        if result.timed_out or result.cancelled:
+            yield result.args[0], (
+                2,
+                "Unable to finish the operation in time, its result is unknown"
+            )
+        else:
+            yield result.args[0], result.get_value()
+
 def parallel_for_nodes(action, node_list, *args, **kwargs):
     node_errors = dict()
     def report(node, returncode, output):
@@ -1167,11 +1380,7 @@ def prepare_node_name(node, pm_nodes, cs_nodes):
 # Check is something exists in the CIB, if it does return it, if not, return
 #  an empty string
 def does_exist(xpath_query):
-    args = ["cibadmin", "-Q", "--xpath", xpath_query]
-    dummy_output,retval = run(args)
-    if (retval != 0):
-        return False
-    return True
+    return len(_cib_snapshot_xpath(xpath_query)) > 0
 
 def get_group_children(group_id):
     child_resources = []
@@ -1406,64 +1615,78 @@ def dom_attrs_to_list(dom_el, with_id=False):
         attributes.append("(id:%s)" % (dom_el.getAttribute("id")))
     return attributes
 
-def get_resource_for_running_check(cluster_state, resource_id, stopped=False):
-    for clone in cluster_state.getElementsByTagName("clone"):
-        if clone.getAttribute("id") == resource_id:
-            for child in clone.childNodes:
-                if (
-                    child.nodeType == child.ELEMENT_NODE
-                    and
-                    child.tagName in ["resource", "group"]
-                ):
-                    resource_id = child.getAttribute("id")
-                    # in a clone a resource can have an id of '<name>:N'
-                    if ":" in resource_id:
-                        parts = resource_id.rsplit(":", 1)
-                        if parts[1].isdigit():
-                            resource_id = parts[0]
-                    break
-    for group in cluster_state.getElementsByTagName("group"):
-        # If resource is a clone it can have an id of '<resource name>:N'
-        if (
-            group.getAttribute("id") == resource_id
-            or
-            group.getAttribute("id").startswith(resource_id + ":")
-        ):
-            if stopped:
-                elem = group.getElementsByTagName("resource")[0]
-            else:
-                elem = group.getElementsByTagName("resource")[-1]
-            resource_id = elem.getAttribute("id")
-    return resource_id
+def get_resource_states_for_running_check(
+    cluster_state, resource_id, stopped=False
+):
+    """
+    Return states of primitives telling if a resource is running
+
+    A group is represented by its last primitive, or by its first one if the
+    group is being checked to be stopped, as groups start and stop in order.
+
+    ClusterState cluster_state -- cluster state to look the resource up in
+    string resource_id -- id of a primitive, group, clone or master
+    bool stopped -- the resource is being checked to be stopped
+    """
+    state_list = cluster_state.get_resource_states(resource_id)
+    grouped_list = [state for state in state_list if state.group_id]
+    if grouped_list and not any(
+        resource_id in (state.id, state.id.rsplit(":", 1)[0])
+        for state in state_list
+    ):
+        # a group or a cloned group, not a primitive in a group
+        group_member_ids = [
+            state.id for state in grouped_list
+            if state.group_id == grouped_list[-1].group_id
+        ]
+        member_id = group_member_ids[0 if stopped else -1].rsplit(":", 1)[0]
+        state_list = [
+            state for state in grouped_list
+            if state.id.rsplit(":", 1)[0] == member_id
+        ]
+    return [state for state in state_list if not state.failed]
+
+def get_cluster_state():
+    """
+    Return the current cluster state as a ClusterState instance
+    """
+    try:
+        # crm_mon output is trusted here, do not spend time on its validation
+        return ClusterState(getClusterStateXml(), validate=False)
+    except LibraryError as e:
+        process_library_reports(e.args)
 
 def resource_running_on(resource, passed_state=None, stopped=False):
+    """
+    Return nodes a resource is running on
+
+    string resource -- id of a primitive, group, clone or master
+    passed_state -- ClusterState to share among several queries, the current
+        state is loaded if None, a crm_mon minidom element is also accepted
+    bool stopped -- the resource is being checked to be stopped
+    """
     nodes_started = []
     nodes_master = []
     nodes_slave = []
-    state = passed_state if passed_state else getClusterState()
+    if passed_state is None:
+        state = get_cluster_state()
+    elif isinstance(passed_state, ClusterState):
+        state = passed_state
+    else:
+        state = ClusterState(passed_state.toxml(), validate=False)
     resource_original = resource
-    resource = get_resource_for_running_check(state, resource, stopped)
-    resources = state.getElementsByTagName("resource")
-    for res in resources:
-        # If resource is a clone it can have an id of '<resource name>:N'
-        # If resource is a clone it will be found more than once - cannot break
-        if (
-            (
-                res.getAttribute("id") == resource
-                or
-                res.getAttribute("id").startswith(resource+":")
+    node_list_by_role = {
+        "Started": nodes_started,
+        "Master": nodes_master,
+        "Slave": nodes_slave,
+    }
+    for resource_state in get_resource_states_for_running_check(
+        state, resource, stopped
+    ):
+        if resource_state.role in node_list_by_role:
+            node_list_by_role[resource_state.role].extend(
+                resource_state.node_names
             )
-            and
-            res.getAttribute("failed") != "true"
-        ):
-            for node in res.getElementsByTagName("node"):
-                node_name = node.getAttribute("name")
-                if res.getAttribute("role") == "Started":
-                    nodes_started.append(node_name)
-                elif res.getAttribute("role") == "Master":
-                    nodes_master.append(node_name)
-                elif res.getAttribute("role") == "Slave":
-                    nodes_slave.append(node_name)
     if not nodes_started and not nodes_master and not nodes_slave:
         message = "Resource '%s' is not running on any node" % resource_original
     else:
@@ -1562,25 +1785,125 @@ def validate_wait_get_timeout(need_cib_support=True):
     return wait_timeout
 
 
+# Snapshot of the CIB shared by all the CIB readers during one pcs run, so the
+# CIB is queried once instead of once per reader. Any command which may change
+# the CIB drops the snapshot (see run and invalidate_cib_snapshot).
+_cib_snapshot = {
+    "source": None,
+    "xml": {},
+    "tree": None,
+    "read_count": 0,
+}
+
+# pacemaker tools which never modify the CIB, all others drop the CIB snapshot
+_CIB_READ_ONLY_COMMANDS = (
+    "crm_diff", "crm_mon", "crm_simulate", "crm_verify", "iso8601",
+    "cman_tool",
+)
+_CIB_READ_ONLY_CRM_RESOURCE_OPTIONS = (
+    "--show-metadata", "--list-agents", "--list-ocf-providers",
+    "--list-ocf-alternatives", "--list-standards", "-?",
+)
+
+def invalidate_cib_snapshot():
+    _cib_snapshot["source"] = None
+    _cib_snapshot["xml"] = {}
+    _cib_snapshot["tree"] = None
+
+def get_cib_read_count():
+    return _cib_snapshot["read_count"]
+
+def _is_cib_modifying_command(args):
+    command = args[0]
+    if command == "cibadmin":
+        return not ("-Q" in args or "--query" in args)
+    if command == "crm_resource":
+        return not any([
+            option in args for option in _CIB_READ_ONLY_CRM_RESOURCE_OPTIONS
+        ])
+    return (
+        command[0:3] == "crm" and command not in _CIB_READ_ONLY_COMMANDS
+    )
+
+def _get_cib_snapshot_source():
+    if not usefile:
+        return (usefile, filename)
+    # the file may be changed by someone else than pcs
+    try:
+        file_stat = os.stat(filename)
+    except OSError:
+        return (usefile, filename)
+    return (
+        usefile, filename, file_stat.st_ino, file_stat.st_mtime,
+        file_stat.st_size
+    )
+
+def _get_cib_snapshot_xml(scope=None):
+    # the snapshot belongs to the CIB it has been read from
+    source = _get_cib_snapshot_source()
+    if _cib_snapshot["source"] != source:
+        invalidate_cib_snapshot()
+        _cib_snapshot["source"] = source
+    if scope not in _cib_snapshot["xml"]:
+        command = ["cibadmin", "-l", "-Q"]
+        if scope:
+            command.append("--scope=%s" % scope)
+        output, retval = run(command)
+        if retval != 0:
+            if retval == 6 and scope:
+                err("unable to get cib, scope '%s' not present in cib" % scope)
+            else:
+                err("unable to get cib")
+        _cib_snapshot["read_count"] += 1
+        _cib_snapshot["xml"][scope] = output
+    return _cib_snapshot["xml"][scope]
+
+def _get_cib_snapshot_tree():
+    cib_xml = _get_cib_snapshot_xml()
+    if _cib_snapshot["tree"] is None:
+        try:
+            _cib_snapshot["tree"] = etree.fromstring(cib_xml.encode("utf-8"))
+        except etree.XMLSyntaxError:
+            err("unable to get cib")
+    return _cib_snapshot["tree"]
+
+def _cib_snapshot_xpath(xpath_query):
+    # The tree is shared by all callers, so it must be read-only for them.
+    # Matching elements are only returned serialized.
+    try:
+        result = _get_cib_snapshot_tree().xpath(xpath_query)
+    except etree.XPathError:
+        return []
+    # cibadmin finds nothing when the query does not select nodes, e.g.
+    # count(...)
+    if not isinstance(result, list):
+        return []
+    element_list = []
+    for node in result:
+        # comments have a function as their tag
+        if isinstance(node, etree._Element) and not callable(node.tag):
+            element_list.append(node)
+        # Like cibadmin, return the element an attribute, a text or a comment
+        # belongs to. Attributes and texts are strings knowing their parent.
+        elif getattr(node, "getparent", lambda: None)() is not None:
+            element_list.append(node.getparent())
+    return [
+        etree.tostring(element, with_tail=False).decode()
+        for element in element_list
+    ]
+
 # Return matches from the CIB with the xpath_query
 def get_cib_xpath(xpath_query):
-    args = ["cibadmin", "-Q", "--xpath", xpath_query]
-    output,retval = run(args)
-    if (retval != 0):
+    element_list = _cib_snapshot_xpath(xpath_query)
+    if not element_list:
         return ""
-    return output
+    # mimic cibadmin which wraps multiple matches in an xpath-query element
+    if len(element_list) > 1:
+        return "<xpath-query>{0}</xpath-query>".format("".join(element_list))
+    return element_list[0]
 
 def get_cib(scope=None):
-    command = ["cibadmin", "-l", "-Q"]
-    if scope:
-        command.append("--scope=%s" % scope)
-    output, retval = run(command)
-    if retval != 0:
-        if retval == 6 and scope:
-            err("unable to get cib, scope '%s' not present in cib" % scope)
-        else:
-            err("unable to get cib")
-    return output
+    return _get_cib_snapshot_xml(scope)
 
 def get_cib_dom():
     try:
@@ -1620,21 +1943,179 @@ def replace_cib_configuration(dom, cib_upgraded=False):
         new_dom = dom.toxml()
     else:
         new_dom = dom
+    if not cib_upgraded and not usefile:
+        cib_diff = _get_cib_configuration_diff(new_dom)
+        if cib_diff is not None:
+            push_cib_diff(cib_diff)
+            return
     cmd = ["cibadmin", "--replace", "-V", "--xml-pipe"]
     if cib_upgraded:
         print("CIB has been upgraded to the latest schema version.")
     else:
         cmd += ["-o", "configuration"]
     output, retval = run(cmd, False, new_dom)
+    invalidate_cib_snapshot()
     if retval != 0:
         err("Unable to update cib\n"+output)
 
+def push_cib_diff(cib_diff):
+    if not cib_diff:
+        # nothing has been changed
+        return
+    output, retval = run(
+        ["cibadmin", "--patch", "-V", "--xml-pipe"], False, cib_diff
+    )
+    invalidate_cib_snapshot()
+    if retval != 0:
+        err("Unable to update cib\n"+output)
+
+def diff_cib_files(original_filename, new_filename):
+    """
+    Return a patch transforming the original CIB to the new one, an empty
+    string if they do not differ and None if the patch cannot be made
+    """
+    output, retval = run(
+        [
+            "crm_diff", "--original", original_filename, "--new",
+            new_filename, "--no-version"
+        ],
+        ignore_stderr=True
+    )
+    # 0 - no difference, 1 - CIBs differ or an error occurred
+    if retval == 0:
+        return ""
+    if retval == 1 and output.strip():
+        return output.strip()
+    return None
+
+# Returns a patch which transforms the configuration section of the current CIB
+# to the configuration section of the new CIB or None if the patch cannot be
+# made (e.g. only a part of the CIB is being pushed).
+def _get_cib_configuration_diff(new_cib_xml):
+    try:
+        new_cib = etree.fromstring(
+            new_cib_xml if isinstance(new_cib_xml, bytes)
+            else new_cib_xml.encode("utf-8")
+        )
+    except (etree.XMLSyntaxError, ValueError):
+        return None
+    if new_cib.tag != "cib":
+        return None
+    old_cib = copy.deepcopy(_get_cib_snapshot_tree())
+    # Same as with cibadmin --replace -o configuration, nothing but the
+    # configuration section is pushed.
+    for cib in (old_cib, new_cib):
+        for status in cib.findall("status"):
+            cib.remove(status)
+    new_cib.attrib.clear()
+    new_cib.attrib.update(old_cib.attrib)
+
+    old_cib_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".pcs")
+    new_cib_file = tempfile.NamedTemporaryFile(mode="w+", suffix=".pcs")
+    try:
+        old_cib_file.write(etree.tostring(old_cib).decode())
+        old_cib_file.flush()
+        new_cib_file.write(etree.tostring(new_cib).decode())
+        new_cib_file.flush()
+    except EnvironmentError:
+        return None
+    return diff_cib_files(old_cib_file.name, new_cib_file.name)
+
 def is_valid_cib_scope(scope):
     return scope in [
         "configuration", "nodes", "resources", "constraints", "crm_config",
         "rsc_defaults", "op_defaults", "status",
     ]
 
+class _DomIdIndex(IdIndex):
+    """
+    Index of ids of elements in a minidom document
+
+    Legacy code adds elements to documents in many places, so they are not
+    registered to the index. Instead, the index is built again when minidom
+    reports the document has been changed. minidom clears a cache of ids of
+    a document whenever a node is added to or removed from the document or an
+    attribute is added to one of its elements. A mark put to the cache tells
+    whether the cache, and thus the document, has been changed since the
+    index was built.
+    """
+    def __init__(self, root):
+        self._build_mark = None
+        super(_DomIdIndex, self).__init__(root)
+
+    def exists(self, check_id):
+        if self._build_mark not in self.root._id_cache:
+            self._build_index()
+        return super(_DomIdIndex, self).exists(check_id)
+
+    def _build_index(self):
+        super(_DomIdIndex, self)._build_index()
+        self._build_mark = object()
+        self.root._id_cache[self._build_mark] = None
+
+    def _iter_sections(self):
+        sections = []
+        cib_found = False
+        for cib in dom_get_children_by_tag_name(self.root, "cib"):
+            cib_found = True
+            for section in cib.childNodes:
+                if section.nodeType != xml.dom.minidom.Node.ELEMENT_NODE:
+                    continue
+                if section.tagName == "status":
+                    continue
+                sections.append(section)
+        if not cib_found:
+            sections.append(self.root)
+        return sections
+
+    def _iter_id_elements(self, element):
+        if (
+            element.nodeType == xml.dom.minidom.Node.ELEMENT_NODE
+            and
+            element.getAttribute("id")
+        ):
+            yield element
+        for id_element in element.getElementsByTagName("*"):
+            if id_element.getAttribute("id"):
+                yield id_element
+
+    def _get_id(self, element):
+        return element.getAttribute("id")
+
+    def _is_indexed(self, element, check_id):
+        return (
+            element.getAttribute("id") == check_id
+            and
+            self._is_in_indexed_part(element)
+        )
+
+    def _is_in_indexed_part(self, element):
+        path = [element]
+        parent = element.parentNode
+        while parent is not None:
+            path.append(parent)
+            parent = parent.parentNode
+        if path[-1] is not self.root:
+            return False
+        if len(path) > 2 and path[-2].tagName == "cib":
+            return len(path) > 3 and path[-3].tagName != "status"
+        return len(path) > 1
+
+# indexes of minidom documents, an index lives as long as its document
+_dom_id_indexes = weakref.WeakKeyDictionary()
+
+def _get_dom_id_index(dom):
+    document = (
+        dom
+        if isinstance(dom, xml.dom.minidom.Document)
+        else dom.ownerDocument
+    )
+    index = _dom_id_indexes.get(document)
+    if index is None:
+        index = _DomIdIndex(document)
+        _dom_id_indexes[document] = index
+    return index
+
 # Checks to see if id exists in the xml dom passed
 # DEPRECATED use lxml version available in pcs.lib.cib.tools
 def does_id_exist(dom, check_id):
@@ -1646,39 +2127,21 @@ def does_id_exist(dom, check_id):
         )):
             if elem.get("id") == check_id:
                 return True
-    else:
-        document = (
-            dom
-            if isinstance(dom, xml.dom.minidom.Document)
-            else dom.ownerDocument
-        )
-        cib_found = False
-        for cib in dom_get_children_by_tag_name(document, "cib"):
-            cib_found = True
-            for section in cib.childNodes:
-                if section.nodeType != xml.dom.minidom.Node.ELEMENT_NODE:
-                    continue
-                if section.tagName == "status":
-                    continue
-                for elem in section.getElementsByTagName("*"):
-                    if elem.getAttribute("id") == check_id:
-                        return True
-        if not cib_found:
-            for elem in document.getElementsByTagName("*"):
-                if elem.getAttribute("id") == check_id:
-                    return True
-    return False
+        return False
+    return _get_dom_id_index(dom).exists(check_id)
 
 # Returns check_id if it doesn't exist in the dom, otherwise it adds an integer
 # to the end of the id and increments it until a unique id is found
 # DEPRECATED use lxml version available in pcs.lib.cib.tools
 def find_unique_id(dom, check_id):
-    counter = 1
-    temp_id = check_id
-    while does_id_exist(dom,temp_id):
-        temp_id = check_id + "-" + str(counter)
-        counter += 1
-    return temp_id
+    if is_etree(dom):
+        counter = 1
+        temp_id = check_id
+        while does_id_exist(dom, temp_id):
+            temp_id = check_id + "-" + str(counter)
+            counter += 1
+        return temp_id
+    return _get_dom_id_index(dom).find_unique_id(check_id)
 
 # Checks to see if the specified operation already exists in passed set of
 # operations
@@ -2012,15 +2475,13 @@ def getResourceType(resource):
 def getClusterName():
     if is_rhel6():
         try:
-            dom = parse(settings.cluster_conf_file)
+            dom = _get_cluster_conf_dom()
             return dom.documentElement.getAttribute("name")
         except (IOError,xml.parsers.expat.ExpatError):
             pass
     else:
         try:
-            f = open(settings.corosync_conf_file,'r')
-            conf = corosync_conf_parser.parse_string(f.read())
-            f.close()
+            conf = _get_corosync_conf_root()
             # mimic corosync behavior - the last cluster_name found is used
             cluster_name = None
             for totem in conf.get_sections("totem"):
@@ -2607,7 +3068,53 @@ def get_cluster_property_default(prop_def_dict, prop):
     return prop_def_dict[prop]["default"]
 
 
+# definitions of cluster properties, loaded once per process on demand
+_cluster_properties_definition = {"definition": None}
+
 def get_cluster_properties_definition():
+    """
+    Return definitions of cluster properties
+
+    Definitions are provided by pacemaker daemons. They are cached on disk
+    until the daemons' binaries change.
+    """
+    if _cluster_properties_definition["definition"] is None:
+        _cluster_properties_definition["definition"] = (
+            _get_cached_cluster_properties_definition()
+        )
+    return _cluster_properties_definition["definition"]
+
+def _get_cached_cluster_properties_definition():
+    key = [
+        [path, get_file_stat_key(path)]
+        for path in [
+            settings.pengine_binary, settings.crmd_binary, settings.cib_binary
+        ]
+    ]
+    use_cache = (
+        "--no-cache" not in pcs_options
+        and
+        all(file_key is not None for dummy_path, file_key in key)
+    )
+    if use_cache:
+        cached = read_cache_file(settings.cluster_properties_cache_file)
+        if (
+            isinstance(cached, dict)
+            and
+            cached.get("key") == key
+            and
+            isinstance(cached.get("definition"), dict)
+        ):
+            return cached["definition"]
+    definition = _load_cluster_properties_definition()
+    if use_cache:
+        write_cache_file(
+            settings.cluster_properties_cache_file,
+            {"key": key, "definition": definition}
+        )
+    return definition
+
+def _load_cluster_properties_definition():
     # we don't want to change these properties
     banned_props = ["dc-version", "cluster-infrastructure"]
     basic_props = [
@@ -2761,9 +3268,19 @@ def get_cli_env():
     env.debug = "--debug" in pcs_options
     return env
 
+def _cib_middleware():
+    cib = middleware.cib(usefile, get_cib, replace_cib_configuration)
+    def apply(next_in_line, env, *args, **kwargs):
+        try:
+            return cib(next_in_line, env, *args, **kwargs)
+        finally:
+            # a library command may have pushed the CIB on its own
+            invalidate_cib_snapshot()
+    return apply
+
 def get_middleware_factory():
     return middleware.create_middleware_factory(
-        cib=middleware.cib(usefile, get_cib, replace_cib_configuration),
+        cib=_cib_middleware(),
         corosync_conf_existing=middleware.corosync_conf_existing(
             pcs_options.get("--corosync_conf", None)
         ),
@@ -2816,10 +3333,10 @@ def get_report_processor():
 
 def get_set_properties(prop_name=None, defaults=None):
     properties = {} if defaults is None else dict(defaults)
-    (output, retVal) = run(["cibadmin","-Q","--scope", "crm_config"])
-    if retVal != 0:
-        err("unable to get crm_config\n"+output)
-    dom = parseString(output)
+    crm_config = get_cib_xpath("/cib/configuration/crm_config")
+    if crm_config == "":
+        err("unable to get crm_config, is pacemaker running?")
+    dom = parseString(crm_config)
     de = dom.documentElement
     crm_config_properties = de.getElementsByTagName("nvpair")
     for prop in crm_config_properties:
@@ -9,6 +9,7 @@ require 'json'
 require 'fileutils'
 require 'backports'
 require 'base64'
+require 'socket'
 
 require 'config.rb'
 require 'cfgsync.rb'
@@ -998,6 +999,17 @@ def run_cmd_options(auth_user, options, *args)
   # when running 'id -Gn' to get the groups they are not defined yet
   cib_groups = (auth_user[:usergroups] || []).join(' ')
   $logger.info("CIB USER: #{cib_user}, groups: #{cib_groups}")
+  if defined?(PCS) and args[0] == PCS and File.socket?(PCS_DAEMON_SOCKET)
+    result = run_pcs_daemon(cib_user, cib_groups, options, args[1..-1])
+    if result
+      out, errout, retval = result
+      $logger.debug(out)
+      $logger.debug(errout)
+      $logger.debug("Duration: " + (Time.now - start).to_s + "s")
+      $logger.info("Return Value: " + retval.to_s)
+      return out, errout, retval
+    end
+  end
   # Open4.popen4 reimplementation which sets ENV in a child process prior
   # to running an external process by exec
   status = Open4::do_popen(proc_block, :init) { |ps_read, ps_write|
@@ -1014,6 +1026,42 @@ def run_cmd_options(auth_user, options, *args)
   return out, errout, retval
 end
 
+# Run pcs in a pcs daemon worker, return nil if the daemon is not available
+def run_pcs_daemon(cib_user, cib_groups, options, argv)
+  request = {
+    'argv' => argv,
+    'CIB_user' => cib_user,
+    'CIB_user_groups' => cib_groups,
+  }
+  if options and options.key?('stdin')
+    request['stdin'] = options['stdin'] + "\n"
+  end
+  begin
+    sock = UNIXSocket.new(PCS_DAEMON_SOCKET)
+  rescue SystemCallError, IOError => e
+    $logger.info("pcs daemon is not available: #{e}")
+    return nil
+  end
+  # Once the request has been sent, the command may have been run. Running it
+  # again by exec'ing pcs could run a non-idempotent command (e.g. cluster
+  # destroy) twice, so report an error instead.
+  begin
+    sock.write(JSON.generate(request) + "\n")
+    response = JSON.parse(sock.gets || '')
+    return [
+      response['stdout'].lines.to_a,
+      response['stderr'].lines.to_a,
+      response['code'],
+    ]
+  rescue SystemCallError, IOError, JSON::ParserError, NoMethodError => e
+    msg = "Unable to get the result of the command from pcs daemon: #{e}"
+    $logger.error(msg)
+    return [[], [msg + "\n"], 1]
+  ensure
+    sock.close
+  end
+end
+
 def is_score(score)
   return !!/^[+-]?((INFINITY)|(\d+))$/.match(score)
 end
@@ -28,6 +28,7 @@ def remote(params, request, auth_user)
       :get_quorum_info => method(:get_quorum_info),
       :get_cib => method(:get_cib),
       :get_corosync_conf => method(:get_corosync_conf_remote),
+      :get_corosync_conf_hash => method(:get_corosync_conf_hash_remote),
       :set_cluster_conf => method(:set_cluster_conf),
       :set_corosync_conf => method(:set_corosync_conf),
       :get_sync_capabilities => method(:get_sync_capabilities),
@@ -455,6 +456,13 @@ def get_corosync_conf_remote(params, request, auth_user)
   return get_corosync_conf()
 end
 
+def get_corosync_conf_hash_remote(params, request, auth_user)
+  if not allowed_for_local_cluster(auth_user, Permissions::READ)
+    return 403, 'Permission denied'
+  end
+  return Cfgsync::CorosyncConf.from_file('').hash
+end
+
 def set_cluster_conf(params, request, auth_user)
   if not allowed_for_local_cluster(auth_user, Permissions::FULL)
     return 403, 'Permission denied'
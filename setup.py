@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 
 import os
+import sys
 
 from setuptools import setup, Command, find_packages
+from setuptools.command.build_py import build_py
+
+# modules using syntax not available in python 2
+PYTHON3_MODULES = ["pcs/lib/node_communicator_async.py"]
 
 class CleanCommand(Command):
     user_options = []
@@ -14,6 +19,17 @@ class CleanCommand(Command):
         assert os.getcwd() == self.cwd, 'Must be in package root: %s' % self.cwd
         os.system('rm -rf ./build ./dist ./*.pyc ./*.egg-info')
 
+class BuildPyCommand(build_py):
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if sys.version_info >= (3, 5):
+            return modules
+        # python 2 would fail to byte-compile them, pcs does not import them
+        return [
+            module for module in modules
+            if module[2].replace(os.sep, "/") not in PYTHON3_MODULES
+        ]
+
 setup(
     name='pcs',
     version='0.9.155',
@@ -35,6 +51,7 @@ setup(
         ],
     },
     cmdclass={
+        'build_py': BuildPyCommand,
         'clean': CleanCommand,
     }
 )